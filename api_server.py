@@ -0,0 +1,257 @@
+"""
+=============================================================================
+Read-Only Query API for Mumbai University Grade Records
+=============================================================================
+
+Small HTTP service (Flask) over the grade database, exposing the
+export_utils queries as JSON:
+
+    GET /students/<ern>                   -> get_student_by_ern()
+    GET /failed?limit=N&cursor=C          -> get_failed_students(), paginated
+    GET /statistics?group_by=G&<filters>  -> ExamStatistics.aggregate()
+    GET /health
+
+Connections come from a pool of read-only SQLite connections (see
+init_db.create_readonly_engine), one session per request. The service
+never writes; it can run next to a batch ingest (WAL).
+
+Pagination: /failed returns at most `limit` records (default 100, max
+1000) and a `next_cursor`; passing it as `cursor` continues after the last
+record (keyset pagination, so deep pages cost the same as the first).
+
+Caching: every response carries an ETag derived from the request and the
+data fingerprint (exam_statistics.data_fingerprint). The fingerprint
+changes when an ingest records or purges data, which invalidates all
+ETags and cached bodies at once. Clients sending If-None-Match get
+304 Not Modified without a query being run; other repeated requests are
+served from an in-memory LRU of response bodies.
+
+Usage:
+    python api_server.py [--db FILE] [--host HOST] [--port PORT] [--pool-size N]
+
+Examples:
+    python api_server.py
+    curl http://127.0.0.1:5000/students/MU1234567
+    curl 'http://127.0.0.1:5000/statistics?group_by=college&semester=Semester%20-%20I'
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import json
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask, Response, abort, g, jsonify, request
+from sqlalchemy.orm import Session, sessionmaker
+from werkzeug.exceptions import HTTPException
+
+from init_db import create_readonly_engine
+from exam_statistics import EXAM_FILTERS, GROUPINGS, RECORD_FILTERS, ExamStatistics, data_fingerprint
+from export_utils import get_failed_students_page, get_student_by_ern
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+RESPONSE_CACHE_SIZE = 1024
+
+# Statistics filters given as integers in the query string
+INT_FILTERS = ('exam_id', 'exam_year')
+
+
+class ResponseCache:
+    """Thread-safe LRU of JSON response bodies, keyed by request and ETag"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Bodies kept (least recently used are dropped)
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        """Cached body of key, if it was stored under the same ETag"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes):
+        """Store the body of key under its ETag"""
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def create_app(db_path: str = 'grade_records.db', pool_size: int = 8,
+               cache_size: int = RESPONSE_CACHE_SIZE) -> Flask:
+    """
+    Create the query API application.
+
+    Args:
+        db_path: Path to an existing SQLite database file
+        pool_size: Read-only connections kept open
+        cache_size: Response bodies kept in the cache
+
+    Returns:
+        Flask application (app.config['RESPONSE_CACHE'] is its ResponseCache)
+
+    Raises:
+        FileNotFoundError: Database does not exist
+    """
+    engine = create_readonly_engine(db_path, pool_size=pool_size)
+    session_factory = sessionmaker(bind=engine)
+    cache = ResponseCache(cache_size)
+
+    app = Flask(__name__)
+    app.config['RESPONSE_CACHE'] = cache
+    app.config['DB_ENGINE'] = engine
+
+    def db_session() -> Session:
+        """Session of the current request (opened on first use)"""
+        if 'db_session' not in g:
+            g.db_session = session_factory()
+        return g.db_session
+
+    @app.teardown_appcontext
+    def close_session(exception):
+        session = g.pop('db_session', None)
+        if session is not None:
+            session.close()
+
+    @app.errorhandler(HTTPException)
+    def json_error(error):
+        response = jsonify({'error': error.description})
+        response.status_code = error.code
+        return response
+
+    def cached_json(build: Callable[[Session], Any]) -> Response:
+        """
+        Respond with build(session) as JSON, revalidated by ETag.
+
+        The ETag is checked before build() runs, so 304 responses and
+        cache hits cost only the fingerprint lookup.
+        """
+        session = db_session()
+        key = request.full_path
+        etag = hashlib.sha1(repr((data_fingerprint(session), key)).encode()).hexdigest()
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            body = cache.get(key, etag)
+            if body is None:
+                body = json.dumps(build(session), separators=(',', ':')).encode()
+                cache.put(key, etag, body)
+            response = Response(body, mimetype='application/json')
+
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
+
+    @app.get('/health')
+    def health():
+        return jsonify({'status': 'ok'})
+
+    @app.get('/students/<ern>')
+    def student(ern: str):
+        def build(session):
+            records = get_student_by_ern(session, ern)
+            if not records:
+                abort(404, description=f"No records for ERN {ern}")
+            return {'ern': ern, 'records': records}
+        return cached_json(build)
+
+    @app.get('/failed')
+    def failed():
+        limit = _int_arg('limit', DEFAULT_PAGE_SIZE, minimum=1)
+        if limit > MAX_PAGE_SIZE:
+            abort(400, description=f"limit must be at most {MAX_PAGE_SIZE}")
+        after_id = _int_arg('cursor', None, minimum=0)
+
+        def build(session):
+            items, next_id = get_failed_students_page(session, limit=limit, after_id=after_id)
+            return {
+                'items': items,
+                'limit': limit,
+                'next_cursor': str(next_id) if next_id is not None else None,
+            }
+        return cached_json(build)
+
+    @app.get('/statistics')
+    def statistics():
+        group_by = request.args.get('group_by', 'exam')
+        if group_by not in GROUPINGS:
+            abort(400, description=f"Unknown grouping '{group_by}' (choose from {', '.join(GROUPINGS)})")
+
+        filters: Dict[str, Any] = {}
+        for name in request.args:
+            if name == 'group_by':
+                continue
+            if name not in EXAM_FILTERS and name not in RECORD_FILTERS:
+                abort(400, description=f"Unknown filter '{name}'")
+            filters[name] = _int_arg(name, None) if name in INT_FILTERS else request.args[name]
+
+        def build(session):
+            return {
+                'group_by': group_by,
+                'filters': filters,
+                'items': ExamStatistics(session).aggregate(group_by, **filters),
+            }
+        return cached_json(build)
+
+    return app
+
+
+def _int_arg(name: str, default: Optional[int], minimum: Optional[int] = None) -> Optional[int]:
+    """Integer query string argument (400 if malformed or below minimum)"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        abort(400, description=f"{name} must be an integer")
+    if minimum is not None and number < minimum:
+        abort(400, description=f"{name} must be at least {minimum}")
+    return number
+
+
+def main():
+    """Run the query API with Flask's threaded server"""
+    parser = argparse.ArgumentParser(description='Read-only query API over the grade database')
+    parser.add_argument('--db', default='grade_records.db',
+                        help='SQLite database file (default: grade_records.db)')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=5000, help='Port (default: 5000)')
+    parser.add_argument('--pool-size', type=int, default=8,
+                        help='Read-only database connections (default: 8)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Grade Records Query API")
+    print("=" * 70)
+    print(f"Database: {args.db} (read-only, {args.pool_size} pooled connections)")
+    print()
+
+    app = create_app(args.db, pool_size=args.pool_size)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+=============================================================================
+Crop Geometry Backfill for Mumbai University Grade Records
+=============================================================================
+
+Fills in student_exam_records.student_index, crop_y_top and crop_y_bottom
+for records ingested before the crop geometry was stored.
+
+For every source PDF with records lacking geometry:
+1. Separator lines of the records' pages are detected in one batch
+   (PdfProcessor.detect_horizontal_lines_batch, layout cache included)
+2. Each record is matched to the detected student block its seat number
+   lies in, which gives its student index (as ingest counts them) and its
+   crop bounds; records in no block, or in a block with another record,
+   are counted as failed
+3. The rows are updated in bulk, one commit per source PDF
+
+The source PDF of a record is its source_pdf column or, for records
+ingested before that column was filled in, the pdf_filename of its
+examination; the backfill stores it in source_pdf as well.
+
+The database is migrated first (missing columns are added), so this works
+on databases created by any earlier version. Records whose source PDF is
+no longer in the downloads directory are reported and left untouched.
+
+Usage:
+    python backfill_geometry.py [--db grade_records.db] [--downloads DIR]
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import logging
+import argparse
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from init_db import init_database
+from layout_cache import SeparatorLayoutCache
+from models import Examination, StudentExamRecord
+from pdf_processor import PdfProcessor
+
+logger = logging.getLogger('Backfill')
+
+
+def seat_position(page: fitz.Page, seat_no: str) -> Optional[float]:
+    """
+    Vertical position of a seat number on a page.
+
+    Args:
+        page: Source PDF page
+        seat_no: Seat number of the record
+
+    Returns:
+        Top of the first occurrence in points, or None if not on the page
+    """
+    hits = page.search_for(seat_no)
+    return min(rect.y0 for rect in hits) if hits else None
+
+
+def backfill_pdf(db_session: Session, pdf_path: str, records: List) -> Dict:
+    """
+    Compute and store the crop geometry of records from one source PDF.
+
+    Args:
+        db_session: SQLAlchemy database session
+        pdf_path: Source PDF path
+        records: Rows of (id, source_pdf, page_number, seat_no) lacking geometry
+
+    Returns:
+        Dictionary with 'updated' and 'failed' record counts
+    """
+    updates = []
+    with fitz.open(pdf_path) as doc:
+        page_nums = sorted({row.page_number for row in records
+                            if row.page_number is not None and 0 <= row.page_number < len(doc)})
+        lines_by_page = dict(zip(page_nums, PdfProcessor.detect_horizontal_lines_batch(
+            [doc[page_num] for page_num in page_nums], min_line_length=200,
+            layout_cache=SeparatorLayoutCache()
+        )))
+
+        rows_by_page: Dict[int, List] = {}
+        for row in records:
+            if row.page_number in lines_by_page:
+                rows_by_page.setdefault(row.page_number, []).append(row)
+
+        for page_num, page_rows in rows_by_page.items():
+            page = doc[page_num]
+            boundaries = PdfProcessor.detect_student_boundaries(page, lines=lines_by_page[page_num])
+
+            # A record belongs to the student block its seat number lies in;
+            # the block's index is the student index ingest gave it. Records
+            # in no block, or sharing one (separators missed), are not updated.
+            students = boundaries['students']
+            rows_by_index: Dict[int, List] = {}
+            for row in page_rows:
+                y = seat_position(page, row.seat_no)
+                for student_index, bounds in enumerate(students):
+                    if y is not None and bounds['y_top'] <= y < bounds['y_bottom']:
+                        rows_by_index.setdefault(student_index, []).append(row)
+                        break
+
+            for student_index, block_rows in rows_by_index.items():
+                if len(block_rows) != 1:
+                    continue
+                updates.append({
+                    'id': block_rows[0].id,
+                    'student_index': student_index,
+                    'crop_y_top': students[student_index]['y_top'],
+                    'crop_y_bottom': students[student_index]['y_bottom'],
+                    'source_pdf': block_rows[0].source_pdf
+                })
+
+    if updates:
+        db_session.execute(update(StudentExamRecord), updates)
+        db_session.commit()
+
+    return {'updated': len(updates), 'failed': len(records) - len(updates)}
+
+
+def backfill_crop_geometry(db_session: Session, downloads_dir: str = 'downloads') -> Dict:
+    """
+    Fill in crop geometry for all records lacking it.
+
+    Args:
+        db_session: SQLAlchemy database session
+        downloads_dir: Directory holding the source PDFs
+
+    Returns:
+        Dictionary with 'pdfs', 'updated', 'failed' and 'missing_pdfs' counts
+    """
+    rows = db_session.query(
+        StudentExamRecord.id,
+        func.coalesce(StudentExamRecord.source_pdf, Examination.pdf_filename).label('source_pdf'),
+        StudentExamRecord.page_number, StudentExamRecord.seat_no
+    ).outerjoin(
+        Examination, StudentExamRecord.exam_id == Examination.id
+    ).filter(StudentExamRecord.crop_y_top.is_(None)).all()
+
+    records_by_pdf: Dict[str, List] = {}
+    for row in rows:
+        records_by_pdf.setdefault(row.source_pdf, []).append(row)
+
+    stats = {'pdfs': 0, 'updated': 0, 'failed': 0, 'missing_pdfs': 0}
+    for source_pdf in sorted(records_by_pdf, key=str):
+        records = records_by_pdf[source_pdf]
+        pdf_path = os.path.join(downloads_dir, source_pdf) if source_pdf else None
+        if pdf_path is None or not os.path.exists(pdf_path):
+            logger.warning("Source PDF not found for %d record(s): %s", len(records), source_pdf)
+            stats['missing_pdfs'] += 1
+            stats['failed'] += len(records)
+            continue
+
+        result = backfill_pdf(db_session, pdf_path, records)
+        stats['pdfs'] += 1
+        stats['updated'] += result['updated']
+        stats['failed'] += result['failed']
+        logger.info("%5d updated, %3d failed  %s", result['updated'], result['failed'], source_pdf)
+
+    return stats
+
+
+def main():
+    """Backfill crop geometry in an existing database"""
+    parser = argparse.ArgumentParser(
+        description='Store crop geometry for records ingested without it'
+    )
+    parser.add_argument(
+        '--db',
+        default='grade_records.db',
+        help='SQLite database file path (default: grade_records.db)'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing the source PDF files (default: downloads)'
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)  # per-PDF progress
+
+    print("=" * 70)
+    print("Crop Geometry Backfill")
+    print("=" * 70)
+
+    # Adds the geometry columns to databases created before they existed
+    session = init_database(args.db)
+    print()
+
+    stats = backfill_crop_geometry(session, args.downloads)
+    session.close()
+
+    print()
+    print("=" * 70)
+    print(f"Source PDFs: {stats['pdfs']} ({stats['missing_pdfs']} missing)")
+    print(f"Records updated: {stats['updated']}, failed: {stats['failed']}")
+    print("=" * 70)
+
+    if stats['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
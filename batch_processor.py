@@ -10,6 +10,19 @@ Orchestrates the complete workflow:
 4. Stores records in database with PDF file paths
 5. Generates students.json for development
 
+process_stream() runs the same steps on PDFs arriving on a queue (the
+scraper's downloads), so records land in the database while later PDFs
+are still downloading.
+
+Per-stage timings (metrics.py) are collected for every PDF and written to
+logs/batch_metrics.json next to batch_process.log.
+
+Output modes: 'files' (default) writes one PDF per student record;
+'bundle' writes one multi-page PDF per source PDF with an offset index
+(record_bundle.py) and stores "bundle#page=N" references in the database;
+'lazy' writes no files and stores crop descriptors (source PDF, page and
+crop bounds) that lazy_crops.CropRenderer renders on request.
+
 Author: GitHub Copilot
 Date: 2026-02-12
 Version: 2.0 - Dynamic cropping
@@ -18,15 +31,29 @@ Version: 2.0 - Dynamic cropping
 
 import os
 import json
+import time
+import queue
 import logging
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 
-from models import Program, Examination, Student, StudentExamRecord
+from models import Program, Examination
+from db_writer import BulkRecordWriter
+from metrics import RunMetrics, StageTimer
+from manifest import IngestManifest
 from pdf_processor import PdfProcessor
+from record_bundle import bundle_path_for
 from extract_simple import SimpleStudentExtractor
+from text_backends import DEFAULT_TEXT_BACKEND
+from text_cache import PageTextCache
+import diagnostics
+
+# Cropped record output: one PDF per student, one bundle per source PDF,
+# or crop descriptors only (rendered on request)
+OUTPUT_MODES = ('files', 'bundle', 'lazy')
+DEFAULT_OUTPUT_MODE = 'files'
 
 
 class BatchGradeProcessor:
@@ -35,7 +62,12 @@ class BatchGradeProcessor:
     """
     
     def __init__(self, downloads_dir: str, metadata_dir: str, 
-                 output_dir: str, db_session: Session):
+                 output_dir: str, db_session: Session, workers: int = 1,
+                 chunk_size: int = BulkRecordWriter.DEFAULT_CHUNK_SIZE,
+                 force: bool = False, text_backend: str = DEFAULT_TEXT_BACKEND,
+                 text_cache_dir: Optional[str] = None,
+                 text_cache_size_mb: float = PageTextCache.DEFAULT_MAX_SIZE_MB,
+                 output_mode: str = DEFAULT_OUTPUT_MODE):
         """
         Initialize batch processor.
         
@@ -44,11 +76,34 @@ class BatchGradeProcessor:
             metadata_dir: Directory containing metadata JSON files
             output_dir: Output directory for cropped student PDFs
             db_session: SQLAlchemy database session
+            workers: Number of worker processes for extraction and cropping
+                     (1 = process everything in this process)
+            chunk_size: Number of student records written per bulk insert
+            force: Reprocess all PDFs, even those unchanged since the last run
+            text_backend: Text extraction backend ('pdfplumber' or 'pymupdf')
+            text_cache_dir: Directory for the page text cache (None = no cache)
+            text_cache_size_mb: Maximum size of the page text cache in megabytes
+            output_mode: 'files' (one PDF per student), 'bundle' (one
+                         multi-page PDF with index per source PDF) or 'lazy'
+                         (crop descriptors only, see lazy_crops.py)
         """
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode '{output_mode}' (choose from {', '.join(OUTPUT_MODES)})")
+
         self.downloads_dir = downloads_dir
         self.metadata_dir = metadata_dir
         self.output_dir = output_dir
         self.db_session = db_session
+        self.workers = max(1, workers)
+        self.writer = BulkRecordWriter(db_session, chunk_size=chunk_size)
+        self.manifest = IngestManifest(db_session, text_backend=text_backend)
+        self.force = force
+        self.text_backend = text_backend
+        self.output_mode = output_mode
+        self.text_cache = (
+            PageTextCache(text_cache_dir, max_size_mb=text_cache_size_mb)
+            if text_cache_dir else None
+        )
         
         # Create output directory structure
         os.makedirs(output_dir, exist_ok=True)
@@ -60,11 +115,18 @@ class BatchGradeProcessor:
         self.stats = {
             'pdfs_processed': 0,
             'pdfs_failed': 0,
+            'pdfs_skipped': 0,
+            'text_cache_hits': 0,
+            'text_cache_misses': 0,
             'students_extracted': 0,
             'students_cropped': 0,
             'students_failed': 0,
             'db_records_created': 0
         }
+        
+        # Per-stage timings of this run
+        self.metrics = RunMetrics()
+        self.metrics_file = os.path.join(self.output_dir, 'logs', 'batch_metrics.json')
     
     def _setup_logging(self):
         """Configure logging"""
@@ -80,6 +142,13 @@ class BatchGradeProcessor:
         self.logger.setLevel(logging.DEBUG)
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
+        
+        # Full diagnostics for a traced PDF/page go to the log file and console
+        if diagnostics.is_tracing():
+            trace_console_handler = logging.StreamHandler()
+            trace_console_handler.setFormatter(formatter)
+            diagnostics.TRACE_LOGGER.addHandler(file_handler)
+            diagnostics.TRACE_LOGGER.addHandler(trace_console_handler)
     
     def find_pdf_files(self) -> List[str]:
         """
@@ -191,7 +260,8 @@ class BatchGradeProcessor:
         
         return exam
     
-    def generate_student_filename(self, student: Dict, semester: str, 
+    @staticmethod
+    def generate_student_filename(student: Dict, semester: str, 
                                   existing_files: set) -> str:
         """
         Generate unique filename for student PDF.
@@ -230,12 +300,19 @@ class BatchGradeProcessor:
         existing_files.add(base_filename)
         return base_filename
     
-    def process_single_pdf(self, pdf_path: str) -> bool:
+    def process_single_pdf(self, pdf_path: str, metadata: Optional[Dict] = None,
+                           prepared: Optional[Dict] = None,
+                           timer: Optional[StageTimer] = None) -> bool:
         """
         Process a single PDF file.
         
         Args:
             pdf_path: Path to PDF file
+            metadata: Preloaded metadata (optional, loaded from metadata_dir if None)
+            prepared: Result of prepare_pdf() computed in a worker process
+                      (optional, extraction and cropping run here if None)
+            timer: Stage timer already holding time spent on this PDF
+                   (optional, e.g. metadata loaded ahead of time)
             
         Returns:
             True if successful, False otherwise
@@ -245,126 +322,123 @@ class BatchGradeProcessor:
         self.logger.info(f"Processing: {pdf_basename}")
         self.logger.info(f"{'='*70}")
         
+        if timer is None:
+            timer = StageTimer()
+        
         try:
-            metadata = self.load_metadata(pdf_path)
+            if metadata is None:
+                with timer.stage('metadata_load'):
+                    metadata = self.load_metadata(pdf_path)
             if not metadata:
                 self.logger.error(f"Skipping {pdf_basename} - no metadata")
                 return False
 
-            program = self.get_or_create_program(
-                metadata['program_code'],
-                metadata['program_name']
-            )
+            with timer.stage('db_flush'):
+                program = self.get_or_create_program(
+                    metadata['program_code'],
+                    metadata['program_name']
+                )
             
-            # Extract data from PDF
-            extractor = SimpleStudentExtractor(pdf_path)
-            extracted_data = extractor.process_pdf()
+            # Extract and crop students (unless a worker already did it)
+            if prepared is None:
+                prepared = prepare_pdf(pdf_path, self.output_dir,
+                                       metadata.get('semester', 'Unknown'),
+                                       text_backend=self.text_backend,
+                                       text_cache=self.text_cache,
+                                       output_mode=self.output_mode)
+            elif prepared.get('error'):
+                self.logger.debug(prepared.get('traceback', ''))
+                raise RuntimeError(prepared['error'])
+            
+            timer.merge(prepared['timer'])
+            
+            if prepared['text_cache_hit'] is not None:
+                self.stats['text_cache_hits' if prepared['text_cache_hit'] else 'text_cache_misses'] += 1
+                self.logger.info(f"Page text cache {'hit' if prepared['text_cache_hit'] else 'miss'}")
+            
+            extracted_data = prepared['extracted_data']
             
             if not extracted_data['students']:
                 self.logger.warning(f"No students found in {pdf_basename}")
+                self.manifest.record(pdf_path, None, 0)
                 return False
             
             # Create or get examination record
-            exam = self.get_or_create_examination(metadata, extracted_data['exam_metadata'])
-            
-            # Track filenames for this PDF
-            existing_files = set()
+            with timer.stage('db_flush'):
+                exam = self.get_or_create_examination(metadata, extracted_data['exam_metadata'])
             
-            # Process each student
             students_in_pdf = extracted_data['students']
             self.logger.info(f"Processing {len(students_in_pdf)} students...")
             
-            for idx, student_data in enumerate(students_in_pdf, 1):
-                try:
-                    # Validate required fields
-                    if not student_data.get('ern') or not student_data.get('seat_no'):
-                        self.logger.warning(f"{student_data}")
-                        self.logger.warning(f"  Student {idx}: Missing ERN or seat number - skipping")
-                        self.stats['students_failed'] += 1
-                        continue
-                    if not student_data.get('college_code') or not student_data.get('college_name'):
-                        self.logger.warning(f"{student_data}")
-                        self.logger.warning(f"  Student {idx}: Missing college code or college name - skipping")
-                        self.stats['students_failed'] += 1
-                        continue
-                    
-                    
-                    # Generate filename
-                    student_filename = self.generate_student_filename(
-                        student_data, metadata.get('semester', 'Unknown'), existing_files
-                    )
-                    student_pdf_path = os.path.join(self.output_dir, student_filename)
-                    
-                    # Crop student record using dynamic line detection
-                    page_num = student_data['page_number']
-                    
-                    # Determine student position on this page (0-indexed)
-                    student_index = sum(
-                        1 for s in students_in_pdf[:idx-1] 
-                        if s['page_number'] == page_num
-                    )
-                    
-                    # Crop the PDF (uses dynamic detection, ignores total_students_on_page)
-                    success = PdfProcessor.crop_single_student(
-                        pdf_path, page_num, student_index, student_pdf_path
-                    )
-                    
-                    if not success:
-                        self.logger.warning(
-                            f"  Student {idx}: Failed to crop PDF (page={page_num}, index={student_index})"
-                        )
-                        self.stats['students_failed'] += 1
-                        continue
-                    
-                    self.stats['students_cropped'] += 1
-                    
-                    # Create or update Student record
-                    student = self.db_session.query(Student).filter_by(
-                        ern=student_data['ern']
-                    ).first()
-                    
-                    if not student:
-                        student = Student(
-                            ern=student_data['ern'],
-                            full_name=student_data.get('full_name', ''),
-                            gender=student_data.get('gender')
-                        )
-                        self.db_session.add(student)
-                    
-                    # Create StudentExamRecord
-                    exam_record = StudentExamRecord(
-                        student_ern=student_data['ern'],
-                        exam_id=exam.id,
-                        seat_no=student_data['seat_no'],
-                        college_code=student_data.get('college_code'),
-                        college_name=student_data.get('college_name'),
-                        status=student_data.get('status'),
-                        result=student_data.get('result'),
-                        page_number=student_data['page_number'],
-                        pdf_file=student_pdf_path
+            for message in prepared['skipped']:
+                self.logger.warning(message)
+                self.stats['students_failed'] += 1
+            
+            crop_result = prepared['crop_result']
+            cropped_paths = set(crop_result['successful'])
+            self.logger.info(
+                f"Cropped {len(cropped_paths)}/{len(prepared['pending_students'])} students "
+                f"({crop_result['crops_per_second']:.1f} crops/s)"
+            )
+            
+            # Queue cropped students for bulk insertion (full chunks are
+            # written while queueing, so the whole loop counts as db_flush)
+            db_start = time.perf_counter()
+            self.writer.preload_exam(exam.id)
+            written_before = self.writer.records_written
+            ignored_before = self.writer.records_ignored
+            failed_before = self.writer.records_failed
+            
+            for idx, student_data, crop_info in prepared['pending_students']:
+                student_pdf_path = crop_info['output_path']
+                
+                if student_pdf_path not in cropped_paths:
+                    self.logger.warning(
+                        f"  Student {idx}: Failed to crop PDF "
+                        f"(page={crop_info['page']}, index={crop_info['student_index']})"
                     )
-                    
-                    self.db_session.add(exam_record)
-                    self.db_session.commit()
-                    
-                    self.stats['db_records_created'] += 1
-                    
-                    self.logger.debug(
-                        f"  Student {idx}: {student_data['ern']} - "
-                        f"{student_data['full_name']} - {student_data['result']} ✓"
+                    self.stats['students_failed'] += 1
+                    continue
+                
+                self.stats['students_cropped'] += 1
+                
+                try:
+                    queued = self.writer.add(
+                        student_data, exam.id, student_pdf_path, source_pdf=pdf_basename,
+                        crop_info=crop_info
                     )
-                    
-                except IntegrityError as e:
-                    self.db_session.rollback()
+                except Exception as e:
+                    self.logger.error(f"  Student {idx}: Error writing records - {e}")
+                    continue
+                
+                if not queued:
                     self.logger.warning(
                         f"  Student {idx}: Duplicate record (ERN={student_data.get('ern')}) - skipping"
                     )
                     self.stats['students_failed'] += 1
-                    
-                except Exception as e:
-                    self.db_session.rollback()
-                    self.logger.error(f"  Student {idx}: Error - {e}")
-                    self.stats['students_failed'] += 1
+                    continue
+                
+                self.logger.debug(
+                    f"  Student {idx}: {student_data['ern']} - "
+                    f"{student_data['full_name']} - {student_data['result']} ✓"
+                )
+            
+            try:
+                self.writer.flush()
+            except Exception as e:
+                self.logger.error(f"Error writing records for {pdf_basename}: {e}")
+            timer.add('db_flush', time.perf_counter() - db_start)
+            
+            records_created = self.writer.records_written - written_before
+            records_failed = self.writer.records_failed - failed_before
+            self.stats['db_records_created'] += records_created
+            self.stats['students_failed'] += (
+                (self.writer.records_ignored - ignored_before) + records_failed
+            )
+            
+            # Remember this PDF so unchanged reruns skip it (retry if writes failed)
+            if not records_failed:
+                self.manifest.record(pdf_path, exam.id, records_created)
             
             self.stats['students_extracted'] += len(students_in_pdf)
             self.stats['pdfs_processed'] += 1
@@ -378,20 +452,33 @@ class BatchGradeProcessor:
             self.logger.debug(traceback.format_exc())
             self.stats['pdfs_failed'] += 1
             return False
+        
+        finally:
+            self.metrics.add_pdf(pdf_basename, timer)
     
     def process_all_pdfs(self) -> Dict[str, int]:
         """
         Process all PDFs in downloads directory.
         
+        With workers > 1, extraction and cropping run in a process pool while
+        this process keeps the database session and writes results in the
+        same order as a serial run.
+        
         Returns:
             Statistics dictionary
         """
+        self.metrics = RunMetrics()
+        
         self.logger.info("="*70)
         self.logger.info("BATCH PROCESSING STARTED")
         self.logger.info("="*70)
         self.logger.info(f"Downloads directory: {self.downloads_dir}")
         self.logger.info(f"Metadata directory: {self.metadata_dir}")
         self.logger.info(f"Output directory: {self.output_dir}")
+        self.logger.info(f"Workers: {self.workers}")
+        self.logger.info(f"Text backend: {self.text_backend}")
+        if self.text_cache:
+            self.logger.info(f"Text cache: {self.text_cache.cache_dir}")
         self.logger.info("="*70)
         
         # Find all PDF files
@@ -399,23 +486,343 @@ class BatchGradeProcessor:
         
         if not pdf_files:
             self.logger.error("No PDF files found!")
+            self.write_metrics()
             return self.stats
         
-        # Process each PDF
-        for idx, pdf_path in enumerate(pdf_files, 1):
-            self.logger.info(f"\n[{idx}/{len(pdf_files)}] Processing PDF...")
-            self.process_single_pdf(pdf_path)
+        # Skip PDFs ingested before and unchanged since
+        pdf_files = self.select_changed_pdfs(pdf_files)
+        
+        if self.workers > 1:
+            self._process_pdfs_parallel(pdf_files)
+        else:
+            # Process each PDF
+            for idx, pdf_path in enumerate(pdf_files, 1):
+                self.logger.info(f"\n[{idx}/{len(pdf_files)}] Processing PDF...")
+                self.process_single_pdf(pdf_path)
+        
+        self._log_summary()
+        self.write_metrics()
         
-        # Print final statistics
+        return self.stats
+    
+    def _log_summary(self):
+        """Log the final statistics of a run"""
         self.logger.info("\n" + "="*70)
         self.logger.info("BATCH PROCESSING COMPLETED")
         self.logger.info("="*70)
         self.logger.info(f"PDFs processed successfully: {self.stats['pdfs_processed']}")
         self.logger.info(f"PDFs failed: {self.stats['pdfs_failed']}")
+        self.logger.info(f"PDFs skipped (unchanged): {self.stats['pdfs_skipped']}")
+        if self.text_cache:
+            self.logger.info(
+                f"Text cache hits/misses: {self.stats['text_cache_hits']}/"
+                f"{self.stats['text_cache_misses']}"
+            )
         self.logger.info(f"Students extracted: {self.stats['students_extracted']}")
         self.logger.info(f"Student PDFs created: {self.stats['students_cropped']}")
         self.logger.info(f"Database records created: {self.stats['db_records_created']}")
         self.logger.info(f"Students failed: {self.stats['students_failed']}")
         self.logger.info("="*70)
+    
+    def write_metrics(self):
+        """Stop the run clock, log the stage timing report and write it as JSON"""
+        self.metrics.finish()
+        for line in self.metrics.format_report():
+            self.logger.debug(line)
+        try:
+            self.metrics.write_json(self.metrics_file)
+            self.logger.info(f"Stage metrics written to {self.metrics_file}")
+        except OSError as e:
+            self.logger.error(f"Error writing stage metrics {self.metrics_file}: {e}")
+    
+    def select_changed_pdfs(self, pdf_files: List[str]) -> List[str]:
+        """
+        Filter PDFs through the ingest manifest.
+        
+        Unchanged PDFs are dropped before any extraction. Records from changed
+        PDFs (new content or new extractor/cropper version) are deleted so the
+        PDF is ingested again from scratch.
+        
+        Args:
+            pdf_files: List of PDF file paths
+            
+        Returns:
+            PDF file paths that need processing
+        """
+        selected = [pdf_path for pdf_path in pdf_files if self.check_manifest(pdf_path)]
+        
+        self.logger.info(
+            f"{len(selected)} PDF(s) to process, {self.stats['pdfs_skipped']} unchanged"
+        )
+        return selected
+    
+    def check_manifest(self, pdf_path: str) -> bool:
+        """
+        Check one PDF against the ingest manifest.
+        
+        Records of a changed PDF are deleted so it is ingested from scratch.
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            True if the PDF needs processing, False if it is unchanged
+        """
+        status = self.manifest.check(pdf_path)
+        
+        if status == IngestManifest.STATUS_UNCHANGED and not self.force:
+            self.logger.debug(f"Unchanged, skipping: {os.path.basename(pdf_path)}")
+            self.stats['pdfs_skipped'] += 1
+            return False
+        
+        if status != IngestManifest.STATUS_NEW:
+            deleted = self.manifest.purge(pdf_path)
+            if deleted:
+                self.writer.clear_cache()
+            self.logger.info(
+                f"Re-processing {os.path.basename(pdf_path)} ({status}), "
+                f"replacing {deleted} old record(s)"
+            )
+        
+        return True
+    
+    def process_stream(self, pdf_queue: 'queue.Queue') -> Dict[str, int]:
+        """
+        Process PDFs as they arrive on a queue (e.g. from the scraper).
+        
+        Each queue item is (pdf_path, metadata), or None once the producer is
+        done; a None metadata is loaded from metadata_dir. With workers > 1,
+        extraction and cropping run in a process pool and results are written
+        here in completion order, so every PDF is in the database shortly
+        after it lands. At most 2 x workers PDFs are being prepared or waiting
+        to be written; a bounded pdf_queue caps the rest, blocking the
+        producer when full.
+        
+        Args:
+            pdf_queue: Queue of (pdf_path, metadata) items ending with None
+            
+        Returns:
+            Statistics dictionary
+        """
+        self.metrics = RunMetrics()
+        
+        self.logger.info("="*70)
+        self.logger.info("STREAMING BATCH PROCESSING STARTED")
+        self.logger.info("="*70)
+        self.logger.info(f"Output directory: {self.output_dir}")
+        self.logger.info(f"Workers: {self.workers}")
+        self.logger.info(f"Text backend: {self.text_backend}")
+        if self.text_cache:
+            self.logger.info(f"Text cache: {self.text_cache.cache_dir}")
+        self.logger.info("="*70)
+        
+        received = 0
+        max_in_flight = self.workers * 2
+        pending = {}
+        producer_done = False
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        
+        try:
+            while not producer_done or pending:
+                # Take new PDFs while there is room in the pool
+                while not producer_done and len(pending) < max_in_flight:
+                    try:
+                        item = pdf_queue.get(timeout=0.1 if pending else None)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        producer_done = True
+                        break
+                    
+                    pdf_path, metadata = item
+                    received += 1
+                    if not self.check_manifest(pdf_path):
+                        continue
+                    
+                    self.logger.info(f"\n[{received}] Processing PDF...")
+                    # Traced PDFs run in this process, where the trace log is set up
+                    if executor is None or not metadata or diagnostics.is_traced_pdf(pdf_path):
+                        self.process_single_pdf(pdf_path, metadata=metadata)
+                        continue
+                    
+                    future = executor.submit(
+                        _prepare_pdf_worker, pdf_path, self.output_dir,
+                        metadata.get('semester', 'Unknown'), self.text_backend,
+                        self.text_cache, self.output_mode
+                    )
+                    pending[future] = (pdf_path, metadata)
+                
+                # Write whatever the workers finished
+                if pending:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pdf_path, metadata = pending.pop(future)
+                        self.process_single_pdf(pdf_path, metadata=metadata,
+                                                prepared=future.result())
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        
+        self._log_summary()
+        self.write_metrics()
         
         return self.stats
+    
+    def _process_pdfs_parallel(self, pdf_files: List[str]):
+        """
+        Extract and crop PDFs in worker processes, writing results here.
+        
+        Tasks are submitted largest file first to keep all workers busy, but
+        results are consumed in pdf_files order so program/examination/student
+        rows are created exactly as in a serial run. PDFs selected for tracing
+        are prepared in this process.
+        
+        Args:
+            pdf_files: List of PDF file paths
+        """
+        metadata_by_pdf = {}
+        timers = {}
+        for pdf_path in pdf_files:
+            timers[pdf_path] = StageTimer()
+            with timers[pdf_path].stage('metadata_load'):
+                metadata_by_pdf[pdf_path] = self.load_metadata(pdf_path)
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+            for pdf_path in sorted(pdf_files, key=os.path.getsize, reverse=True):
+                metadata = metadata_by_pdf[pdf_path]
+                # Traced PDFs run in this process, where the trace log is set up
+                if metadata and not diagnostics.is_traced_pdf(pdf_path):
+                    futures[pdf_path] = executor.submit(
+                        _prepare_pdf_worker, pdf_path, self.output_dir,
+                        metadata.get('semester', 'Unknown'), self.text_backend,
+                        self.text_cache, self.output_mode
+                    )
+            
+            for idx, pdf_path in enumerate(pdf_files, 1):
+                self.logger.info(f"\n[{idx}/{len(pdf_files)}] Processing PDF...")
+                future = futures.get(pdf_path)
+                self.process_single_pdf(
+                    pdf_path,
+                    metadata=metadata_by_pdf[pdf_path] or {},
+                    prepared=future.result() if future else None,
+                    timer=timers[pdf_path]
+                )
+
+
+def prepare_pdf(pdf_path: str, output_dir: str, semester: str,
+                text_backend: str = DEFAULT_TEXT_BACKEND,
+                text_cache: Optional[PageTextCache] = None,
+                output_mode: str = DEFAULT_OUTPUT_MODE) -> Dict:
+    """
+    Extract students from a PDF and crop their records, without touching the database.
+    
+    This is the CPU-heavy part of processing a PDF. It is a module-level
+    function so it can run in a worker process.
+    
+    Args:
+        pdf_path: Path to PDF file
+        output_dir: Output directory for cropped student PDFs
+        semester: Semester identifier from metadata (used in filenames)
+        text_backend: Text extraction backend name
+        text_cache: Optional page text cache (picklable, so workers share the directory)
+        output_mode: 'files', 'bundle' (crop_info output paths become
+                     "bundle#page=N" references) or 'lazy' (they become
+                     crop descriptors and no files are written)
+        
+    Returns:
+        Dictionary with:
+        {
+            'extracted_data': SimpleStudentExtractor.process_pdf() result,
+            'text_cache_hit': True/False, or None without a cache,
+            'pending_students': [(idx, student_data, crop_info), ...],
+            'skipped': [warning message, ...] for students failing validation,
+            'crop_result': PdfProcessor.crop_students_single_pass() result,
+            'timer': StageTimer with extraction, parsing, detection and crop times
+        }
+    """
+    timer = StageTimer()
+    
+    # Extract data from PDF
+    extractor = SimpleStudentExtractor(pdf_path, text_backend=text_backend,
+                                       text_cache=text_cache)
+    hits_before = text_cache.hits if text_cache else 0
+    extracted_data = extractor.process_pdf(timer=timer)
+    
+    prepared = {
+        'extracted_data': extracted_data,
+        'text_cache_hit': text_cache.hits > hits_before if text_cache else None,
+        'pending_students': [],
+        'skipped': [],
+        'crop_result': None,
+        'timer': timer
+    }
+    
+    students_in_pdf = extracted_data['students']
+    if not students_in_pdf:
+        return prepared
+    
+    # Track filenames for this PDF
+    existing_files = set()
+    page_crops = []
+    bundle_path = bundle_path_for(output_dir, pdf_path) if output_mode == 'bundle' else None
+    
+    # Group students by page up front (extraction order kept within a page):
+    # a student's position on its page is its position in the page's group
+    students_by_page = {}
+    for idx, student_data in enumerate(students_in_pdf, 1):
+        students_by_page.setdefault(student_data['page_number'], []).append((idx, student_data))
+    
+    for page_num, page_students in students_by_page.items():
+        for student_index, (idx, student_data) in enumerate(page_students):
+            # Validate required fields
+            if not student_data.get('ern') or not student_data.get('seat_no'):
+                prepared['skipped'].append(
+                    f"{student_data}\n  Student {idx}: Missing ERN or seat number - skipping"
+                )
+                continue
+            if not student_data.get('college_code') or not student_data.get('college_name'):
+                prepared['skipped'].append(
+                    f"{student_data}\n  Student {idx}: Missing college code or college name - skipping"
+                )
+                continue
+            
+            # Generate filename (bundled and lazy records get their reference when cropped)
+            student_pdf_path = None
+            if bundle_path is None and output_mode != 'lazy':
+                student_filename = BatchGradeProcessor.generate_student_filename(
+                    student_data, semester, existing_files
+                )
+                student_pdf_path = os.path.join(output_dir, student_filename)
+            
+            crop_info = {
+                'page': page_num,
+                'student_index': student_index,
+                'output_path': student_pdf_path
+            }
+            if bundle_path is not None:
+                # Addressable by ERN in the bundle index
+                crop_info['ern'] = student_data['ern']
+                crop_info['seat_no'] = student_data['seat_no']
+            page_crops.append(crop_info)
+            prepared['pending_students'].append((idx, student_data, crop_info))
+    
+    # Crop all student records in one pass over the source PDF
+    prepared['crop_result'] = PdfProcessor.crop_students_single_pass(pdf_path, page_crops,
+                                                                     timer=timer,
+                                                                     bundle_path=bundle_path,
+                                                                     lazy=output_mode == 'lazy')
+    
+    return prepared
+
+
+def _prepare_pdf_worker(pdf_path: str, output_dir: str, semester: str,
+                        text_backend: str, text_cache: Optional[PageTextCache],
+                        output_mode: str = DEFAULT_OUTPUT_MODE) -> Dict:
+    """Run prepare_pdf() in a worker process, returning errors instead of raising."""
+    try:
+        return prepare_pdf(pdf_path, output_dir, semester, text_backend=text_backend,
+                           text_cache=text_cache, output_mode=output_mode)
+    except Exception as e:
+        import traceback
+        return {'error': str(e), 'traceback': traceback.format_exc()}
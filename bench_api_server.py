@@ -0,0 +1,271 @@
+"""
+=============================================================================
+Query API Check and Benchmark
+=============================================================================
+
+Builds a synthetic grade database (see bench_exam_statistics.py), starts
+the query API (api_server.py) on a local port in a separate process and
+checks it against the export_utils/ExamStatistics functions it exposes.
+
+Checks:
+1. Golden output: /students/<ern> equals get_student_by_ern(), walking all
+   /failed pages returns exactly get_failed_students(), and /statistics
+   equals ExamStatistics.aggregate() for every grouping
+2. Caching: a repeated request with If-None-Match gets 304; after a
+   simulated ingest (new manifest entry and record, removed afterwards)
+   the ETag changes and the new record is counted
+3. Speed: requests per second over HTTP from concurrent clients, for
+   uncached ERN lookups, statistics and failed-student pages
+
+Exits with status 1 if any check fails.
+
+Usage:
+    python bench_api_server.py [--records N] [--clients N] [--requests N] [--db PATH]
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import uuid
+import logging
+import argparse
+import tempfile
+import http.client
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from werkzeug.serving import make_server
+
+from api_server import create_app
+from bench_exam_statistics import build_database
+from exam_statistics import ExamStatistics, GROUPINGS
+from export_utils import get_failed_students, get_student_by_ern
+from init_db import get_database_session
+from models import PdfManifest, StudentExamRecord
+
+
+def serve(db_path: str, pool_size: int, ports: multiprocessing.Queue):
+    """Server process: run the API on a free local port and report it"""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, create_app(db_path, pool_size=pool_size), threaded=True)
+    ports.put(server.server_port)
+    server.serve_forever()
+
+
+def get(port: int, path: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, dict, str]:
+    """GET path from the local server; returns (status, JSON body or {}, ETag)"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request('GET', path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        return response.status, json.loads(body) if body else {}, response.getheader('ETag', '')
+    finally:
+        conn.close()
+
+
+def jsonable(rows):
+    """Rows as they come back from the API (JSON round trip)"""
+    return json.loads(json.dumps(rows))
+
+
+def check_golden(port: int, session, erns: List[str]) -> List[str]:
+    """Compare API responses with the functions they expose"""
+    failures = []
+
+    for ern in erns:
+        status, body, _ = get(port, f'/students/{ern}')
+        if status != 200 or body['records'] != jsonable(get_student_by_ern(session, ern)):
+            failures.append(f"/students/{ern} differs from get_student_by_ern()")
+
+    status, _, _ = get(port, '/students/MU_MISSING')
+    if status != 404:
+        failures.append(f"/students/<unknown> returned {status}, expected 404")
+
+    items, cursor, pages = [], None, 0
+    while True:
+        path = '/failed?limit=1000' + (f'&cursor={cursor}' if cursor else '')
+        status, body, _ = get(port, path)
+        if status != 200:
+            failures.append(f"{path} returned {status}")
+            break
+        items += body['items']
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    def key(row):
+        return json.dumps(row, sort_keys=True)
+    expected = jsonable(get_failed_students(session))
+    if sorted(map(key, items)) != sorted(map(key, expected)):
+        failures.append(f"/failed pages ({len(items)} records) differ from "
+                        f"get_failed_students() ({len(expected)} records)")
+    print(f"  /failed: {len(items):,} records in {pages} pages")
+
+    engine = ExamStatistics(session)
+    for group_by in GROUPINGS:
+        status, body, _ = get(port, f'/statistics?group_by={group_by}')
+        if status != 200 or body['items'] != jsonable(engine.aggregate(group_by)):
+            failures.append(f"/statistics?group_by={group_by} differs from ExamStatistics")
+
+    for path in ('/failed?limit=0', '/failed?cursor=x', '/statistics?group_by=year',
+                 '/statistics?exam_year=abc', '/statistics?unknown=1'):
+        status, _, _ = get(port, path)
+        if status != 400:
+            failures.append(f"{path} returned {status}, expected 400")
+
+    return failures
+
+
+def check_caching(port: int, db_path: str) -> List[str]:
+    """
+    ETag revalidation, and invalidation by a (simulated) ingest.
+
+    The ingest adds one record and its manifest entry under a name unique to
+    this run, and removes them again afterwards (so a reused --db is left as
+    it was).
+    """
+    failures = []
+    path = '/statistics?group_by=exam'
+
+    status, before, etag = get(port, path)
+    revalidated, _, _ = get(port, path, {'If-None-Match': etag})
+    if revalidated != 304:
+        failures.append(f"revalidation returned {revalidated}, expected 304")
+
+    tag = uuid.uuid4().hex[:12].upper()
+    ern, pdf_filename = f'CHECK{tag}', f'check_caching_{tag}.pdf'
+    exam_id = before['items'][0]['exam_id']
+    total_before = before['items'][0]['total_students']
+
+    writer = get_database_session(db_path)
+    try:
+        writer.add(StudentExamRecord(student_ern=ern, exam_id=exam_id, seat_no=tag,
+                                     result='PASS', source_pdf=pdf_filename))
+        writer.add(PdfManifest(pdf_filename=pdf_filename, sha256='0' * 64, file_size=1, mtime=0.0,
+                               exam_id=exam_id, record_count=1, processed_at=datetime.now()))
+        writer.commit()
+
+        status, after, new_etag = get(port, path, {'If-None-Match': etag})
+        total_after = after['items'][0]['total_students'] if status == 200 else None
+        if status != 200 or new_etag == etag:
+            failures.append("ingest did not invalidate the ETag")
+        elif total_after != total_before + 1:
+            failures.append("statistics after ingest do not count the new record")
+    finally:
+        writer.query(StudentExamRecord).filter_by(student_ern=ern).delete()
+        writer.query(PdfManifest).filter_by(pdf_filename=pdf_filename).delete()
+        writer.commit()
+        writer.close()
+
+    status, restored, _ = get(port, path)
+    restored = status == 200 and restored['items'] == before['items']
+    if not restored:
+        failures.append("statistics after removing the ingest differ from the original")
+
+    print(f"  Revalidation: {revalidated}; exam {exam_id} after ingest: {total_before} -> "
+          f"{total_after} students; after cleanup: {'original' if restored else 'changed'}")
+    return failures
+
+
+def throughput(port: int, paths: List[str], clients: int) -> float:
+    """Requests per second for paths, spread over concurrent clients"""
+    errors = []
+
+    def fetch(path):
+        status, _, _ = get(port, path)
+        if status != 200:
+            errors.append(f"{path}: {status}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(fetch, paths))
+    seconds = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(f"{len(errors)} failed requests, e.g. {errors[0]}")
+    return len(paths) / seconds
+
+
+def main():
+    """Check and benchmark the query API on a synthetic database"""
+    parser = argparse.ArgumentParser(description='Check and benchmark the query API')
+    parser.add_argument('--records', type=int, default=200_000,
+                        help='Records in the synthetic database (default: 200000)')
+    parser.add_argument('--clients', type=int, default=8,
+                        help='Concurrent HTTP clients (default: 8)')
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Requests per timed endpoint (default: 2000)')
+    parser.add_argument('--db', help='Database file to build (or reuse if it exists); default: temporary')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_path = args.db or os.path.join(tmp_dir.name, 'api.db')
+
+    print("=" * 70)
+    print("Query API Check and Benchmark")
+    print("=" * 70)
+    if not os.path.exists(db_path):
+        build_database(db_path, args.records, exams=500, programs=60, colleges=400)
+        print(f"Built {db_path}: {args.records:,} records")
+    else:
+        print(f"Reusing {db_path}")
+
+    session = get_database_session(db_path)
+    record_count = session.query(StudentExamRecord).count()
+    rng = random.Random(7)
+    erns = [ern for (ern,) in session.query(StudentExamRecord.student_ern).limit(20)]
+
+    # Separate process, so the clients do not compete with the server for the GIL
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(db_path, args.clients, ports), daemon=True)
+    server.start()
+    port = ports.get(timeout=30)
+    print(f"Serving on port {port}, {args.clients} clients")
+    print()
+
+    print("Golden output:")
+    failures = check_golden(port, session, erns)
+    print("Caching:")
+    failures += check_caching(port, db_path)
+    session.close()
+
+    print()
+    print(f"{'Endpoint':<44} {'Requests':>9} {'Req/s':>9}")
+    print("-" * 70)
+    timed = [
+        ('/students/<ern> (distinct, uncached)',
+         [f'/students/MU{rng.randrange(record_count):012d}' for _ in range(args.requests)]),
+        ('/statistics?group_by=college (cached)',
+         ['/statistics?group_by=college'] * args.requests),
+        ('/failed?limit=100 (distinct cursors)',
+         [f'/failed?limit=100&cursor={rng.randrange(record_count)}' for _ in range(args.requests)]),
+    ]
+    for name, paths in timed:
+        print(f"{name:<44} {len(paths):>9} {throughput(port, paths, args.clients):>9.0f}")
+
+    print("=" * 70)
+
+    server.terminate()
+    server.join()
+    tmp_dir.cleanup()
+
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+
+    print("✓ API responses match export_utils and ExamStatistics")
+
+
+if __name__ == '__main__':
+    main()
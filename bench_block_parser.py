@@ -0,0 +1,260 @@
+"""
+=============================================================================
+Student Block Parser Micro-Benchmark
+=============================================================================
+
+Measures the per-block cost of SimpleStudentExtractor's block parsing on
+real student blocks taken from the PDFs in downloads/, against the
+previous parser (one re.search per field, kept below as the reference).
+
+Checks:
+1. Golden output: find_student_blocks() and extract_student_basic_info()
+   return exactly what the reference parser returns for every page/block
+2. Speed: microseconds per page (block splitting) and per block (fields)
+
+Exits with status 1 if any output differs from the reference.
+
+Usage:
+    python bench_block_parser.py [--downloads DIR] [--limit N] [--repeat N]
+
+Examples:
+    python bench_block_parser.py
+    python bench_block_parser.py --limit 10 --repeat 5
+    python bench_block_parser.py --text-cache .text_cache --text-backend pdfplumber
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+from typing import Callable, Dict, List, Optional
+
+from extract_simple import SimpleStudentExtractor
+from text_backends import TEXT_BACKENDS, get_text_backend
+from text_cache import PageTextCache
+
+
+# =============================================================================
+# Reference parser (search per field), used for the golden-output check
+# =============================================================================
+
+def reference_find_student_blocks(page_text: str) -> List[str]:
+    """Previous SimpleStudentExtractor.find_student_blocks()"""
+    lines = page_text.split('\n')
+
+    student_start_indices = []
+    for i, line in enumerate(lines):
+        if i > 0 and re.match(r'^\(MU\d+', lines[i-1].strip()):
+            if re.match(r'^\d{9}\s+[A-Z]', line.strip()):
+                student_start_indices.append(i - 1)
+                continue
+
+        if re.match(r'^\d{9}\s+[A-Z]', line.strip()):
+            student_start_indices.append(i)
+
+    blocks = []
+    for i in range(len(student_start_indices)):
+        start = student_start_indices[i]
+        end = student_start_indices[i + 1] if i + 1 < len(student_start_indices) else len(lines)
+        block_text = '\n'.join(lines[start:end])
+        if 'I1' in block_text and 'TOT' in block_text:
+            blocks.append(block_text)
+
+    return blocks
+
+
+def reference_extract_student_basic_info(block_text: str, page_number: int,
+                                         student_index: int) -> Optional[Dict]:
+    """Previous SimpleStudentExtractor.extract_student_basic_info() (without logging)"""
+    lines = [l.strip() for l in block_text.split('\n') if l.strip()]
+
+    student = {
+        'ern': None,
+        'full_name': None,
+        'seat_no': None,
+        'status': None,
+        'gender': None,
+        'result': None,
+        'page_number': page_number,
+        'student_index': student_index,
+        'college_code': None,
+        'college_name': None
+    }
+
+    full_text = ' '.join(lines)
+
+    seat_match = re.search(r'\b(\d{9})\s+([A-Z][A-Z\s]+?)(?:\s+(?:Regular|Repeater|ATKT|Ex-Student)|(?:\s+(?:MALE|FEMALE)))', full_text)
+    if seat_match:
+        student['seat_no'] = seat_match.group(1)
+        student['full_name'] = ' '.join(seat_match.group(2).strip().split())
+
+    ern_match = re.search(r'\(MU(\d+)\)', full_text) or re.search(r'\(MU(\d+)', full_text)
+    if ern_match:
+        student['ern'] = 'MU' + ern_match.group(1)
+
+    status_match = re.search(r'\b(Regular|Repeater|ATKT|Ex-Student)\b', full_text)
+    if status_match:
+        student['status'] = status_match.group(1)
+
+    gender_match = re.search(r'\b(MALE|FEMALE)\b', full_text)
+    if gender_match:
+        student['gender'] = gender_match.group(1)[0]
+
+    college_match = (re.search(r'\) MU-(\d+): (.+?) E1', full_text, re.DOTALL) or
+                     re.search(r'MU-(\d+): (.+?) E1', full_text, re.DOTALL))
+    if college_match:
+        student['college_code'] = 'MU-' + college_match.group(1)
+        college_name_clean = re.sub(r'\s*(?:\d.*|MAR.*)$', '', college_match.group(2))
+        college_name_clean = re.sub(r'[^a-zA-Z\s&,]', '', college_name_clean)
+        student['college_name'] = ' '.join(college_name_clean.split()).strip()
+
+    if 'PASS' in full_text or 'PAS' in full_text:
+        student['result'] = 'PASS'
+    elif 'FAIL' in full_text or 'FAI' in full_text:
+        student['result'] = 'FAIL'
+
+    if not student['seat_no'] or not student['full_name'] or not student['result']:
+        return None
+
+    return student
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def time_per_item(func: Callable, items: List, repeat: int) -> float:
+    """Best-of-repeat seconds per item for calling func on every item"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(*item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) if items else 0.0
+
+
+def main():
+    """Run the golden-output check and the micro-benchmark"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark student block parsing against the previous parser'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing PDF files (default: downloads)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Only use the first N PDFs (sorted by name)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Timing repetitions, best one is reported (default: 3)'
+    )
+    parser.add_argument(
+        '--text-backend',
+        default='pymupdf',
+        choices=sorted(TEXT_BACKENDS),
+        help='Backend used to get page texts (default: pymupdf, the fastest)'
+    )
+    parser.add_argument(
+        '--text-cache',
+        metavar='DIR',
+        help='Read/write page texts through a PageTextCache in DIR'
+    )
+
+    args = parser.parse_args()
+
+    # Extractor warnings would drown the report
+    logging.basicConfig(level=logging.ERROR)
+
+    pdf_files = sorted(
+        os.path.join(args.downloads, f)
+        for f in os.listdir(args.downloads) if f.lower().endswith('.pdf')
+    )
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    backend = get_text_backend(args.text_backend)
+    cache = PageTextCache(args.text_cache) if args.text_cache else None
+
+    print("=" * 70)
+    print("Student Block Parser Benchmark")
+    print("=" * 70)
+    print(f"PDFs: {len(pdf_files)}, text backend: {backend.name}")
+
+    # Collect student pages and blocks
+    extractor = SimpleStudentExtractor('', text_backend=args.text_backend)
+    pages = []
+    for pdf_path in pdf_files:
+        if cache:
+            page_texts = cache.get_or_extract(pdf_path, backend)
+        else:
+            page_texts = backend.extract_page_texts(pdf_path)
+        pages.extend(
+            (text, page_num) for page_num, text in enumerate(page_texts)
+            if text and not extractor.is_index_page(text)
+        )
+
+    blocks = []
+    mismatches = 0
+    for page_text, page_num in pages:
+        page_blocks = extractor.find_student_blocks(page_text)
+        if page_blocks != reference_find_student_blocks(page_text):
+            mismatches += 1
+            print(f"  ✗ Block split differs on page {page_num + 1}")
+        blocks.extend(
+            (block, page_num, student_index)
+            for student_index, block in enumerate(page_blocks)
+        )
+
+    for block, page_num, student_index in blocks:
+        expected = reference_extract_student_basic_info(block, page_num, student_index)
+        actual = extractor.extract_student_basic_info(block, page_num, student_index)
+        if actual != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  ✗ Fields differ on page {page_num + 1}, index {student_index}")
+                print(f"    expected: {expected}")
+                print(f"    actual:   {actual}")
+
+    print(f"Pages: {len(pages)}, blocks: {len(blocks)}")
+    print()
+
+    page_items = [(text,) for text, _ in pages]
+    results = [
+        ('find_student_blocks', 'page',
+         time_per_item(reference_find_student_blocks, page_items, args.repeat),
+         time_per_item(extractor.find_student_blocks, page_items, args.repeat)),
+        ('extract_student_basic_info', 'block',
+         time_per_item(reference_extract_student_basic_info, blocks, args.repeat),
+         time_per_item(extractor.extract_student_basic_info, blocks, args.repeat)),
+    ]
+
+    print(f"{'Step':<28} {'Unit':<6} {'Before us':>10} {'After us':>10} {'Speedup':>8}")
+    print("-" * 70)
+    for name, unit, before, after in results:
+        speedup = before / after if after > 0 else 0.0
+        print(f"{name:<28} {unit:<6} {before * 1e6:>10.1f} {after * 1e6:>10.1f} {speedup:>7.2f}x")
+    print("=" * 70)
+
+    if mismatches:
+        print(f"✗ {mismatches} output difference(s) from the reference parser")
+        sys.exit(1)
+
+    print("✓ Output identical to the reference parser")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+=============================================================================
+Examination Statistics Benchmark
+=============================================================================
+
+Builds a synthetic grade database (1,000,000 records by default) and
+compares exam statistics computed by the previous get_exam_statistics()
+(three COUNT queries per examination, kept below as the reference) with
+ExamStatistics (one grouped query per grouping).
+
+Checks:
+1. Golden output: the exam grouping returns exactly the reference values
+   for every examination
+2. Speed: reference vs grouped query, every grouping, and cached lookups
+
+Exits with status 1 if any value differs from the reference.
+
+Usage:
+    python bench_exam_statistics.py [--records N] [--exams N] [--db PATH]
+
+Examples:
+    python bench_exam_statistics.py
+    python bench_exam_statistics.py --records 100000 --exams 200
+    python bench_exam_statistics.py --db /tmp/stats_1m.db   # reuse between runs
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine
+
+from init_db import get_database_session
+from models import Base, Examination, StudentExamRecord
+from exam_statistics import ExamStatistics, GROUPINGS
+
+RESULTS = ('PASS', 'PASS', 'PASS', 'FAIL', 'FAIL', None)
+STATUSES = ('Regular', 'Regular', 'Regular', 'ATKT', 'Ex-Student')
+SEMESTERS = [f"Semester - {numeral}" for numeral in ('I', 'II', 'III', 'IV', 'V', 'VI')]
+
+
+# =============================================================================
+# Reference implementation (N+1 queries), used for the golden-output check
+# =============================================================================
+
+def reference_exam_statistics(db_session) -> List[Dict[str, Any]]:
+    """Previous export_utils.get_exam_statistics()"""
+    exams = db_session.query(Examination).all()
+
+    stats = []
+    for exam in exams:
+        total = db_session.query(StudentExamRecord).filter_by(exam_id=exam.id).count()
+        passed = db_session.query(StudentExamRecord).filter_by(
+            exam_id=exam.id, result='PASS'
+        ).count()
+        failed = db_session.query(StudentExamRecord).filter_by(
+            exam_id=exam.id, result='FAIL'
+        ).count()
+
+        stats.append({
+            'exam_id': exam.id,
+            'exam_title': exam.exam_title,
+            'semester': exam.semester,
+            'exam_type': exam.exam_type,
+            'result_date': exam.result_date,
+            'total_students': total,
+            'passed': passed,
+            'failed': failed,
+            'pass_percentage': round((passed / total * 100) if total > 0 else 0, 2)
+        })
+
+    return stats
+
+
+# =============================================================================
+# Synthetic database
+# =============================================================================
+
+def build_database(db_path: str, records: int, exams: int, programs: int,
+                   colleges: int, seed: int = 1):
+    """
+    Create a synthetic grade database (one student per record).
+
+    Args:
+        db_path: SQLite database file (created)
+        records: Number of student exam records
+        exams: Number of examinations (one left without records)
+        programs: Number of programs
+        colleges: Number of colleges
+        seed: Random seed
+    """
+    Base.metadata.create_all(create_engine(f'sqlite:///{db_path}'))
+    rng = random.Random(seed)
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO programs (program_code, program_name) VALUES (?, ?)",
+        [(f"{1150000 + p}", f"Program {p}") for p in range(programs)]
+    )
+    conn.executemany(
+        "INSERT INTO examinations (id, program_code, semester, exam_type, exam_title, "
+        "exam_year, result_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(e, f"{1150000 + e % programs}", SEMESTERS[e % len(SEMESTERS)],
+          'REGULAR' if e % 4 else 'SUPPLEMENTARY', f"Examination {e}",
+          2020 + e % 6, f"{2020 + e % 6}-06-01")
+         for e in range(1, exams + 1)]
+    )
+
+    def rows():
+        for i in range(records):
+            college = rng.randrange(colleges)
+            exam_id = rng.randrange(1, exams)
+            yield (f"MU{i:012d}", exam_id, f"{500000000 + i}",
+                   f"MU-{college:04d}", f"College {college}",
+                   rng.choice(STATUSES), rng.choice(RESULTS), i % 300, f"register_{exam_id}.pdf")
+
+    conn.executemany(
+        "INSERT INTO student_exam_records (student_ern, exam_id, seat_no, college_code, "
+        "college_name, status, result, page_number, source_pdf) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows()
+    )
+    conn.executemany(
+        "INSERT INTO students (ern, full_name, gender) VALUES (?, ?, ?)",
+        ((f"MU{i:012d}", f"STUDENT {i}", 'MF'[i % 2]) for i in range(records))
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(func, repeat: int):
+    """Best time of repeat calls, and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Benchmark exam statistics on a synthetic database"""
+    parser = argparse.ArgumentParser(
+        description='Compare N+1 and grouped exam statistics on a synthetic database'
+    )
+    parser.add_argument('--records', type=int, default=1_000_000,
+                        help='Student exam records (default: 1000000)')
+    parser.add_argument('--exams', type=int, default=500,
+                        help='Examinations (default: 500)')
+    parser.add_argument('--programs', type=int, default=60,
+                        help='Programs (default: 60)')
+    parser.add_argument('--colleges', type=int, default=400,
+                        help='Colleges (default: 400)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed repetitions, best is reported (default: 3)')
+    parser.add_argument('--db',
+                        help='Database file to build (or reuse if it exists); default: temporary')
+
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if db_path is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp_dir.name, 'stats.db')
+
+    print("=" * 70)
+    print("Examination Statistics Benchmark")
+    print("=" * 70)
+
+    if not os.path.exists(db_path):
+        start = time.perf_counter()
+        build_database(db_path, args.records, args.exams, args.programs, args.colleges)
+        print(f"Built {db_path}: {args.records:,} records, {args.exams} exams "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        print(f"Reusing {db_path}")
+
+    session = get_database_session(db_path)
+    record_count = session.query(StudentExamRecord).count()
+    print(f"Records: {record_count:,}, examinations: {session.query(Examination).count()}")
+    print()
+
+    engine = ExamStatistics(session)
+    reference_time, reference = timed(lambda: reference_exam_statistics(session), args.repeat)
+    grouped_time, grouped = timed(lambda: engine.aggregate('exam'), args.repeat)
+
+    # Golden check on the keys the previous function returned
+    mismatches = 0
+    grouped_by_id = {row['exam_id']: row for row in grouped}
+    for expected in reference:
+        actual = grouped_by_id.get(expected['exam_id'])
+        if actual is None or any(actual[key] != value for key, value in expected.items()):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  ✗ exam {expected['exam_id']}: expected {expected}, got {actual}")
+    if len(grouped) != len(reference):
+        mismatches += 1
+        print(f"  ✗ {len(grouped)} exam rows, expected {len(reference)}")
+
+    print(f"{'Query':<34} {'Rows':>6} {'Seconds':>9} {'Speedup':>9}")
+    print("-" * 70)
+    print(f"{'reference (3 COUNTs per exam)':<34} {len(reference):>6} {reference_time:>9.3f} {'1.0x':>9}")
+    print(f"{'grouped: exam':<34} {len(grouped):>6} {grouped_time:>9.3f} "
+          f"{reference_time / grouped_time:>8.1f}x")
+
+    for group_by in GROUPINGS:
+        if group_by == 'exam':
+            continue
+        seconds, rows = timed(lambda: engine.aggregate(group_by), args.repeat)
+        print(f"{'grouped: ' + group_by:<34} {len(rows):>6} {seconds:>9.3f}")
+
+    seconds, rows = timed(lambda: engine.aggregate('college', semester='Semester - I',
+                                                   status='Regular'), args.repeat)
+    print(f"{'grouped: college (2 filters)':<34} {len(rows):>6} {seconds:>9.3f}")
+
+    cached = ExamStatistics(session, cache=True)
+    cached.aggregate('exam')
+    seconds, rows = timed(lambda: cached.aggregate('exam'), args.repeat)
+    print(f"{'cached: exam (repeat lookup)':<34} {len(rows):>6} {seconds:>9.4f} "
+          f"{reference_time / seconds:>8.0f}x")
+    print("=" * 70)
+
+    session.close()
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+    if mismatches:
+        print(f"✗ {mismatches} exam statistic(s) differ from the reference")
+        sys.exit(1)
+
+    print("✓ Grouped exam statistics match the reference")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""
+=============================================================================
+Separator Line Clustering Benchmark
+=============================================================================
+
+Checks and measures the NumPy line filtering and clustering of
+PdfProcessor (detect_horizontal_lines_batch(), _cluster_lines()) against
+the previous per-item Python implementation, kept below as the reference.
+
+Checks:
+1. Golden output on every page of the PDFs in downloads/: the per-page
+   detect_horizontal_lines() and the per-document
+   detect_horizontal_lines_batch() give exactly the reference lines
+2. Golden output on synthetic line lists (dense clusters, long chains,
+   several pages per batch): _cluster_lines() equals the reference
+   deduplication bit for bit
+3. Speed on the densest pages of the corpus (most candidate segments):
+   filtering + sorting + clustering from already extracted drawings, per
+   page in Python vs one vectorized batch, and end to end including
+   page.get_cdrawings()
+
+Exits with status 1 if any result differs from the reference.
+
+Usage:
+    python bench_line_clustering.py [--downloads DIR] [--limit N] [--densest N] [--repeat N]
+
+Examples:
+    python bench_line_clustering.py
+    python bench_line_clustering.py --limit 10 --densest 100
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+from typing import Callable, List
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from pdf_processor import PdfProcessor
+
+
+# =============================================================================
+# Reference implementation (per-item Python), used for the golden checks
+# =============================================================================
+
+def reference_deduplicate_lines(lines: List[float], threshold: float = 5) -> List[float]:
+    """Previous PdfProcessor._deduplicate_lines() (without logging)"""
+    if not lines:
+        return []
+
+    deduplicated = []
+    current_group = [lines[0]]
+    for i in range(1, len(lines)):
+        if lines[i] - lines[i - 1] <= threshold:
+            current_group.append(lines[i])
+        else:
+            deduplicated.append(sum(current_group) / len(current_group))
+            current_group = [lines[i]]
+    deduplicated.append(sum(current_group) / len(current_group))
+    return deduplicated
+
+
+def reference_lines_from_paths(paths: List[dict], min_line_length: float) -> List[float]:
+    """Previous filtering loop of detect_horizontal_lines() on get_cdrawings() paths"""
+    horizontal_lines = []
+    for path in paths:
+        path_x0, _, path_x1, _ = path['rect']
+        if path_x1 - path_x0 < min_line_length:
+            continue
+        for item in path['items']:
+            if item[0] == "l":
+                x1, y1 = item[1]
+                x2, y2 = item[2]
+                if abs(y1 - y2) < 3 and abs(x2 - x1) >= min_line_length:
+                    horizontal_lines.append((y1 + y2) / 2)
+            elif item[0] == "re":
+                rx0, ry0, rx1, ry1 = item[1]
+                if abs(ry1 - ry0) < 3 and abs(rx1 - rx0) >= min_line_length:
+                    horizontal_lines.append((ry0 + ry1) / 2)
+
+    horizontal_lines.sort()
+    return reference_deduplicate_lines(horizontal_lines, threshold=5)
+
+
+# =============================================================================
+# Vectorized path on already extracted drawings
+# =============================================================================
+
+def vectorized_lines_from_paths(page_paths: List[List[dict]],
+                                min_line_length: float) -> List[List[float]]:
+    """detect_horizontal_lines_batch() minus page.get_cdrawings()"""
+    segments = []
+    segment_pages = []
+    for index, paths in enumerate(page_paths):
+        page_segments = PdfProcessor._line_segments(paths, min_line_length)
+        segments.extend(page_segments)
+        segment_pages.extend([index] * len(page_segments))
+
+    ys, page_ids = PdfProcessor._horizontal_segments(segments, segment_pages, min_line_length)
+    line_pages, lines = PdfProcessor._cluster_lines(ys, page_ids, threshold=5)
+    starts = np.searchsorted(line_pages, np.arange(len(page_paths)), side='left')
+    ends = np.searchsorted(line_pages, np.arange(len(page_paths)), side='right')
+    lines = lines.tolist()
+    return [lines[start:end] for start, end in zip(starts, ends)]
+
+
+# =============================================================================
+# Golden checks
+# =============================================================================
+
+def report_mismatch(mismatches: int, label: str, expected, actual) -> int:
+    """Print the first few differences, return the updated count"""
+    mismatches += 1
+    if mismatches <= 5:
+        print(f"  ✗ {label}")
+        print(f"    expected: {expected}")
+        print(f"    actual:   {actual}")
+    return mismatches
+
+
+def check_synthetic(cases: int, seed: int = 0) -> int:
+    """Compare _cluster_lines() with the reference on random line lists"""
+    rng = random.Random(seed)
+    mismatches = 0
+
+    for case in range(cases):
+        pages = []
+        for _ in range(rng.randint(1, 8)):
+            lines = []
+            y = rng.uniform(0, 100)
+            for _ in range(rng.randint(0, 40)):
+                # Mostly dense clusters (gaps up to the threshold), some long jumps
+                y += rng.choice([rng.uniform(0, 5), 5.0, rng.uniform(5, 200)])
+                lines.append(y)
+            pages.append(sorted(lines))
+
+        ys = np.array([y for lines in pages for y in lines], dtype=float)
+        page_ids = np.array([i for i, lines in enumerate(pages) for _ in lines], dtype=np.intp)
+        line_pages, clustered = PdfProcessor._cluster_lines(ys, page_ids, threshold=5)
+
+        for i, lines in enumerate(pages):
+            expected = reference_deduplicate_lines(lines)
+            actual = clustered[line_pages == i].tolist()
+            if actual != expected:
+                mismatches = report_mismatch(mismatches, f"Synthetic case {case}, page {i}",
+                                             expected, actual)
+
+    return mismatches
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def best_time(func: Callable, repeat: int) -> float:
+    """Best-of-repeat seconds for one call of func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the golden checks and the benchmark"""
+    parser = argparse.ArgumentParser(
+        description='Check and benchmark vectorized separator line clustering'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing PDF files (default: downloads)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Only use the first N PDFs (sorted by name)'
+    )
+    parser.add_argument(
+        '--densest',
+        type=int,
+        default=200,
+        help='Benchmark the N pages with the most candidate segments (default: 200)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Timing repetitions, best one is reported (default: 5)'
+    )
+    parser.add_argument(
+        '--synthetic',
+        type=int,
+        default=2000,
+        help='Synthetic golden-check cases (default: 2000)'
+    )
+    parser.add_argument(
+        '--min-line-length',
+        type=float,
+        default=200,
+        help='Minimum separator length in points (default: 200, as used for cropping)'
+    )
+
+    args = parser.parse_args()
+    min_length = args.min_line_length
+
+    # Detection errors are reported as differences below
+    logging.basicConfig(level=logging.CRITICAL)
+
+    pdf_files = sorted(
+        os.path.join(args.downloads, f)
+        for f in os.listdir(args.downloads) if f.lower().endswith('.pdf')
+    )
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    print("=" * 70)
+    print("Separator Line Clustering Benchmark")
+    print("=" * 70)
+    print(f"PDFs: {len(pdf_files)}, min line length: {min_length}")
+
+    docs = [fitz.open(pdf_path) for pdf_path in pdf_files]
+    mismatches = 0
+    page_paths = []
+    pages = []
+
+    for doc in docs:
+        doc_pages = list(doc)
+        batch = PdfProcessor.detect_horizontal_lines_batch(doc_pages, min_line_length=min_length)
+        for page, batch_lines in zip(doc_pages, batch):
+            paths = page.get_cdrawings()
+            expected = reference_lines_from_paths(paths, min_length)
+            single = PdfProcessor.detect_horizontal_lines(page, min_line_length=min_length)
+            where = f"page {page.number + 1} of {os.path.basename(doc.name)}"
+            if single != expected:
+                mismatches = report_mismatch(mismatches, f"Per-page lines differ on {where}",
+                                             expected, single)
+            if batch_lines != expected:
+                mismatches = report_mismatch(mismatches, f"Batch lines differ on {where}",
+                                             expected, batch_lines)
+            pages.append(page)
+            page_paths.append(paths)
+
+    print(f"Pages checked: {len(pages)}")
+
+    mismatches += check_synthetic(args.synthetic)
+    print(f"Synthetic cases checked: {args.synthetic}")
+
+    # Densest pages: most candidate segments for the vectorized filter
+    density = [len(PdfProcessor._line_segments(paths, min_length)) for paths in page_paths]
+    densest = sorted(range(len(pages)), key=lambda i: density[i], reverse=True)[:args.densest]
+    dense_paths = [page_paths[i] for i in densest]
+    dense_pages = [pages[i] for i in densest]
+    if densest:
+        print(f"Densest {len(densest)} pages: {min(density[i] for i in densest)}-"
+              f"{max(density[i] for i in densest)} candidate segments, "
+              f"{sum(len(page_paths[i]) for i in densest) / len(densest):.0f} paths per page")
+    print()
+
+    timings = [
+        ('Python, per page', 'drawings',
+         lambda: [reference_lines_from_paths(paths, min_length) for paths in dense_paths]),
+        ('NumPy, one batch', 'drawings',
+         lambda: vectorized_lines_from_paths(dense_paths, min_length)),
+        ('Python, per page', 'end to end',
+         lambda: [reference_lines_from_paths(page.get_cdrawings(), min_length)
+                  for page in dense_pages]),
+        ('NumPy, one batch', 'end to end',
+         lambda: PdfProcessor.detect_horizontal_lines_batch(dense_pages, min_line_length=min_length)),
+    ]
+
+    print(f"{'Implementation':<20} {'Input':<12} {'Pages/s':>10} {'ms/page':>10} {'Speedup':>8}")
+    print("-" * 70)
+    baseline = {}
+    for name, scope, func in timings:
+        seconds = best_time(func, args.repeat) / len(dense_pages) if dense_pages else 0.0
+        baseline.setdefault(scope, seconds)
+        rate = 1 / seconds if seconds > 0 else 0.0
+        speedup = baseline[scope] / seconds if seconds > 0 else 0.0
+        print(f"{name:<20} {scope:<12} {rate:>10.1f} {seconds * 1000:>10.3f} {speedup:>7.2f}x")
+    print("=" * 70)
+
+    for doc in docs:
+        doc.close()
+
+    if mismatches:
+        print(f"✗ {mismatches} result(s) differ from the reference")
+        sys.exit(1)
+
+    print("✓ Separator lines identical to the reference on every page and synthetic case")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,506 @@
+"""
+=============================================================================
+Pipeline Benchmark Suite
+=============================================================================
+
+Runs the real pipeline stages over the PDFs in downloads/ and reports
+throughput and memory, so changes to extract_simple.py, pdf_processor.py
+or the database layer can be checked for speed regressions.
+
+Stages:
+1. extraction  SimpleStudentExtractor.process_pdf() (page text + block parsing)
+2. detection   PdfProcessor.detect_student_boundaries() on every student page
+3. crop        PdfProcessor.crop_students_single_pass() into a temp directory
+               (detects boundaries again, breakdown reports both parts)
+4. ingest      BulkRecordWriter into a temporary SQLite database
+
+For every stage: seconds, pages/s, students/s and peak RSS (reset before
+each stage where /proc/self/clear_refs allows it, otherwise the process
+peak so far).
+
+Results are written as JSON. With --baseline, every throughput figure is
+compared against a stored result and the script exits with status 1 if
+one is slower (or peak RSS is larger) by more than --threshold percent.
+
+Usage:
+    python bench_pipeline.py [--downloads DIR] [--limit N] [--stages LIST]
+                             [--output FILE] [--baseline FILE] [--threshold PCT]
+
+Examples:
+    python bench_pipeline.py --output bench_baseline.json
+    python bench_pipeline.py --baseline bench_baseline.json --threshold 10
+    python bench_pipeline.py --limit 10 --stages extraction,detection
+    python bench_pipeline.py --text-backend pdfplumber --text-cache .text_cache
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from batch_processor import BatchGradeProcessor
+from db_writer import BulkRecordWriter
+from extract_simple import SimpleStudentExtractor
+from init_db import init_database
+from layout_cache import SeparatorLayoutCache
+from metrics import StageTimer
+from models import Program, Examination
+from pdf_processor import PdfProcessor
+from text_backends import TEXT_BACKENDS
+from text_cache import PageTextCache
+
+STAGES = ('extraction', 'detection', 'crop', 'ingest')
+
+# Figures compared against the baseline: (key, higher_is_better)
+COMPARED_FIGURES = (
+    ('pages_per_second', True),
+    ('students_per_second', True),
+    ('peak_rss_mb', False),
+)
+
+
+# =============================================================================
+# Memory
+# =============================================================================
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak RSS of this process (Linux only).
+
+    Returns:
+        True if the peak was reset, False if only the process peak is available
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in megabytes"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+# =============================================================================
+# Stages
+# =============================================================================
+
+def bench_extraction(pdf_files: List[str], text_backend: str,
+                     text_cache: Optional[PageTextCache]) -> Dict:
+    """
+    Extract students from every PDF.
+
+    Returns:
+        Stage result with 'corpus': [{'pdf_path', 'pages', 'exam_metadata',
+        'students'}, ...] used by the later stages
+    """
+    timer = StageTimer()
+    corpus = []
+
+    for pdf_path in pdf_files:
+        extractor = SimpleStudentExtractor(pdf_path, text_backend=text_backend,
+                                           text_cache=text_cache)
+        pdf_timer = StageTimer()
+        extracted = extractor.process_pdf(timer=pdf_timer)
+        timer.merge(pdf_timer)
+
+        corpus.append({
+            'pdf_path': pdf_path,
+            'pages': pdf_timer.counts.get('pages', 0),
+            'exam_metadata': extracted['exam_metadata'],
+            'students': extracted['students']
+        })
+
+    return {
+        'seconds': timer.total_seconds,
+        'pages': timer.counts.get('pages', 0),
+        'students': timer.counts.get('students', 0),
+        'breakdown': dict(timer.seconds),
+        'corpus': corpus
+    }
+
+
+def bench_detection(corpus: List[Dict]) -> Dict:
+    """Detect student boundaries on every page that has students"""
+    pages = 0
+    students = 0
+    seconds = 0.0
+
+    for entry in corpus:
+        page_numbers = sorted({s['page_number'] for s in entry['students']})
+        if not page_numbers:
+            continue
+
+        doc = fitz.open(entry['pdf_path'])
+        # One layout cache per PDF, as in crop_students_single_pass()
+        layout_cache = SeparatorLayoutCache()
+        try:
+            start = time.perf_counter()
+            for page_num in page_numbers:
+                boundaries = PdfProcessor.detect_student_boundaries(
+                    doc[page_num], debug=False, layout_cache=layout_cache
+                )
+                students += boundaries['num_students']
+            seconds += time.perf_counter() - start
+        finally:
+            doc.close()
+        pages += len(page_numbers)
+
+    return {'seconds': seconds, 'pages': pages, 'students': students}
+
+
+def pending_crops(corpus: List[Dict], output_dir: str) -> List[Dict]:
+    """
+    Build the crops and records prepare_pdf() would create for each PDF.
+
+    Returns:
+        [{'pdf_path', 'exam_metadata', 'page_crops', 'students'}, ...] with
+        students as (student_data, output_path) pairs
+    """
+    jobs = []
+    for entry in corpus:
+        existing_files = set()
+        per_page = {}
+        page_crops = []
+        students = []
+
+        for student_data in entry['students']:
+            page_num = student_data['page_number']
+            student_index = per_page.get(page_num, 0)
+            per_page[page_num] = student_index + 1
+
+            if not (student_data.get('ern') and student_data.get('seat_no') and
+                    student_data.get('college_code') and student_data.get('college_name')):
+                continue
+
+            filename = BatchGradeProcessor.generate_student_filename(
+                student_data, 'BENCH', existing_files
+            )
+            output_path = os.path.join(output_dir, filename)
+            page_crops.append({
+                'page': page_num,
+                'student_index': student_index,
+                'output_path': output_path
+            })
+            students.append((student_data, output_path))
+
+        jobs.append({
+            'pdf_path': entry['pdf_path'],
+            'exam_metadata': entry['exam_metadata'],
+            'page_crops': page_crops,
+            'students': students
+        })
+
+    return jobs
+
+
+def bench_crop(jobs: List[Dict]) -> Dict:
+    """Crop and save every valid student record in one pass per PDF"""
+    timer = StageTimer()
+    seconds = 0.0
+    pages = 0
+    students = 0
+
+    for job in jobs:
+        if not job['page_crops']:
+            continue
+        result = PdfProcessor.crop_students_single_pass(
+            job['pdf_path'], job['page_crops'], debug=False, timer=timer
+        )
+        seconds += result['elapsed_seconds']
+        pages += len({crop['page'] for crop in job['page_crops']})
+        students += len(result['successful'])
+
+    return {
+        'seconds': seconds,
+        'pages': pages,
+        'students': students,
+        'breakdown': dict(timer.seconds)
+    }
+
+
+def bench_ingest(jobs: List[Dict], db_path: str, chunk_size: int) -> Dict:
+    """Write one examination per PDF and all its records into a fresh database"""
+    with redirect_stdout(io.StringIO()):
+        session = init_database(db_path)
+
+    try:
+        session.add(Program(program_code='BENCH', program_name='Benchmark'))
+        session.commit()
+
+        writer = BulkRecordWriter(session, chunk_size=chunk_size)
+        start = time.perf_counter()
+
+        for job in jobs:
+            if not job['students']:
+                continue
+            exam_data = job['exam_metadata']
+            exam = Examination(
+                program_code='BENCH',
+                semester=os.path.basename(job['pdf_path']),
+                exam_type='REGULAR',
+                exam_title=exam_data.get('exam_title'),
+                exam_month=exam_data.get('exam_month'),
+                exam_year=exam_data.get('exam_year'),
+                pdf_filename=os.path.basename(job['pdf_path'])
+            )
+            session.add(exam)
+            session.commit()
+
+            writer.preload_exam(exam.id)
+            source_pdf = os.path.basename(job['pdf_path'])
+            for student_data, output_path in job['students']:
+                writer.add(student_data, exam.id, output_path, source_pdf=source_pdf)
+            writer.flush()
+
+        seconds = time.perf_counter() - start
+    finally:
+        session.close()
+
+    return {
+        'seconds': seconds,
+        'pages': 0,
+        'students': writer.records_written,
+        'breakdown': {'records_ignored': writer.records_ignored}
+    }
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def finalize_stage(result: Dict, peak_mb: float, peak_reset: bool) -> Dict:
+    """Add throughput and memory figures to a stage result"""
+    seconds = result['seconds']
+    result['pages_per_second'] = result['pages'] / seconds if seconds > 0 and result['pages'] else None
+    result['students_per_second'] = result['students'] / seconds if seconds > 0 and result['students'] else None
+    result['peak_rss_mb'] = peak_mb
+    result['peak_rss_is_stage_peak'] = peak_reset
+    return result
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, threshold: float) -> int:
+    """
+    Print current figures against a baseline.
+
+    Args:
+        results: Current benchmark results
+        baseline: Stored benchmark results
+        threshold: Allowed change in percent before a figure counts as a regression
+
+    Returns:
+        Number of regressions
+    """
+    if (baseline.get('pdfs'), baseline.get('pages')) != (results['pdfs'], results['pages']):
+        print(f"⚠ Corpus differs from the baseline ({baseline.get('pdfs')} PDFs, "
+              f"{baseline.get('pages')} pages), figures may not be comparable")
+
+    print(f"{'Stage':<12} {'Figure':<20} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    print("-" * 70)
+
+    regressions = 0
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+
+        for key, higher_is_better in COMPARED_FIGURES:
+            before = previous.get(key)
+            after = current.get(key)
+            if not before or after is None:
+                continue
+
+            change = (after - before) / before * 100
+            worse = -change if higher_is_better else change
+            status = ''
+            if worse > threshold:
+                regressions += 1
+                status = '  ✗ REGRESSION'
+            print(f"{stage:<12} {key:<20} {before:>10.1f} {after:>10.1f} {change:>+7.1f}%{status}")
+
+    print("-" * 70)
+    return regressions
+
+
+def main():
+    """Run the benchmark stages and compare against a baseline"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the extraction, detection, crop and ingest stages'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing PDF files (default: downloads)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Only use the first N PDFs (sorted by name)'
+    )
+    parser.add_argument(
+        '--stages',
+        default=','.join(STAGES),
+        help=f'Comma-separated stages to time (default: {",".join(STAGES)}; '
+             'extraction always runs since the other stages need its output)'
+    )
+    parser.add_argument(
+        '--text-backend',
+        default='pymupdf',
+        choices=sorted(TEXT_BACKENDS),
+        help='Text extraction backend (default: pymupdf)'
+    )
+    parser.add_argument(
+        '--text-cache',
+        metavar='DIR',
+        help='Read/write page texts through a PageTextCache in DIR'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=BulkRecordWriter.DEFAULT_CHUNK_SIZE,
+        help=f'Records per bulk insert in the ingest stage (default: {BulkRecordWriter.DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--output',
+        default='bench_results.json',
+        help='Write results to this JSON file (default: bench_results.json)'
+    )
+    parser.add_argument(
+        '--baseline',
+        metavar='FILE',
+        help='Compare against results stored in FILE'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=10.0,
+        metavar='PCT',
+        help='Allowed slowdown/memory growth in percent (default: 10)'
+    )
+
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"Error: unknown stage(s): {', '.join(sorted(unknown))}")
+        sys.exit(2)
+
+    # Extractor/cropper warnings would drown the report
+    logging.basicConfig(level=logging.CRITICAL)
+
+    pdf_files = sorted(
+        os.path.join(args.downloads, f)
+        for f in os.listdir(args.downloads) if f.lower().endswith('.pdf')
+    )
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    cache = PageTextCache(args.text_cache) if args.text_cache else None
+
+    print("=" * 70)
+    print("Pipeline Benchmark")
+    print("=" * 70)
+    print(f"PDFs: {len(pdf_files)}, text backend: {args.text_backend}"
+          f"{', text cache: ' + args.text_cache if cache else ''}")
+    print()
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pymupdf': fitz.VersionBind,
+        'text_backend': args.text_backend,
+        'text_cache': bool(cache),
+        'pdfs': len(pdf_files),
+        'pages': 0,
+        'students': 0,
+        'stages': {}
+    }
+
+    work_dir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    try:
+        peak_reset = reset_peak_rss()
+        extraction = bench_extraction(pdf_files, args.text_backend, cache)
+        corpus = extraction.pop('corpus')
+        results['pages'] = extraction['pages']
+        results['students'] = extraction['students']
+        if 'extraction' in stages:
+            results['stages']['extraction'] = finalize_stage(extraction, peak_rss_mb(), peak_reset)
+
+        jobs = pending_crops(corpus, os.path.join(work_dir, 'crops'))
+
+        for stage in ('detection', 'crop', 'ingest'):
+            if stage not in stages:
+                continue
+            peak_reset = reset_peak_rss()
+            if stage == 'detection':
+                result = bench_detection(corpus)
+            elif stage == 'crop':
+                result = bench_crop(jobs)
+            else:
+                result = bench_ingest(jobs, os.path.join(work_dir, 'bench.db'), args.chunk_size)
+            results['stages'][stage] = finalize_stage(result, peak_rss_mb(), peak_reset)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'Stage':<12} {'Seconds':>9} {'Pages':>7} {'Pages/s':>9} "
+          f"{'Students':>9} {'Students/s':>11} {'Peak MB':>8}")
+    print("-" * 70)
+    for stage, result in results['stages'].items():
+        pages_per_second = f"{result['pages_per_second']:.1f}" if result['pages_per_second'] else '-'
+        students_per_second = f"{result['students_per_second']:.1f}" if result['students_per_second'] else '-'
+        print(f"{stage:<12} {result['seconds']:>9.2f} {result['pages']:>7} {pages_per_second:>9} "
+              f"{result['students']:>9} {students_per_second:>11} {result['peak_rss_mb']:>8.1f}")
+    print("-" * 70)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print()
+    print(f"Comparison with {args.baseline} (threshold {args.threshold:.0f}%):")
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"✗ {regressions} regression(s) above {args.threshold:.0f}%")
+        sys.exit(1)
+
+    print("✓ No regressions")
+
+
+if __name__ == '__main__':
+    main()
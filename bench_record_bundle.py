@@ -0,0 +1,217 @@
+"""
+=============================================================================
+Record Bundle Output Benchmark
+=============================================================================
+
+Compares the two output modes of PdfProcessor.crop_students_single_pass()
+on the PDFs in downloads/:
+- files:  one PDF per student record (default)
+- bundle: one multi-page PDF per source PDF plus its offset index
+          (record_bundle.py)
+
+Every student detected on every page is cropped, in both modes, into
+temporary directories.
+
+Checks:
+1. Golden output: every bundle page has the same cropbox as the record's
+   single PDF, and renders to the same pixels (every --render-every'th
+   record, at 36 dpi)
+2. The bundle index addresses every record (by ERN key and page)
+3. Disk usage, files (inodes), write time (crop_save stage) and total
+   time (including separator detection, the same in both modes) per mode
+
+Exits with status 1 on any difference.
+
+Usage:
+    python bench_record_bundle.py [--downloads DIR] [--limit N] [--render-every N]
+
+Examples:
+    python bench_record_bundle.py --limit 10
+    python bench_record_bundle.py --render-every 1
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Dict, List
+
+import fitz  # PyMuPDF
+
+from metrics import StageTimer
+from pdf_processor import PdfProcessor
+from record_bundle import RecordBundle, bundle_path_for, extract_record
+
+
+def all_student_crops(pdf_path: str, output_dir: str) -> List[Dict]:
+    """Crop requests for every student detected in a PDF"""
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    with fitz.open(pdf_path) as doc:
+        lines = PdfProcessor.detect_horizontal_lines_batch(list(doc), min_line_length=200)
+
+    crops = []
+    for page_num, page_lines in enumerate(lines):
+        # 2 lines bound 1 student, 3 or more bound 2 (detect_student_boundaries)
+        for student_index in range(min(len(page_lines) - 1, 2)):
+            key = f"{page_num}-{student_index}"
+            crops.append({
+                'page': page_num,
+                'student_index': student_index,
+                'output_path': os.path.join(output_dir, f"{base_name}_{key}.pdf"),
+                'ern': key
+            })
+    return crops
+
+
+def directory_usage(path: str) -> Dict[str, int]:
+    """Files and bytes (apparent size and allocated blocks) under a directory"""
+    usage = {'files': 0, 'bytes': 0, 'disk_bytes': 0}
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            usage['files'] += 1
+            usage['bytes'] += stat.st_size
+            usage['disk_bytes'] += stat.st_blocks * 512
+    return usage
+
+
+def main():
+    """Run both output modes and compare them"""
+    parser = argparse.ArgumentParser(
+        description='Compare one-PDF-per-record output with record bundles'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing PDF files (default: downloads)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=5,
+        help='Only use the first N PDFs (sorted by name, default: 5, 0 = all)'
+    )
+    parser.add_argument(
+        '--render-every',
+        type=int,
+        default=10,
+        help='Compare rendered pixels of every Nth record (default: 10)'
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    pdf_files = sorted(
+        os.path.join(args.downloads, f)
+        for f in os.listdir(args.downloads) if f.lower().endswith('.pdf')
+    )
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    print("=" * 70)
+    print("Record Bundle Output Benchmark")
+    print("=" * 70)
+    print(f"PDFs: {len(pdf_files)}")
+
+    work_dir = tempfile.mkdtemp(prefix='bench_bundle_')
+    files_dir = os.path.join(work_dir, 'files')
+    bundle_dir = os.path.join(work_dir, 'bundle')
+    seconds = {'files': 0.0, 'bundle': 0.0}
+    timers = {'files': StageTimer(), 'bundle': StageTimer()}
+    records = 0
+    mismatches = 0
+    rendered = 0
+
+    def mismatch(message: str):
+        nonlocal mismatches
+        mismatches += 1
+        if mismatches <= 5:
+            print(f"  ✗ {message}")
+
+    try:
+        for pdf_path in pdf_files:
+            file_crops = all_student_crops(pdf_path, files_dir)
+            bundle_crops = [dict(crop_info) for crop_info in file_crops]
+            bundle_path = bundle_path_for(bundle_dir, pdf_path)
+
+            start = time.perf_counter()
+            file_result = PdfProcessor.crop_students_single_pass(pdf_path, file_crops,
+                                                                 timer=timers['files'])
+            seconds['files'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            bundle_result = PdfProcessor.crop_students_single_pass(pdf_path, bundle_crops,
+                                                                   timer=timers['bundle'],
+                                                                   bundle_path=bundle_path)
+            seconds['bundle'] += time.perf_counter() - start
+
+            records += len(file_result['successful'])
+            if len(bundle_result['successful']) != len(file_result['successful']):
+                mismatch(f"{os.path.basename(pdf_path)}: {len(bundle_result['successful'])} "
+                         f"bundled vs {len(file_result['successful'])} single records")
+                continue
+            if not bundle_result['successful']:
+                continue
+
+            bundle = RecordBundle(bundle_path)
+            with fitz.open(bundle_path) as bundle_doc:
+                for number, (file_crop, bundle_crop) in enumerate(zip(file_crops, bundle_crops)):
+                    page = bundle.pages_for(bundle_crop['ern'])
+                    expected_ref = f"{bundle_path}#page={page[0]}" if page else None
+                    if bundle_crop['output_path'] != expected_ref:
+                        mismatch(f"Index of {bundle_path} does not address {bundle_crop['ern']}")
+                        continue
+
+                    with fitz.open(file_crop['output_path']) as single:
+                        bundle_page = bundle_doc[page[0] - 1]
+                        if bundle_page.cropbox != single[0].cropbox:
+                            mismatch(f"Cropbox differs for {file_crop['output_path']}")
+                            continue
+                        if number % args.render_every == 0:
+                            rendered += 1
+                            single_pixels = single[0].get_pixmap(dpi=36).samples
+                            if bundle_page.get_pixmap(dpi=36).samples != single_pixels:
+                                mismatch(f"Rendering differs for {file_crop['output_path']}")
+                            # Standalone extraction of a bundled record
+                            with fitz.open(stream=extract_record(bundle_crop['output_path'])) as extracted:
+                                if extracted[0].get_pixmap(dpi=36).samples != single_pixels:
+                                    mismatch(f"Extracted record differs for {bundle_crop['ern']}")
+
+        usage = {'files': directory_usage(files_dir), 'bundle': directory_usage(bundle_dir)}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"Records: {records}, rendered and compared: {rendered}")
+    print()
+    write = {mode: timers[mode].seconds.get('crop_save', 0.0) for mode in timers}
+    print(f"{'Mode':<8} {'Files':>7} {'MB':>8} {'Disk MB':>8} {'Write s':>8} {'Total s':>8} {'Records/s':>10}")
+    print("-" * 70)
+    for mode in ('files', 'bundle'):
+        rate = records / seconds[mode] if seconds[mode] > 0 else 0.0
+        print(f"{mode:<8} {usage[mode]['files']:>7} {usage[mode]['bytes'] / 1e6:>8.2f} "
+              f"{usage[mode]['disk_bytes'] / 1e6:>8.2f} {write[mode]:>8.2f} "
+              f"{seconds[mode]:>8.2f} {rate:>10.1f}")
+    print("-" * 70)
+    if usage['bundle']['bytes'] and write['bundle'] > 0:
+        print(f"Bundle: {usage['files']['bytes'] / usage['bundle']['bytes']:.1f}x less data, "
+              f"{usage['files']['files'] / max(usage['bundle']['files'], 1):.0f}x fewer files, "
+              f"{write['files'] / write['bundle']:.1f}x faster writes")
+    print("=" * 70)
+
+    if mismatches:
+        print(f"✗ {mismatches} difference(s) between bundled and single-file records")
+        sys.exit(1)
+
+    print("✓ Bundled records identical to the single-file records")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+"""
+=============================================================================
+Separator Line Detection Benchmark
+=============================================================================
+
+Measures PdfProcessor.detect_horizontal_lines() on every page of the PDFs
+in downloads/, against the previous implementation (page.get_drawings(),
+kept below as the reference), with and without a SeparatorLayoutCache
+(one per PDF), page by page and with detect_horizontal_lines_batch() (one
+call per PDF, as in PdfProcessor.crop_students_single_pass()).
+
+Checks:
+1. Golden output: the detected separator y-coordinates are exactly equal
+   to the reference on every page, with and without the layout cache,
+   page by page and batched
+2. Speed: detections (pages) per second and milliseconds per page
+3. Layout cache counters: pages matching a learned template, pages fully
+   detected, template mismatches and learned/rejected layouts
+
+Exits with status 1 if any page differs from the reference, if the batch
+uses the layout cache differently from page-by-page detection (other
+counters), or if batch + layout cache is more than 10% slower than the
+batch without it.
+
+Usage:
+    python bench_separator_detection.py [--downloads DIR] [--limit N] [--repeat N]
+
+Examples:
+    python bench_separator_detection.py
+    python bench_separator_detection.py --limit 10 --repeat 5
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Callable, Dict, List
+
+import fitz  # PyMuPDF
+
+from layout_cache import SeparatorLayoutCache
+from pdf_processor import PdfProcessor
+
+
+# =============================================================================
+# Reference detection (get_drawings), used for the golden-output check
+# =============================================================================
+
+def reference_detect_horizontal_lines(page, min_line_length: float = 100) -> List[float]:
+    """Previous PdfProcessor.detect_horizontal_lines() (without logging)"""
+    horizontal_lines = []
+
+    for path in page.get_drawings():
+        for item in path.get("items", []):
+            if item[0] == "l":
+                p1 = item[1]
+                p2 = item[2]
+                if abs(p1.y - p2.y) < 3 and abs(p2.x - p1.x) >= min_line_length:
+                    horizontal_lines.append((p1.y + p2.y) / 2)
+
+            elif item[0] == "re":
+                rect = item[1]
+                if rect.height < 3 and rect.width >= min_line_length:
+                    horizontal_lines.append((rect.y0 + rect.y1) / 2)
+
+    horizontal_lines.sort()
+    return PdfProcessor._deduplicate_lines(horizontal_lines, threshold=5)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def time_per_page(func: Callable, pages: List, min_line_length: float, repeat: int) -> float:
+    """Best-of-repeat seconds per page for running func on every page"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page, min_line_length=min_line_length)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) if pages else 0.0
+
+
+def detect_with_layout_cache(pages: List, min_line_length: float) -> Dict:
+    """
+    Detect separators on every page with a fresh layout cache per PDF.
+
+    Returns:
+        Dictionary with 'lines' (per page) and 'stats' (summed cache counters)
+    """
+    caches = {}
+    lines = []
+    for page in pages:
+        cache = caches.get(id(page.parent))
+        if cache is None:
+            cache = caches[id(page.parent)] = SeparatorLayoutCache()
+        lines.append(PdfProcessor.detect_horizontal_lines(
+            page, min_line_length=min_line_length, layout_cache=cache
+        ))
+
+    stats = {}
+    for cache in caches.values():
+        for name, value in cache.stats.items():
+            stats[name] = stats.get(name, 0) + value
+    return {'lines': lines, 'stats': stats}
+
+
+def detect_batch(docs: List, min_line_length: float, layout_cache: bool) -> Dict:
+    """
+    detect_horizontal_lines_batch() on all pages of each PDF, optionally with
+    a fresh layout cache per PDF.
+
+    Returns:
+        Dictionary with 'lines' (per page) and 'stats' (summed cache counters)
+    """
+    lines = []
+    stats = {}
+    for doc in docs:
+        cache = SeparatorLayoutCache() if layout_cache else None
+        lines.extend(PdfProcessor.detect_horizontal_lines_batch(
+            list(doc), min_line_length=min_line_length, layout_cache=cache
+        ))
+        if cache is not None:
+            for name, value in cache.stats.items():
+                stats[name] = stats.get(name, 0) + value
+    return {'lines': lines, 'stats': stats}
+
+
+def best_time(func: Callable, repeat: int) -> float:
+    """Best-of-repeat seconds of func()"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the golden-output check and the benchmark"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark separator line detection against get_drawings()'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing PDF files (default: downloads)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Only use the first N PDFs (sorted by name)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Timing repetitions, best one is reported (default: 3)'
+    )
+    parser.add_argument(
+        '--min-line-length',
+        type=float,
+        default=200,
+        help='Minimum separator length in points (default: 200, as used for cropping)'
+    )
+
+    args = parser.parse_args()
+
+    # Detection errors are reported as differences below
+    logging.basicConfig(level=logging.CRITICAL)
+
+    pdf_files = sorted(
+        os.path.join(args.downloads, f)
+        for f in os.listdir(args.downloads) if f.lower().endswith('.pdf')
+    )
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    print("=" * 70)
+    print("Separator Line Detection Benchmark")
+    print("=" * 70)
+    print(f"PDFs: {len(pdf_files)}, min line length: {args.min_line_length}")
+
+    docs = [fitz.open(pdf_path) for pdf_path in pdf_files]
+    pages = [page for doc in docs for page in doc]
+
+    cached = detect_with_layout_cache(pages, args.min_line_length)
+    batch_cached = detect_batch(docs, args.min_line_length, layout_cache=True)
+
+    mismatches = 0
+    lines_found = 0
+    for page, cached_lines, batch_lines in zip(pages, cached['lines'], batch_cached['lines']):
+        expected = reference_detect_horizontal_lines(page, min_line_length=args.min_line_length)
+        actual = PdfProcessor.detect_horizontal_lines(page, min_line_length=args.min_line_length)
+        lines_found += len(actual)
+        for label, lines in (('get_cdrawings', actual), ('layout cache', cached_lines),
+                             ('batch + layout cache', batch_lines)):
+            if lines != expected:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  ✗ Lines differ ({label}) on page {page.number + 1} of "
+                          f"{os.path.basename(page.parent.name)}")
+                    print(f"    expected: {expected}")
+                    print(f"    actual:   {lines}")
+
+    print(f"Pages: {len(pages)}, separator lines: {lines_found}")
+    print(f"Layout cache: {cached['stats']}")
+    print(f"Batch + layout cache: {batch_cached['stats']}")
+    print()
+
+    before = time_per_page(reference_detect_horizontal_lines, pages,
+                           args.min_line_length, args.repeat)
+    after = time_per_page(PdfProcessor.detect_horizontal_lines, pages,
+                          args.min_line_length, args.repeat)
+    per_page = 1 / len(pages) if pages else 0.0
+    with_cache = best_time(lambda: detect_with_layout_cache(pages, args.min_line_length),
+                           args.repeat) * per_page
+    batch = best_time(lambda: detect_batch(docs, args.min_line_length, layout_cache=False),
+                      args.repeat) * per_page
+    batch_with_cache = best_time(lambda: detect_batch(docs, args.min_line_length, layout_cache=True),
+                                 args.repeat) * per_page
+
+    print(f"{'Implementation':<28} {'Pages/s':>10} {'ms/page':>10} {'Speedup':>8}")
+    print("-" * 70)
+    for name, seconds in (('get_drawings (before)', before), ('get_cdrawings', after),
+                          ('get_cdrawings + layout cache', with_cache), ('batch', batch),
+                          ('batch + layout cache', batch_with_cache)):
+        rate = 1 / seconds if seconds > 0 else 0.0
+        speedup = before / seconds if seconds > 0 else 0.0
+        print(f"{name:<28} {rate:>10.1f} {seconds * 1000:>10.3f} {speedup:>7.2f}x")
+    print("=" * 70)
+
+    for doc in docs:
+        doc.close()
+
+    failures = []
+    if mismatches:
+        failures.append(f"{mismatches} detection(s) differ from the reference")
+    if batch_cached['stats'] != cached['stats']:
+        failures.append("batch uses the layout cache differently from page-by-page detection")
+    if batch_with_cache > batch * 1.1:
+        failures.append(f"batch + layout cache is slower than the batch alone "
+                        f"({batch_with_cache * 1000:.3f} vs {batch * 1000:.3f} ms/page)")
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+
+    print("✓ Separator y-coordinates identical to the reference on every page "
+          "(with and without the layout cache, page by page and batched)")
+
+
+if __name__ == '__main__':
+    main()
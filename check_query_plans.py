@@ -0,0 +1,203 @@
+"""
+=============================================================================
+Query Plan Check for the Grade Database
+=============================================================================
+
+Runs every export/query function against a database, captures the SQL it
+issues, and checks SQLite's EXPLAIN QUERY PLAN for each statement:
+1. One of the indexes a function may use appears in its plan (the planner
+   picks between them based on the data)
+2. student_exam_records is never scanned without an index (except by
+   export_students_json(), which exports every record by design; its joins
+   must still use indexes)
+
+By default a synthetic database is built in a temporary directory (see
+bench_exam_statistics.py) and ANALYZEd; --db checks an existing database
+instead (migrated first, so the indexes exist).
+
+Exits with status 1 if any plan misses its index or scans the records table.
+
+Usage:
+    python check_query_plans.py [--db PATH] [--records N] [--verbose]
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event, text
+
+from bench_exam_statistics import build_database
+from db_writer import BulkRecordWriter
+from exam_statistics import ExamStatistics, data_fingerprint
+from export_utils import (export_students_json, get_exam_statistics, get_failed_students,
+                          get_failed_students_page, get_student_by_ern)
+from init_db import init_database
+from models import StudentExamRecord
+
+RECORDS_TABLE = 'student_exam_records'
+
+
+def sample_values(session) -> dict:
+    """Values of one existing record to query with"""
+    record = session.query(StudentExamRecord).first()
+    if record is None:
+        raise SystemExit("Database has no student exam records")
+    return {
+        'ern': record.student_ern,
+        'record_id': record.id,
+        'exam_id': record.exam_id,
+        'seat_no': record.seat_no,
+        'college_code': record.college_code,
+        'source_pdf': record.source_pdf or 'missing.pdf',
+    }
+
+
+def checks(session, values: dict, tmp_dir: str) -> List[Tuple[str, Callable, List[str], bool]]:
+    """
+    Functions to check.
+
+    Returns:
+        List of (name, function, index names its plans may use, full scan allowed)
+    """
+    def purge_lookup():
+        # The record lookup of IngestManifest.purge() (which also deletes files)
+        session.query(
+            StudentExamRecord.id, StudentExamRecord.pdf_file
+        ).filter(StudentExamRecord.source_pdf == values['source_pdf']).all()
+
+    return [
+        ('get_student_by_ern', lambda: get_student_by_ern(session, values['ern']),
+         ['sqlite_autoindex_student_exam_records_1'], False),
+        ('get_failed_students', lambda: get_failed_students(session),
+         ['ix_records_result', 'ix_records_exam_result'], False),
+        ('get_failed_students_page', lambda: get_failed_students_page(
+            session, limit=100, after_id=values['record_id']),
+         ['ix_records_result'], False),
+        # max(id) is read from the end of the rowid B-tree (no index name)
+        ('data_fingerprint', lambda: data_fingerprint(session),
+         [f'SEARCH {RECORDS_TABLE}'], False),
+        ('get_exam_statistics', lambda: get_exam_statistics(session),
+         ['ix_records_exam_result'], False),
+        ('ExamStatistics: program', lambda: ExamStatistics(session).aggregate('program'),
+         ['ix_records_exam_result'], False),
+        ('ExamStatistics: semester', lambda: ExamStatistics(session).aggregate('semester'),
+         ['ix_records_exam_result'], False),
+        ('ExamStatistics: college', lambda: ExamStatistics(session).aggregate('college'),
+         ['ix_records_exam_result'], False),
+        ('ExamStatistics: college filter',
+         lambda: ExamStatistics(session).aggregate('college', college_code=values['college_code']),
+         ['ix_records_college'], False),
+        ('lookup by seat_no', lambda: session.query(StudentExamRecord).filter(
+            StudentExamRecord.seat_no == values['seat_no']).all(),
+         ['ix_records_seat_no'], False),
+        ('lookup by college_code', lambda: session.query(StudentExamRecord).filter(
+            StudentExamRecord.college_code == values['college_code']).all(),
+         ['ix_records_college'], False),
+        ('BulkRecordWriter.preload_exam', lambda: BulkRecordWriter(session).preload_exam(
+            values['exam_id']),
+         ['ix_records_exam_result', 'sqlite_autoindex_student_exam_records_1'], False),
+        ('IngestManifest.purge (lookup)', purge_lookup, ['ix_records_source_pdf'], False),
+        ('export_students_json', lambda: export_students_json(
+            session, os.path.join(tmp_dir, 'students.json')),
+         ['sqlite_autoindex_students_1'], True),
+    ]
+
+
+def query_plans(session, func: Callable) -> List[Tuple[str, List[str]]]:
+    """Run func and return (statement, plan lines) of every SELECT it issued"""
+    statements = []
+    engine = session.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        func()
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+
+    connection = session.connection()
+    plans = []
+    for statement, parameters in statements:
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+        plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+def unindexed_scans(plan: List[str]) -> List[str]:
+    """Plan lines scanning the records table without an index"""
+    return [line for line in plan
+            if line.startswith(f'SCAN {RECORDS_TABLE}') and 'INDEX' not in line]
+
+
+def main():
+    """Check that the export/query functions use indexes"""
+    parser = argparse.ArgumentParser(description='Check query plans of the grade database')
+    parser.add_argument('--db', help='Existing database to check (default: synthetic)')
+    parser.add_argument('--records', type=int, default=50_000,
+                        help='Records in the synthetic database (default: 50000)')
+    parser.add_argument('--verbose', action='store_true', help='Print every plan')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_path = args.db
+    if db_path is None:
+        db_path = os.path.join(tmp_dir.name, 'plans.db')
+        build_database(db_path, args.records, exams=200, programs=40, colleges=300)
+
+    print("=" * 70)
+    print("Query Plan Check")
+    print("=" * 70)
+    session = init_database(db_path)
+    session.execute(text('ANALYZE'))
+    print()
+
+    values = sample_values(session)
+    failures = 0
+    for name, func, expected_indexes, full_scan_allowed in checks(session, values, tmp_dir.name):
+        plans = query_plans(session, func)
+        plan_lines = [line for _, plan in plans for line in plan]
+
+        problems = []
+        if not any(index in line for index in expected_indexes for line in plan_lines):
+            problems.append(f"none of {', '.join(expected_indexes)} used")
+        if not full_scan_allowed:
+            problems += [f"unindexed: {line}" for line in unindexed_scans(plan_lines)]
+
+        status = "OK" if not problems else "FAIL"
+        failures += bool(problems)
+        used = [index for index in expected_indexes
+                if any(index in line for line in plan_lines)]
+        print(f"{status:4}  {name:<34} {', '.join(used or expected_indexes)}")
+        for problem in problems:
+            print(f"        ✗ {problem}")
+        if args.verbose or problems:
+            for statement, plan in plans:
+                print(f"        {' '.join(statement.split())[:90]}...")
+                for line in plan:
+                    print(f"          {line}")
+
+    session.rollback()
+    session.close()
+    tmp_dir.cleanup()
+
+    print("=" * 70)
+    if failures:
+        print(f"✗ {failures} function(s) without an expected index")
+        sys.exit(1)
+
+    print("✓ All export/query functions use their indexes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""
+=============================================================================
+Scrape-and-Process Pipeline Check
+=============================================================================
+
+Runs the run_batch.py --scrape pipeline against the local stand-in of the
+results site (download_standin.py), all in temporary directories:
+
+1. Streaming run: the stand-in serves downloads/ on a free local port; the
+   scraper downloads from it with download_to_queue() while
+   BatchGradeProcessor.process_stream() ingests each PDF as it lands
+2. Golden output: a plain process_all_pdfs() run over the downloaded files
+   (into a second database) must produce exactly the same rows
+3. Rerun: scraping and streaming again into the first database must
+   revalidate every PDF as unchanged (304) and skip all of them
+
+Exits with status 1 if any check fails.
+
+Usage:
+    python check_scrape_pipeline.py [--limit N] [--workers N] [--text-backend NAME]
+
+Examples:
+    python check_scrape_pipeline.py
+    python check_scrape_pipeline.py --limit 5 --workers 4 --text-backend pymupdf
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import queue
+import logging
+import argparse
+import tempfile
+import threading
+from typing import Dict, List, Tuple
+
+from batch_processor import BatchGradeProcessor, OUTPUT_MODES
+from download_standin import make_server
+from init_db import init_database
+from models import Examination, Student, StudentExamRecord
+from scaper import MumbaiUniversityResultScraper
+from text_backends import TEXT_BACKENDS, DEFAULT_TEXT_BACKEND
+
+
+def quiet_console(logger_name: str):
+    """Keep only errors on the console of a logger (its log file is unchanged)"""
+    for handler in logging.getLogger(logger_name).handlers:
+        if not isinstance(handler, logging.FileHandler):
+            handler.setLevel(logging.ERROR)
+
+
+def make_processor(args, downloads_dir: str, output_dir: str, db_path: str) -> BatchGradeProcessor:
+    """Batch processor over downloads_dir (metadata is saved next to the PDFs)"""
+    processor = BatchGradeProcessor(
+        downloads_dir=downloads_dir,
+        metadata_dir=downloads_dir,
+        output_dir=output_dir,
+        db_session=init_database(db_path),
+        workers=args.workers,
+        text_backend=args.text_backend,
+        output_mode=args.output_mode
+    )
+    quiet_console('BatchProcessor')
+    return processor
+
+
+def scrape_and_stream(args, results_url: str, downloads_dir: str,
+                      processor: BatchGradeProcessor) -> Tuple[Dict, Dict]:
+    """
+    Download through the stand-in while the processor ingests from the queue.
+
+    Returns:
+        (download statistics, processing statistics)
+    """
+    scraper = MumbaiUniversityResultScraper(output_dir=downloads_dir, results_url=results_url)
+    quiet_console('Scraper')
+
+    pdf_queue = queue.Queue(maxsize=4)
+    result = {}
+
+    def run():
+        try:
+            result['stats'] = scraper.download_to_queue(
+                pdf_queue, limit=args.limit, workers=args.download_workers
+            )
+        except Exception as e:
+            result['error'] = e
+
+    downloads = threading.Thread(target=run, name='downloads', daemon=True)
+    downloads.start()
+    stats = dict(processor.process_stream(pdf_queue))
+    downloads.join()
+
+    if 'error' in result:
+        raise SystemExit(f"Downloading failed: {result['error']}")
+    return result['stats'], stats
+
+
+def database_rows(db_path: str) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Records and students of a database, independent of insertion order.
+
+    Examinations are identified by their source PDF rather than their id,
+    which depends on the order PDFs were ingested in; cropped file paths by
+    their name relative to the output directory.
+    """
+    session = init_database(db_path)
+    record = StudentExamRecord
+    records = sorted(
+        (row.student_ern, row.pdf_filename, row.seat_no, row.college_code, row.college_name,
+         row.status, row.result, row.page_number, row.student_index, row.crop_y_top,
+         row.crop_y_bottom, row.source_pdf,
+         os.path.basename(row.pdf_file) if row.pdf_file else None)
+        for row in session.query(
+            record.student_ern, Examination.pdf_filename, record.seat_no, record.college_code,
+            record.college_name, record.status, record.result, record.page_number,
+            record.student_index, record.crop_y_top, record.crop_y_bottom, record.source_pdf,
+            record.pdf_file
+        ).join(Examination, record.exam_id == Examination.id)
+    )
+    students = sorted(session.query(Student.ern, Student.full_name, Student.gender).all())
+    session.close()
+    return records, [tuple(row) for row in students]
+
+
+def main():
+    """Check the streaming scrape pipeline against a plain batch run"""
+    parser = argparse.ArgumentParser(description='Check run_batch.py --scrape against the local stand-in')
+    parser.add_argument('--downloads', default='downloads', help='PDFs the stand-in serves (default: downloads)')
+    parser.add_argument('--metadata', default='metadata', help='Metadata for the results page (default: metadata)')
+    parser.add_argument('--limit', type=int, default=3, help='PDFs to download (default: 3)')
+    parser.add_argument('--workers', type=int, default=1, help='Processing workers (default: 1)')
+    parser.add_argument('--download-workers', type=int, default=4, help='Concurrent downloads (default: 4)')
+    parser.add_argument('--text-backend', choices=list(TEXT_BACKENDS), default=DEFAULT_TEXT_BACKEND,
+                        help=f'Text extraction backend (default: {DEFAULT_TEXT_BACKEND})')
+    parser.add_argument('--output-mode', choices=OUTPUT_MODES, default='lazy',
+                        help='Output mode of both runs (default: lazy, no files written)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Scrape-and-Process Pipeline Check")
+    print("=" * 70)
+
+    server = make_server('127.0.0.1', 0, args.downloads, args.metadata, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    results_url = f'http://127.0.0.1:{server.server_port}/ugnepresults.html'
+    print(f"Stand-in: {results_url} (serving {args.downloads})")
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        downloads_dir = os.path.join(tmp_dir, 'downloads')
+        stream_db = os.path.join(tmp_dir, 'stream.db')
+        batch_db = os.path.join(tmp_dir, 'batch.db')
+
+        # 1. Streaming run
+        download_stats, stream_stats = scrape_and_stream(
+            args, results_url, downloads_dir,
+            make_processor(args, downloads_dir, os.path.join(tmp_dir, 'out_stream'), stream_db)
+        )
+        print(f"Streaming run: {download_stats['downloaded']} downloaded, "
+              f"{stream_stats['pdfs_processed']} processed, "
+              f"{stream_stats['db_records_created']} records")
+        if download_stats['downloaded'] == 0 or download_stats['failed']:
+            failures.append(f"downloads: {download_stats['downloaded']} downloaded, "
+                            f"{download_stats['failed']} failed")
+
+        # 2. Plain batch run over the same files
+        batch_stats = make_processor(
+            args, downloads_dir, os.path.join(tmp_dir, 'out_batch'), batch_db
+        ).process_all_pdfs()
+        print(f"Batch run:     {batch_stats['pdfs_processed']} processed, "
+              f"{batch_stats['db_records_created']} records")
+
+        stream_records, stream_students = database_rows(stream_db)
+        batch_records, batch_students = database_rows(batch_db)
+        if not stream_records:
+            failures.append("streaming run created no records")
+        if stream_records != batch_records:
+            differing = len(set(stream_records) ^ set(batch_records))
+            failures.append(f"records differ from the batch run ({len(stream_records)} vs "
+                            f"{len(batch_records)} rows, {differing} not in both)")
+        if stream_students != batch_students:
+            failures.append(f"students differ from the batch run ({len(stream_students)} vs "
+                            f"{len(batch_students)})")
+
+        # 3. Rerun: everything revalidated and skipped
+        rerun_downloads, rerun_stats = scrape_and_stream(
+            args, results_url, downloads_dir,
+            make_processor(args, downloads_dir, os.path.join(tmp_dir, 'out_stream'), stream_db)
+        )
+        not_modified = server.RequestHandlerClass.counters.get('not_modified', 0)
+        print(f"Rerun:         {rerun_downloads['unchanged']} unchanged ({not_modified} x 304), "
+              f"{rerun_stats['pdfs_skipped']} skipped, {rerun_stats['pdfs_processed']} processed")
+        if rerun_downloads['unchanged'] != download_stats['downloaded']:
+            failures.append(f"rerun revalidated {rerun_downloads['unchanged']} of "
+                            f"{download_stats['downloaded']} PDFs as unchanged")
+        if not_modified < download_stats['downloaded']:
+            failures.append(f"stand-in answered {not_modified} conditional requests with 304, "
+                            f"expected {download_stats['downloaded']}")
+        if rerun_stats['pdfs_skipped'] != download_stats['downloaded'] or rerun_stats['pdfs_processed']:
+            failures.append(f"rerun skipped {rerun_stats['pdfs_skipped']} and processed "
+                            f"{rerun_stats['pdfs_processed']} PDFs")
+        if database_rows(stream_db)[0] != stream_records:
+            failures.append("rerun changed the records")
+
+    server.shutdown()
+    print("=" * 70)
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+
+    print("✓ Streaming scrape run matches the batch run; rerun skips every PDF")
+
+
+if __name__ == '__main__':
+    main()
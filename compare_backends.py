@@ -0,0 +1,164 @@
+"""
+=============================================================================
+Text Backend Parity Check and Benchmark
+=============================================================================
+
+Runs SimpleStudentExtractor with each text backend over the PDFs in
+downloads/ and:
+1. Checks that every backend extracts the same students as the reference
+   backend (ERN, seat number, name, college, result)
+2. Reports text extraction speed in pages per second
+
+Exits with status 1 if any backend disagrees with the reference.
+
+Usage:
+    python compare_backends.py [--downloads DIR] [--limit N] [--backends NAME ...]
+
+Examples:
+    python compare_backends.py
+    python compare_backends.py --limit 5
+    python compare_backends.py --backends pdfplumber pymupdf --reference pdfplumber
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Dict, List, Tuple
+
+from extract_simple import SimpleStudentExtractor
+from text_backends import TEXT_BACKENDS, DEFAULT_TEXT_BACKEND
+
+# Fields that must be identical across backends
+PARITY_FIELDS = ('ern', 'seat_no', 'full_name', 'college_code', 'college_name', 'result')
+
+
+def student_key(student: Dict) -> Tuple:
+    """Comparable tuple of a student's parity fields"""
+    return tuple(student.get(field) for field in PARITY_FIELDS)
+
+
+def run_backend(pdf_path: str, backend: str) -> Tuple[List[Tuple], int, float]:
+    """
+    Extract students from a PDF with one backend.
+
+    Args:
+        pdf_path: Path to PDF file
+        backend: Text backend name
+
+    Returns:
+        Tuple of (student keys, page count, text extraction seconds)
+    """
+    extractor = SimpleStudentExtractor(pdf_path, text_backend=backend)
+
+    start = time.perf_counter()
+    page_texts = extractor.text_backend.extract_page_texts(pdf_path)
+    elapsed = time.perf_counter() - start
+
+    data = extractor.parse_page_texts(page_texts)
+    return [student_key(s) for s in data['students']], len(page_texts), elapsed
+
+
+def main():
+    """Compare text backends over a directory of PDFs"""
+    parser = argparse.ArgumentParser(
+        description='Check text backend parity and compare extraction speed'
+    )
+    parser.add_argument(
+        '--downloads',
+        default='downloads',
+        help='Directory containing PDF files (default: downloads)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Only check the first N PDFs (sorted by name)'
+    )
+    parser.add_argument(
+        '--backends',
+        nargs='+',
+        default=sorted(TEXT_BACKENDS),
+        choices=sorted(TEXT_BACKENDS),
+        help='Backends to run (default: all)'
+    )
+    parser.add_argument(
+        '--reference',
+        default=DEFAULT_TEXT_BACKEND,
+        choices=sorted(TEXT_BACKENDS),
+        help=f'Backend whose output is treated as correct (default: {DEFAULT_TEXT_BACKEND})'
+    )
+
+    args = parser.parse_args()
+
+    # Extractor warnings would drown the report
+    logging.basicConfig(level=logging.ERROR)
+
+    backends = list(dict.fromkeys([args.reference] + args.backends))
+
+    pdf_files = sorted(
+        os.path.join(args.downloads, f)
+        for f in os.listdir(args.downloads) if f.lower().endswith('.pdf')
+    )
+    if args.limit:
+        pdf_files = pdf_files[:args.limit]
+
+    print("=" * 70)
+    print("Text Backend Parity Check")
+    print("=" * 70)
+    print(f"PDFs: {len(pdf_files)}, backends: {', '.join(backends)}, reference: {args.reference}")
+    print()
+
+    totals = {name: {'pages': 0, 'seconds': 0.0, 'students': 0} for name in backends}
+    mismatches = 0
+
+    for idx, pdf_path in enumerate(pdf_files, 1):
+        results = {}
+        for name in backends:
+            students, pages, elapsed = run_backend(pdf_path, name)
+            results[name] = students
+            totals[name]['pages'] += pages
+            totals[name]['seconds'] += elapsed
+            totals[name]['students'] += len(students)
+
+        reference = results[args.reference]
+        status = "OK"
+        for name in backends:
+            if results[name] != reference:
+                status = "MISMATCH"
+                mismatches += 1
+                missing = set(reference) - set(results[name])
+                extra = set(results[name]) - set(reference)
+                print(f"  {name}: {len(missing)} missing, {len(extra)} unexpected student(s)")
+                for key in sorted(missing, key=str)[:3]:
+                    print(f"    - {key}")
+                for key in sorted(extra, key=str)[:3]:
+                    print(f"    + {key}")
+
+        print(f"[{idx}/{len(pdf_files)}] {status:8} {len(reference):5} students  "
+              f"{os.path.basename(pdf_path)}")
+
+    print()
+    print("=" * 70)
+    print(f"{'Backend':<12} {'Pages':>8} {'Students':>9} {'Seconds':>9} {'Pages/s':>9}")
+    print("-" * 70)
+    for name in backends:
+        t = totals[name]
+        pages_per_second = t['pages'] / t['seconds'] if t['seconds'] > 0 else 0.0
+        print(f"{name:<12} {t['pages']:>8} {t['students']:>9} {t['seconds']:>9.2f} {pages_per_second:>9.1f}")
+    print("=" * 70)
+
+    if mismatches:
+        print(f"✗ {mismatches} backend/PDF mismatch(es)")
+        sys.exit(1)
+
+    print("✓ All backends match the reference")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+=============================================================================
+Bulk Database Writer for Mumbai University Grade Records
+=============================================================================
+
+Batched persistence of Student and StudentExamRecord rows.
+
+Instead of one query and one commit per student, the writer:
+1. Preloads the ERNs already recorded for an examination in one query
+2. Collects new Student and StudentExamRecord rows in memory
+3. Flushes them in chunks with INSERT ... ON CONFLICT DO NOTHING, so rows
+   that collide with the students primary key or the unique_student_exam
+   constraint are ignored by SQLite instead of raising IntegrityError
+
+Usage:
+    writer = BulkRecordWriter(session, chunk_size=1000)
+    writer.preload_exam(exam.id)
+    for student_data in students:
+        if not writer.add(student_data, exam.id, pdf_file):
+            print("duplicate")
+    writer.flush()
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import Student, StudentExamRecord
+
+
+class BulkRecordWriter:
+    """Collects student exam records and writes them to the database in chunks"""
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def __init__(self, db_session: Session, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize bulk writer.
+
+        Args:
+            db_session: SQLAlchemy database session
+            chunk_size: Number of records collected before they are flushed
+        """
+        self.db_session = db_session
+        self.chunk_size = max(1, chunk_size)
+
+        # ERNs already recorded (or queued) per examination
+        self._exam_erns: Dict[int, Set[str]] = {}
+
+        self._pending_students: Dict[str, Dict] = {}
+        self._pending_records: List[Dict] = []
+
+        # Running totals across all flushes
+        self.records_written = 0
+        self.records_ignored = 0
+        self.records_failed = 0
+        self.students_written = 0
+
+    def preload_exam(self, exam_id: int) -> int:
+        """
+        Load the ERNs that already have a record for an examination.
+
+        Args:
+            exam_id: Examination ID
+
+        Returns:
+            Number of known ERNs for the examination
+        """
+        if exam_id not in self._exam_erns:
+            rows = self.db_session.query(StudentExamRecord.student_ern).filter(
+                StudentExamRecord.exam_id == exam_id
+            ).all()
+            self._exam_erns[exam_id] = {row[0] for row in rows}
+
+        return len(self._exam_erns[exam_id])
+
+    def clear_cache(self):
+        """Forget preloaded ERNs (call after records were deleted elsewhere)"""
+        self._exam_erns = {}
+
+    def is_duplicate(self, ern: str, exam_id: int) -> bool:
+        """Check whether a record for (ern, exam_id) exists or is already queued"""
+        self.preload_exam(exam_id)
+        return ern in self._exam_erns[exam_id]
+
+    def add(self, student_data: Dict, exam_id: int, pdf_file: str,
+            source_pdf: Optional[str] = None,
+            crop_info: Optional[Dict] = None) -> bool:
+        """
+        Queue a student and their exam record for insertion.
+
+        Args:
+            student_data: Student dictionary from SimpleStudentExtractor
+            exam_id: Examination ID
+            pdf_file: Path to the cropped student PDF
+            source_pdf: Filename of the source PDF the record came from
+            crop_info: Crop request after cropping ('student_index', 'y_top',
+                       'y_bottom'), stored as the record's crop geometry
+
+        Returns:
+            True if queued, False if the record is a duplicate for this exam
+        """
+        ern = student_data['ern']
+
+        if self.is_duplicate(ern, exam_id):
+            return False
+
+        self._exam_erns[exam_id].add(ern)
+        crop_info = crop_info or {}
+
+        if ern not in self._pending_students:
+            self._pending_students[ern] = {
+                'ern': ern,
+                'full_name': student_data.get('full_name', ''),
+                'gender': student_data.get('gender')
+            }
+
+        self._pending_records.append({
+            'student_ern': ern,
+            'exam_id': exam_id,
+            'seat_no': student_data['seat_no'],
+            'college_code': student_data.get('college_code'),
+            'college_name': student_data.get('college_name'),
+            'status': student_data.get('status'),
+            'result': student_data.get('result'),
+            'page_number': student_data['page_number'],
+            'student_index': crop_info.get('student_index'),
+            'crop_y_top': crop_info.get('y_top'),
+            'crop_y_bottom': crop_info.get('y_bottom'),
+            'pdf_file': pdf_file,
+            'source_pdf': source_pdf
+        })
+
+        if len(self._pending_records) >= self.chunk_size:
+            self.flush()
+
+        return True
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued records not yet written"""
+        return len(self._pending_records)
+
+    def flush(self) -> int:
+        """
+        Write all queued rows in chunks and commit.
+
+        Students that already exist and records violating unique_student_exam
+        are skipped by the database (INSERT ... ON CONFLICT DO NOTHING).
+
+        Returns:
+            Number of exam records inserted
+        """
+        if not self._pending_records and not self._pending_students:
+            return 0
+
+        students = list(self._pending_students.values())
+        records = self._pending_records
+        self._pending_students = {}
+        self._pending_records = []
+
+        inserted = 0
+        students_inserted = 0
+        try:
+            for start in range(0, len(students), self.chunk_size):
+                result = self.db_session.execute(
+                    sqlite_insert(Student.__table__).on_conflict_do_nothing(index_elements=['ern']),
+                    students[start:start + self.chunk_size]
+                )
+                students_inserted += max(result.rowcount, 0)
+
+            for start in range(0, len(records), self.chunk_size):
+                result = self.db_session.execute(
+                    sqlite_insert(StudentExamRecord.__table__).on_conflict_do_nothing(
+                        index_elements=['student_ern', 'exam_id']
+                    ),
+                    records[start:start + self.chunk_size]
+                )
+                inserted += max(result.rowcount, 0)
+
+            self.db_session.commit()
+        except Exception:
+            self.db_session.rollback()
+            self.records_failed += len(records)
+            # Forget queued ERNs so a retry is not reported as duplicate
+            for record in records:
+                self._exam_erns.get(record['exam_id'], set()).discard(record['student_ern'])
+            raise
+
+        self.students_written += students_inserted
+        self.records_written += inserted
+        self.records_ignored += len(records) - inserted
+        return inserted
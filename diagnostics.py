@@ -0,0 +1,128 @@
+"""
+=============================================================================
+Diagnostics for Mumbai University Grade Records
+=============================================================================
+
+Level-based diagnostics for the per-page hot path (line detection, boundary
+detection, cropping, block parsing) that cost nothing when disabled.
+
+Hot-path code asks for a logger once per page (page_logger() for PyMuPDF
+pages, pdf_page_logger() for a path and page number) and only formats
+messages when it gets one back:
+
+    log = page_logger(page)
+    if log:
+        log.debug("Found %d drawing paths", len(paths))
+
+Both return:
+- TRACE_LOGGER for the PDF/page selected with set_trace() (or debug=True;
+  a direct debug=True call with no logging configured prints to stderr)
+- the module's own logger when it is enabled for DEBUG
+- None otherwise (batch default: no formatting, no I/O)
+
+Tracing a single page:
+    set_trace('register.pdf', page_num=4)   # 0-indexed page
+    python run_batch.py --trace-pdf register.pdf --trace-page 5   # 1-indexed
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import logging
+from typing import Optional
+
+# Receives full diagnostics for the traced PDF/page, whatever the log level
+TRACE_LOGGER = logging.getLogger('trace')
+TRACE_LOGGER.setLevel(logging.DEBUG)
+
+_trace_pdf: Optional[str] = None
+_trace_page: Optional[int] = None
+_tracing = False
+
+
+def set_trace(pdf_name: Optional[str] = None, page_num: Optional[int] = None):
+    """
+    Select the PDF and/or page that gets full diagnostics.
+
+    Args:
+        pdf_name: PDF file name or path (None = every PDF)
+        page_num: Page number, 0-indexed (None = every page)
+    """
+    global _trace_pdf, _trace_page, _tracing
+    _trace_pdf = os.path.basename(pdf_name) if pdf_name else None
+    _trace_page = page_num
+    _tracing = pdf_name is not None or page_num is not None
+
+
+def clear_trace():
+    """Turn tracing off"""
+    set_trace(None, None)
+
+
+def is_tracing() -> bool:
+    """Check whether any PDF/page is selected for tracing"""
+    return _tracing
+
+
+def is_traced_pdf(pdf_path: str) -> bool:
+    """Check whether pages of this PDF can be traced"""
+    return _tracing and (_trace_pdf is None or os.path.basename(pdf_path) == _trace_pdf)
+
+
+def is_traced(pdf_path: str, page_num: int) -> bool:
+    """
+    Check whether a page is selected for tracing.
+
+    Args:
+        pdf_path: PDF file path
+        page_num: Page number (0-indexed)
+
+    Returns:
+        True if the page gets full diagnostics
+    """
+    return (_tracing and (_trace_page is None or page_num == _trace_page) and
+            is_traced_pdf(pdf_path))
+
+
+def _debug_logger() -> logging.Logger:
+    """TRACE_LOGGER for an explicit debug=True, given a stderr handler if none is set up"""
+    if not TRACE_LOGGER.hasHandlers():
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        TRACE_LOGGER.addHandler(handler)
+    return TRACE_LOGGER
+
+
+def pdf_page_logger(pdf_path: str, page_num: int, debug: Optional[bool] = None,
+                    logger: Optional[logging.Logger] = None) -> Optional[logging.Logger]:
+    """
+    Get the logger for diagnostics about one page of a PDF.
+
+    Args:
+        pdf_path: PDF file path
+        page_num: Page number (0-indexed)
+        debug: True forces diagnostics, False disables them,
+               None follows the trace selection and the logger level
+        logger: Module logger used when it is enabled for DEBUG
+
+    Returns:
+        Logger to write diagnostics to, or None when disabled
+    """
+    if debug is False:
+        return None
+    if debug:
+        return _debug_logger()
+    if _tracing and is_traced(pdf_path, page_num):
+        return TRACE_LOGGER
+    if logger is not None and logger.isEnabledFor(logging.DEBUG):
+        return logger
+    return None
+
+
+def page_logger(page, debug: Optional[bool] = None,
+                logger: Optional[logging.Logger] = None) -> Optional[logging.Logger]:
+    """Same as pdf_page_logger() for a PyMuPDF page object"""
+    return pdf_page_logger(page.parent.name, page.number, debug, logger)
@@ -0,0 +1,374 @@
+"""
+=============================================================================
+Local Stand-in for the Mumbai University Results Site
+=============================================================================
+
+Serves the PDFs in downloads/ over HTTP, with a results page in the same
+table format as https://www.mumresults.in/ugnepresults.html, so the
+scraper and its concurrent downloader can be exercised offline.
+
+Serves:
+- /ugnepresults.html   Results table ("counterone") linking every PDF.
+                       Rows use metadata/*.json where available
+- /<file>.pdf          The PDF, with Range support (206 / 416), ETag and
+                       Last-Modified, conditional GET (304), If-Range and HEAD.
+                       Files are read per request, so replacing one in the
+                       served directory "re-publishes" it
+
+Fault injection (to check retries and resume):
+- --latency S          Delay before every response
+- --rate KB            Throttle each response to KB kilobytes per second
+- --fail-rate P        Answer a fraction P of PDF requests with 503
+- --truncate-rate P    Drop the connection halfway through a fraction P
+                       of PDF responses
+- --no-validators      Send no ETag/Last-Modified (like a plain file server)
+
+Usage:
+    python download_standin.py [--port 8765] [--downloads DIR] [--metadata DIR]
+
+Examples:
+    python download_standin.py --rate 2000 --latency 0.2
+    python download_standin.py --fail-rate 0.2 --truncate-rate 0.3
+
+    python scaper.py --results-url http://127.0.0.1:8765/ugnepresults.html \\
+        --output-dir /tmp/standin_downloads --workers 8
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import re
+import json
+import time
+import random
+import argparse
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+RESULTS_PATH = '/ugnepresults.html'
+RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+WRITE_CHUNK_SIZE = 16 * 1024
+
+
+def build_results_page(downloads_dir: str, metadata_dir: str) -> str:
+    """
+    Build a results page linking every PDF in downloads_dir.
+
+    Args:
+        downloads_dir: Directory with the PDFs to serve
+        metadata_dir: Directory with scraper metadata JSON (optional per PDF)
+
+    Returns:
+        HTML of the results page
+    """
+    rows = []
+    pdf_names = sorted(f for f in os.listdir(downloads_dir) if f.lower().endswith('.pdf'))
+
+    for idx, pdf_name in enumerate(pdf_names, 1):
+        metadata = {}
+        json_path = os.path.join(metadata_dir, pdf_name[:-4] + '.json')
+        if os.path.exists(json_path):
+            with open(json_path, encoding='utf-8') as f:
+                metadata = json.load(f)
+
+        code_match = re.match(r'\d+', pdf_name)
+        program_code = metadata.get('program_code') or (code_match.group(0)[:7] if code_match else '0000000')
+        exam_name = metadata.get('exam_full_name') or pdf_name[:-4]
+        try:
+            result_date = date.fromisoformat(metadata.get('result_date', '')).strftime('%d/%m/%Y')
+        except ValueError:
+            result_date = date.today().strftime('%d/%m/%Y')
+
+        # Raw file name in the href, as on the real site
+        rows.append(
+            f'<tr><td>{idx}</td><td>{escape(program_code)}</td>'
+            f'<td><a href="{escape(pdf_name)}">{escape(exam_name)}</a></td>'
+            f'<td>{result_date}</td></tr>'
+        )
+
+    return (
+        '<html><body><table class="counterone"><tbody>\n'
+        '<tr><th>Sr</th><th>Program Code</th><th>Name of Examination</th><th>Result Date</th></tr>\n'
+        + '\n'.join(rows) +
+        '\n</tbody></table></body></html>\n'
+    )
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=START-END" range.
+
+    Args:
+        header: Range header value (None if absent)
+        size: File size
+
+    Returns:
+        (start, end) inclusive, None for the whole file
+
+    Raises:
+        ValueError: Range cannot be satisfied
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+
+    start, end = match.groups()
+    if start == '':
+        # Suffix range: last N bytes
+        length = int(end)
+        start, end = max(0, size - length), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+
+    if start >= size or start > end:
+        raise ValueError(f"range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Serves the results page and PDFs with Range support and fault injection"""
+
+    # Set by make_server()
+    downloads_dir = 'downloads'
+    results_page = b''
+    latency = 0.0
+    rate_kb = 0.0
+    fail_rate = 0.0
+    truncate_rate = 0.0
+    validators = True
+    quiet = False
+
+    # Counters of the server lifetime: requests, ranges, failed, truncated
+    counters: Dict[str, int] = {}
+
+    def log_message(self, format, *args):
+        """Log requests unless quiet"""
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _count(self, name: str):
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def do_HEAD(self):
+        """Handle HEAD for PDFs (headers of the GET response, no body)"""
+        self.do_GET(head_only=True)
+
+    def do_GET(self, head_only: bool = False):
+        """Handle GET for the results page and PDFs"""
+        if self.latency:
+            time.sleep(self.latency)
+        self._count('requests')
+
+        path = unquote(urlsplit(self.path).path)
+        if path == RESULTS_PATH:
+            self._send_bytes(self.results_page, 'text/html; charset=utf-8')
+            return
+
+        pdf_path = os.path.join(self.downloads_dir, os.path.basename(path))
+        if not pdf_path.lower().endswith('.pdf') or not os.path.isfile(pdf_path):
+            self.send_error(404)
+            return
+
+        if self.fail_rate and random.random() < self.fail_rate:
+            self._count('failed')
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self._send_file(pdf_path, head_only)
+
+    def _send_bytes(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _file_validators(self, pdf_path: str) -> Tuple[int, Optional[str], Optional[str]]:
+        """Size, ETag and Last-Modified of a file (validators None if disabled)"""
+        stat = os.stat(pdf_path)
+        if not self.validators:
+            return stat.st_size, None, None
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        return stat.st_size, etag, formatdate(stat.st_mtime, usegmt=True)
+
+    def _not_modified(self, pdf_path: str, etag: Optional[str]) -> bool:
+        """Evaluate If-None-Match / If-Modified-Since"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag is not None and (
+                if_none_match.strip() == '*' or
+                etag in [tag.strip() for tag in if_none_match.split(',')]
+            )
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and self.validators:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(os.path.getmtime(pdf_path)) <= since
+        return False
+
+    def _send_file(self, pdf_path: str, head_only: bool = False):
+        size, etag, last_modified = self._file_validators(pdf_path)
+
+        if self._not_modified(pdf_path, etag):
+            self._count('not_modified')
+            self.send_response(304)
+            if etag:
+                self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        # If-Range: only honour Range if the client's copy is still current
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and if_range and if_range not in (etag, last_modified):
+            range_header = None
+
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start, end = byte_range if byte_range else (0, size - 1)
+        length = end - start + 1
+
+        if byte_range:
+            self._count('ranges')
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(length))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        if head_only:
+            return
+
+        # Drop the connection halfway through to simulate a network failure
+        send_limit = length
+        if self.truncate_rate and random.random() < self.truncate_rate:
+            self._count('truncated')
+            send_limit = length // 2
+            self.close_connection = True
+
+        with open(pdf_path, 'rb') as f:
+            f.seek(start)
+            sent = 0
+            chunk_delay = WRITE_CHUNK_SIZE / (self.rate_kb * 1024) if self.rate_kb else 0
+            try:
+                while sent < send_limit:
+                    chunk = f.read(min(WRITE_CHUNK_SIZE, send_limit - sent))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    if chunk_delay:
+                        time.sleep(chunk_delay)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+
+def make_server(host: str, port: int, downloads_dir: str, metadata_dir: str,
+                latency: float = 0.0, rate_kb: float = 0.0, fail_rate: float = 0.0,
+                truncate_rate: float = 0.0, validators: bool = True,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    Create the stand-in server (call serve_forever() to run it).
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 = any free port)
+        downloads_dir: Directory with the PDFs to serve
+        metadata_dir: Directory with scraper metadata JSON
+        latency: Seconds to wait before every response
+        rate_kb: Per-response bandwidth limit in KB/s (0 = unlimited)
+        fail_rate: Fraction of PDF requests answered with 503
+        truncate_rate: Fraction of PDF responses cut off halfway
+        validators: Send ETag/Last-Modified and honour conditional requests
+        quiet: Do not log requests
+
+    Returns:
+        Server instance
+    """
+    handler = type('ConfiguredStandinHandler', (StandinHandler,), {
+        'downloads_dir': downloads_dir,
+        'results_page': build_results_page(downloads_dir, metadata_dir).encode('utf-8'),
+        'latency': latency,
+        'rate_kb': rate_kb,
+        'fail_rate': fail_rate,
+        'truncate_rate': truncate_rate,
+        'validators': validators,
+        'quiet': quiet,
+        'counters': {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """Run the stand-in server"""
+    parser = argparse.ArgumentParser(
+        description='Serve downloads/ like the Mumbai University results site'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+    parser.add_argument('--downloads', default='downloads',
+                        help='Directory containing PDF files (default: downloads)')
+    parser.add_argument('--metadata', default='metadata',
+                        help='Directory containing metadata JSON files (default: metadata)')
+    parser.add_argument('--latency', type=float, default=0.0, metavar='S',
+                        help='Delay in seconds before every response (default: 0)')
+    parser.add_argument('--rate', type=float, default=0.0, metavar='KB',
+                        help='Per-response bandwidth limit in KB/s (default: unlimited)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, metavar='P',
+                        help='Fraction of PDF requests answered with 503 (default: 0)')
+    parser.add_argument('--truncate-rate', type=float, default=0.0, metavar='P',
+                        help='Fraction of PDF responses cut off halfway (default: 0)')
+    parser.add_argument('--no-validators', action='store_true',
+                        help='Send no ETag/Last-Modified headers (default: send them)')
+    parser.add_argument('--quiet', action='store_true', help='Do not log requests')
+
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.downloads, args.metadata,
+                         latency=args.latency, rate_kb=args.rate, fail_rate=args.fail_rate,
+                         truncate_rate=args.truncate_rate,
+                         validators=not args.no_validators, quiet=args.quiet)
+
+    print(f"Serving {args.downloads}/ at http://{args.host}:{server.server_port}{RESULTS_PATH}")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print(f"Stopped. Counters: {server.RequestHandlerClass.counters}")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
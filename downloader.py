@@ -0,0 +1,477 @@
+"""
+=============================================================================
+Concurrent Resumable Downloader for Mumbai University Result PDFs
+=============================================================================
+
+Downloads many files at once, for release days when dozens of registers
+appear together.
+
+Features:
+- Bounded worker pool (threads) with a per-host connection limit
+- Retries with exponential backoff and jitter on connection errors,
+  timeouts, 429 and 5xx responses (Retry-After is honoured)
+- Resume: data goes to "{file}.part"; a retry or a later run continues it
+  with an HTTP Range request instead of starting over
+- Atomic: the .part file is renamed to the final name only once complete,
+  so a file under its final name is never truncated
+- Revalidation: with the ETag/Last-Modified/Content-Length saved from the
+  previous download, an existing file costs one conditional GET (304, no
+  body) when unchanged; re-published files are re-fetched and reported
+  as 'updated'
+
+Usage:
+    downloader = ConcurrentDownloader(workers=8, per_host=4)
+    results = downloader.download_all([(url, 'downloads/exam.pdf'), ...])
+    for result in results:
+        print(result['status'], result['path'], result['validators'])
+
+    # Later: revalidate with the saved validators
+    downloader.download_all([(url, 'downloads/exam.pdf', validators), ...])
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import time
+import filecmp
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+PART_SUFFIX = '.part'
+# Sidecar holding the ETag/Last-Modified a .part file belongs to (for If-Range)
+PART_VALIDATOR_SUFFIX = '.validator'
+
+# Responses worth retrying (everything else 4xx fails immediately)
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """Download attempt failed in a way a retry may fix"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrentDownloader:
+    """Thread pool downloader with per-host limits, retries and Range resume"""
+
+    DEFAULT_WORKERS = 8
+    DEFAULT_PER_HOST = 4
+    DEFAULT_RETRIES = 4
+    DEFAULT_BACKOFF = 1.0
+    MAX_BACKOFF = 60.0
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 timeout: float = 60, headers: Optional[Dict[str, str]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize downloader.
+
+        Args:
+            workers: Maximum number of files downloaded at the same time
+            per_host: Maximum concurrent connections to one host
+            retries: Retries per file after the first attempt
+            backoff: Base delay in seconds, doubled after every failed attempt
+            timeout: Connect/read timeout in seconds
+            headers: Extra request headers (e.g. User-Agent)
+            logger: Logger for progress messages (default: module logger)
+        """
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._local = threading.local()
+        self._host_lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    # -------------------------------------------------------------------------
+    # Connection handling
+    # -------------------------------------------------------------------------
+
+    def _session(self) -> requests.Session:
+        """Session of the current worker thread (sessions are not shared)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.per_host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent connections to the URL's host"""
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Backoff before the next attempt: exponential with jitter, or Retry-After"""
+        if retry_after is not None:
+            return min(retry_after, self.MAX_BACKOFF)
+        delay = self.backoff * (2 ** attempt)
+        return min(delay * random.uniform(0.5, 1.5), self.MAX_BACKOFF)
+
+    # -------------------------------------------------------------------------
+    # Downloading
+    # -------------------------------------------------------------------------
+
+    def download(self, url: str, dest_path: str,
+                 validators: Optional[Dict] = None) -> Dict:
+        """
+        Download one file with retries, resuming a partial download if present.
+
+        If validators are given and dest_path exists, the file is revalidated
+        instead: a conditional GET (If-None-Match / If-Modified-Since) costs a
+        304 without body when unchanged. Without an ETag or Last-Modified, a
+        HEAD request compares Content-Length with the local size.
+
+        Args:
+            url: File URL
+            dest_path: Final file path (written through dest_path + '.part')
+            validators: Validators saved from the previous download
+                        ({'etag', 'last_modified', 'content_length'}), or None
+                        to download unconditionally
+
+        Returns:
+            Dictionary with:
+            {
+                'url', 'path',
+                'status': 'downloaded' (new file), 'updated' (existing file
+                          replaced by different content), 'not_modified' or 'failed',
+                'validators': {'etag', 'last_modified', 'content_length'} of the
+                              file now on disk (None if failed),
+                'bytes': bytes received in this call,
+                'resumed_from': bytes already on disk when the download started,
+                'attempts': number of HTTP attempts,
+                'seconds': elapsed time,
+                'error': message if failed, else None
+            }
+        """
+        part_path = dest_path + PART_SUFFIX
+        result = {
+            'url': url,
+            'path': dest_path,
+            'status': 'failed',
+            'validators': None,
+            'bytes': 0,
+            'resumed_from': self._part_size(part_path),
+            'attempts': 0,
+            'seconds': 0.0,
+            'error': None
+        }
+        start = time.perf_counter()
+
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+
+        # Revalidate an existing file (an interrupted re-fetch just resumes)
+        exists = os.path.exists(dest_path)
+        revalidate = validators is not None and exists and not result['resumed_from']
+        conditional = _conditional_headers(validators) if revalidate else {}
+        probe_size = revalidate and not conditional
+
+        for attempt in range(self.retries + 1):
+            result['attempts'] = attempt + 1
+            try:
+                with self._host_slot(url):
+                    if probe_size:
+                        head = self._head(url)
+                        if head['content_length'] == os.path.getsize(dest_path):
+                            result['status'] = 'not_modified'
+                            result['validators'] = head
+                            result['error'] = None
+                            break
+                        probe_size = False
+                    written, response_validators = self._fetch(url, part_path, conditional)
+
+                if written is None:
+                    # 304: keep the file, refresh validators the server sent
+                    result['status'] = 'not_modified'
+                    result['validators'] = _merge_validators(validators, response_validators)
+                    result['error'] = None
+                    break
+
+                result['bytes'] += written
+                result['status'] = self._finish(part_path, dest_path, exists)
+                response_validators['content_length'] = os.path.getsize(dest_path)
+                result['validators'] = response_validators
+                result['error'] = None
+                break
+            except RetryableError as e:
+                result['error'] = str(e)
+                if attempt == self.retries:
+                    break
+                delay = self._retry_delay(attempt, e.retry_after)
+                self.logger.warning(
+                    f"Retrying {os.path.basename(dest_path)} in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.retries + 1}): {e}"
+                )
+                time.sleep(delay)
+            except (requests.RequestException, OSError) as e:
+                result['error'] = str(e)
+                break
+
+        result['seconds'] = time.perf_counter() - start
+        if result['status'] == 'failed':
+            self.logger.error(f"Failed to download {url}: {result['error']}")
+        return result
+
+    @staticmethod
+    def _finish(part_path: str, dest_path: str, existed: bool) -> str:
+        """
+        Move a complete .part file into place.
+
+        Returns:
+            'downloaded', 'updated', or 'not_modified' if an existing file
+            had identical content (server ignored the conditional request)
+        """
+        status = 'downloaded'
+        if existed:
+            status = 'not_modified' if filecmp.cmp(part_path, dest_path, shallow=False) else 'updated'
+        os.replace(part_path, dest_path)
+        try:
+            os.remove(part_path + PART_VALIDATOR_SUFFIX)
+        except OSError:
+            pass
+        return status
+
+    def _head(self, url: str) -> Dict:
+        """
+        HEAD request for the validators of a URL.
+
+        Raises:
+            RetryableError: Transient failure
+            requests.HTTPError: Permanent HTTP failure
+        """
+        try:
+            response = self._session().head(url, headers={'Accept-Encoding': 'identity'},
+                                            timeout=self.timeout, allow_redirects=True)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise RetryableError(f"connection error: {e}")
+
+        if response.status_code in RETRY_STATUS_CODES:
+            raise RetryableError(f"HTTP {response.status_code}",
+                                 _retry_after(response.headers.get('Retry-After')))
+        response.raise_for_status()
+        return _response_validators(response.headers)
+
+    def _fetch(self, url: str, part_path: str,
+               conditional: Optional[Dict[str, str]] = None) -> Tuple[Optional[int], Dict]:
+        """
+        One HTTP attempt, appending to part_path from its current size.
+
+        Args:
+            url: File URL
+            part_path: Partial download path
+            conditional: If-None-Match / If-Modified-Since headers (fresh fetches only)
+
+        Returns:
+            (bytes written, response validators); bytes is None for a 304
+
+        Raises:
+            RetryableError: Transient failure, partial data is kept for the retry
+            requests.HTTPError: Permanent HTTP failure
+        """
+        offset = self._part_size(part_path)
+        # Byte ranges must refer to the file itself, not a compressed encoding
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+            # Only resume if the file did not change since the .part was started
+            if_range = self._read_part_validator(part_path)
+            if if_range:
+                headers['If-Range'] = if_range
+        elif conditional:
+            headers.update(conditional)
+
+        try:
+            response = self._session().get(url, headers=headers, stream=True,
+                                           timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise RetryableError(f"connection error: {e}")
+
+        with response:
+            validators = _response_validators(response.headers)
+
+            if response.status_code == 304 and not offset:
+                return None, validators
+
+            if response.status_code == 416 and offset:
+                # Nothing left to fetch if the .part already holds the whole file
+                if _content_range_total(response.headers.get('Content-Range')) == offset:
+                    return 0, validators
+                os.remove(part_path)
+                raise RetryableError("stale partial download discarded")
+
+            if response.status_code in RETRY_STATUS_CODES:
+                raise RetryableError(f"HTTP {response.status_code}",
+                                     _retry_after(response.headers.get('Retry-After')))
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                start = _content_range_start(response.headers.get('Content-Range'))
+                if start != offset:
+                    os.remove(part_path)
+                    raise RetryableError(f"server resumed at byte {start}, expected {offset}")
+                mode = 'ab'
+                expected = offset + int(response.headers.get('Content-Length', -1))
+            else:
+                # Fresh download, or the server ignored the Range header
+                # (file changed since the .part was started): start from scratch
+                offset = 0
+                mode = 'wb'
+                expected = int(response.headers.get('Content-Length', -1))
+                self._write_part_validator(part_path, validators)
+
+            written = 0
+            try:
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                raise RetryableError(f"connection lost after {offset + written} bytes: {e}")
+
+        if expected >= 0 and offset + written != expected:
+            raise RetryableError(f"incomplete body: {offset + written} of {expected} bytes")
+
+        return written, validators
+
+    @staticmethod
+    def _read_part_validator(part_path: str) -> Optional[str]:
+        """If-Range value saved when the .part file was started"""
+        try:
+            with open(part_path + PART_VALIDATOR_SUFFIX) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_part_validator(part_path: str, validators: Dict):
+        """Save the strong ETag (or Last-Modified) a .part file belongs to"""
+        etag = validators.get('etag')
+        value = etag if etag and not etag.startswith('W/') else validators.get('last_modified')
+        validator_path = part_path + PART_VALIDATOR_SUFFIX
+        if value:
+            with open(validator_path, 'w') as f:
+                f.write(value)
+        elif os.path.exists(validator_path):
+            os.remove(validator_path)
+
+    def download_all(self, jobs: List[Tuple],
+                     on_complete: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Download many files concurrently.
+
+        Args:
+            jobs: List of (url, dest_path) or (url, dest_path, validators)
+                  tuples (validators: see download())
+            on_complete: Called with each result as soon as its download
+                         finishes (in the calling thread)
+
+        Returns:
+            List of download() results, in jobs order
+        """
+        results: List[Optional[Dict]] = [None] * len(jobs)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self.download, *job): idx
+                for idx, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_complete:
+                    on_complete(result)
+
+        return results
+
+    @staticmethod
+    def _part_size(part_path: str) -> int:
+        """Size of a partial download, 0 if there is none"""
+        try:
+            return os.path.getsize(part_path)
+        except OSError:
+            return 0
+
+
+def _response_validators(headers) -> Dict:
+    """ETag, Last-Modified and Content-Length (total size for 206) of a response"""
+    total = _content_range_total(headers.get('Content-Range'))
+    if total is None:
+        try:
+            total = int(headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            total = None
+    return {
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+        'content_length': total
+    }
+
+
+def _merge_validators(old: Optional[Dict], new: Dict) -> Dict:
+    """Validators after a 304: values the server sent replace the saved ones"""
+    merged = dict(old or {})
+    for key in ('etag', 'last_modified'):
+        if new.get(key):
+            merged[key] = new[key]
+    return merged
+
+
+def _conditional_headers(validators: Optional[Dict]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers from saved validators"""
+    headers = {}
+    if validators and validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators and validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _content_range_start(content_range: Optional[str]) -> Optional[int]:
+    """First byte position of "bytes START-END/TOTAL", None if missing/invalid"""
+    try:
+        return int(content_range.split()[1].split('-')[0])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _content_range_total(content_range: Optional[str]) -> Optional[int]:
+    """Total size of "bytes START-END/TOTAL" or "bytes */TOTAL", None if unknown"""
+    try:
+        return int(content_range.rsplit('/', 1)[1])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header in seconds (only the delta-seconds form)"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,238 @@
+"""
+=============================================================================
+Examination Statistics for Mumbai University Grade Records
+=============================================================================
+
+Pass/fail aggregates of student exam records, each computed with one
+grouped SQL query instead of one COUNT query per examination and result.
+The records are scanned once, counted per examination in a subquery, and
+the (few) per-examination counts are then summed per group.
+
+Groupings:
+- exam:     per examination (every examination, including empty ones)
+- program:  per academic program
+- college:  per college code
+- semester: per semester
+
+Every row has total_students, passed, failed and pass_percentage next to
+the grouping's key columns.
+
+Filters narrow the records that are counted:
+- Examination filters: exam_id, program_code, semester, exam_type, exam_year
+- Record filters:      college_code, status
+
+Caching (optional): results are kept per (grouping, filters) until the
+database changes. Each lookup first reads a fingerprint of the ingested
+data (manifest entries, last processing time, highest record id,
+number of examinations); any
+ingest or purge changes it and drops the cached results.
+
+Usage:
+    engine = ExamStatistics(session, cache=True)
+    for row in engine.aggregate('college', semester='Semester - I'):
+        print(row['college_code'], row['pass_percentage'])
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from models import Examination, PdfManifest, Program, StudentExamRecord
+
+# Key columns (label -> column) of each grouping
+GROUPINGS = {
+    'exam': {
+        'exam_id': Examination.id,
+        'exam_title': Examination.exam_title,
+        'program_code': Examination.program_code,
+        'semester': Examination.semester,
+        'exam_type': Examination.exam_type,
+        'result_date': Examination.result_date,
+    },
+    'program': {
+        'program_code': Program.program_code,
+        'program_name': Program.program_name,
+    },
+    'college': {
+        'college_code': StudentExamRecord.college_code,
+    },
+    'semester': {
+        'semester': Examination.semester,
+    },
+}
+
+EXAM_FILTERS = {
+    'exam_id': Examination.id,
+    'program_code': Examination.program_code,
+    'semester': Examination.semester,
+    'exam_type': Examination.exam_type,
+    'exam_year': Examination.exam_year,
+}
+
+RECORD_FILTERS = {
+    'college_code': StudentExamRecord.college_code,
+    'status': StudentExamRecord.status,
+}
+
+# Data fingerprint (see data_fingerprint), built once
+FINGERPRINT_QUERY = select(
+    select(func.count(PdfManifest.pdf_filename)).scalar_subquery(),
+    select(func.max(PdfManifest.processed_at)).scalar_subquery(),
+    select(func.max(StudentExamRecord.id)).scalar_subquery(),
+    select(func.count(Examination.id)).scalar_subquery(),
+)
+
+
+class ExamStatistics:
+    """Grouped pass/fail aggregates over student exam records"""
+
+    def __init__(self, db_session: Session, cache: bool = False):
+        """
+        Initialize statistics engine.
+
+        Args:
+            db_session: SQLAlchemy database session
+            cache: Keep results until the database changes (next ingest)
+        """
+        self.db_session = db_session
+        self.cache_enabled = cache
+        self._cache: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._fingerprint: Optional[Tuple] = None
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def aggregate(self, group_by: str = 'exam', **filters) -> List[Dict[str, Any]]:
+        """
+        Pass/fail aggregates per group.
+
+        Args:
+            group_by: 'exam', 'program', 'college' or 'semester'
+            **filters: Column values the counted records must have (see
+                       EXAM_FILTERS and RECORD_FILTERS)
+
+        Returns:
+            One dictionary per group (ordered by its key columns) with the
+            key columns, total_students, passed, failed and pass_percentage
+
+        Raises:
+            ValueError: Unknown grouping or filter
+        """
+        if group_by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping '{group_by}' (choose from {', '.join(GROUPINGS)})")
+        unknown = set(filters) - set(EXAM_FILTERS) - set(RECORD_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(sorted(unknown))}")
+
+        if not self.cache_enabled:
+            return self._query(group_by, filters)
+
+        self._check_fingerprint()
+        key = (group_by, tuple(sorted(filters.items())))
+        rows = self._cache.get(key)
+        if rows is not None:
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            rows = self._cache[key] = self._query(group_by, filters)
+        # Callers may sort or modify the rows they get
+        return [dict(row) for row in rows]
+
+    def invalidate(self):
+        """Drop all cached results"""
+        self._cache.clear()
+        self._fingerprint = None
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _query(self, group_by: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run the grouped query for one grouping"""
+        record = StudentExamRecord
+        record_keys = [label for label, column in GROUPINGS[group_by].items()
+                       if column.class_ is record]
+
+        # Records are counted per examination (and record key) in one scan;
+        # the outer query only joins and sums those partial counts
+        counts = self.db_session.query(
+            record.exam_id,
+            *(getattr(record, label) for label in record_keys),
+            func.count(record.id).label('total_students'),
+            func.sum(case((record.result == 'PASS', 1), else_=0)).label('passed'),
+            func.sum(case((record.result == 'FAIL', 1), else_=0)).label('failed'),
+        )
+        if group_by == 'college':
+            counts = counts.add_columns(func.max(record.college_name).label('college_name'))
+        for name, value in filters.items():
+            if name in RECORD_FILTERS:
+                counts = counts.filter(RECORD_FILTERS[name] == value)
+        counts = counts.group_by(record.exam_id, *(getattr(record, label) for label in record_keys))
+        counts = counts.subquery()
+
+        keys = {label: counts.c[label] if label in record_keys else column
+                for label, column in GROUPINGS[group_by].items()}
+        total = func.coalesce(func.sum(counts.c.total_students), 0)
+
+        # Examinations without matching records still get a row (with zero
+        # counts) in the exam grouping
+        query = self.db_session.query(
+            *(column.label(label) for label, column in keys.items()),
+            total.label('total_students'),
+            func.coalesce(func.sum(counts.c.passed), 0).label('passed'),
+            func.coalesce(func.sum(counts.c.failed), 0).label('failed'),
+        ).select_from(Examination).outerjoin(counts, counts.c.exam_id == Examination.id)
+
+        if group_by == 'program':
+            query = query.join(Program, Program.program_code == Examination.program_code)
+        elif group_by == 'college':
+            query = query.add_columns(func.max(counts.c.college_name).label('college_name'))
+
+        for name, value in filters.items():
+            if name in EXAM_FILTERS:
+                query = query.filter(EXAM_FILTERS[name] == value)
+
+        key_columns = list(keys.values())
+        query = query.group_by(*key_columns).order_by(*key_columns)
+        if group_by != 'exam':
+            query = query.having(total > 0)
+
+        stats = []
+        for row in query:
+            row_stats = dict(row._mapping)
+            total_students = row_stats['total_students']
+            row_stats['pass_percentage'] = round(
+                (row_stats['passed'] / total_students * 100) if total_students > 0 else 0, 2
+            )
+            stats.append(row_stats)
+        return stats
+
+    def _check_fingerprint(self):
+        """Drop cached results if records were ingested or purged since they were computed"""
+        fingerprint = data_fingerprint(self.db_session)
+        if fingerprint != self._fingerprint:
+            if self._cache:
+                self.stats['invalidations'] += 1
+            self._cache.clear()
+            self._fingerprint = fingerprint
+
+
+def data_fingerprint(db_session: Session) -> Tuple:
+    """
+    Fingerprint of the ingested data; changes with every ingest or purge.
+
+    Made of the manifest entry count and last processing time, the highest
+    record id and the number of examinations, read in one statement (cheap:
+    the manifest is small and the maximum id is read from the primary key).
+
+    Args:
+        db_session: SQLAlchemy database session
+
+    Returns:
+        Tuple to compare with an earlier fingerprint
+    """
+    return tuple(db_session.execute(FINGERPRINT_QUERY).one())
@@ -5,74 +5,297 @@ Export Utilities for Mumbai University Grade Records
 
 Utilities to export database records to JSON and other formats.
 
+students.json is streamed: rows are sorted in SQL, fetched in batches as
+plain tuples and written one by one, as a JSON array or JSON Lines,
+optionally gzipped.
+
+For analysis, export_students_parquet() writes the same records as a
+Parquet dataset partitioned by exam_year/program_code (requires pyarrow),
+and load_students_parquet() reads only the partitions asked for.
+
 Author: GitHub Copilot
 Date: 2026-02-09
 Version: 1.0
 =============================================================================
 """
 
+import os
+import gzip
 import json
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from models import Student, StudentExamRecord, Examination
+from exam_statistics import ExamStatistics
+
+
+# Columns of a students.json record, in output order
+EXPORT_COLUMNS = (
+    ('ern', Student.ern),
+    ('full_name', Student.full_name),
+    ('gender', Student.gender),
+    ('seat_no', StudentExamRecord.seat_no),
+    ('college_code', StudentExamRecord.college_code),
+    ('college_name', StudentExamRecord.college_name),
+    ('status', StudentExamRecord.status),
+    ('result', StudentExamRecord.result),
+    ('exam_id', Examination.id),
+    ('exam_title', Examination.exam_title),
+    ('semester', Examination.semester),
+    ('exam_type', Examination.exam_type),
+    ('exam_month', Examination.exam_month),
+    ('exam_year', Examination.exam_year),
+    ('result_date', Examination.result_date),
+    ('declaration_date', Examination.declaration_date),
+    ('page_number', StudentExamRecord.page_number),
+    ('pdf_file', StudentExamRecord.pdf_file),
+)
+
+EXPORT_FORMATS = ('json', 'jsonl')
+EXPORT_BATCH_SIZE = 5000
+
+
+def iter_export_records(db_session: Session,
+                        batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream all student exam records, sorted by ERN, result date and exam.
+    
+    Rows are sorted by SQL and fetched batch_size at a time as plain column
+    tuples (no ORM objects), so memory does not grow with the record count.
+    
+    Args:
+        db_session: SQLAlchemy session
+        batch_size: Rows fetched per batch
+        
+    Yields:
+        One dictionary per record (keys as in EXPORT_COLUMNS)
+    """
+    labels = [label for label, _ in EXPORT_COLUMNS]
+    query = db_session.query(
+        *(column for _, column in EXPORT_COLUMNS)
+    ).select_from(StudentExamRecord).join(
+        Student, StudentExamRecord.student_ern == Student.ern
+    ).join(
+        Examination, StudentExamRecord.exam_id == Examination.id
+    ).order_by(
+        StudentExamRecord.student_ern, func.coalesce(Examination.result_date, ''), Examination.id
+    ).execution_options(yield_per=batch_size)
+    
+    for row in query:
+        yield dict(zip(labels, row))
 
 
-def export_students_json(db_session: Session, output_file: str = 'students.json') -> int:
+def export_students_json(db_session: Session, output_file: str = 'students.json',
+                         output_format: Optional[str] = None,
+                         compress: Optional[bool] = None,
+                         batch_size: int = EXPORT_BATCH_SIZE) -> int:
     """
     Export all student exam records to JSON file.
     
     Creates a flat JSON array with student information for easy development access.
+    Records are streamed from the database and written one at a time with
+    compact separators (one record per line), so memory stays flat however
+    many records there are. The file is replaced only once it is complete.
     
     Args:
         db_session: SQLAlchemy session
-        output_file: Output JSON file path
+        output_file: Output file path
+        output_format: 'json' (array) or 'jsonl' (JSON Lines, one object per
+                       line); None picks 'jsonl' for .jsonl files, else 'json'
+        compress: gzip the output; None compresses .gz files
+        batch_size: Rows fetched from the database per batch
         
     Returns:
         Number of records exported
     """
-    # Query all student exam records with joins
-    records = db_session.query(
-        StudentExamRecord, Student, Examination
-    ).join(
-        Student, StudentExamRecord.student_ern == Student.ern
-    ).join(
-        Examination, StudentExamRecord.exam_id == Examination.id
-    ).all()
+    base_name = output_file[:-3] if output_file.endswith('.gz') else output_file
+    if compress is None:
+        compress = output_file.endswith('.gz')
+    if output_format is None:
+        output_format = 'jsonl' if base_name.endswith('.jsonl') else 'json'
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{output_format}' (choose from {', '.join(EXPORT_FORMATS)})")
     
-    # Format as list of dictionaries
-    export_data = []
+    tmp_file = output_file + '.tmp'
+    opener = gzip.open if compress else open
+    encoder = json.JSONEncoder(separators=(',', ':'))
+    count = 0
     
-    for record, student, exam in records:
-        export_data.append({
-            'ern': student.ern,
-            'full_name': student.full_name,
-            'gender': student.gender,
-            'seat_no': record.seat_no,
-            'college_code': record.college_code,
-            'college_name': record.college_name,
-            'status': record.status,
-            'result': record.result,
-            'exam_id': exam.id,
-            'exam_title': exam.exam_title,
-            'semester': exam.semester,
-            'exam_type': exam.exam_type,
-            'exam_month': exam.exam_month,
-            'exam_year': exam.exam_year,
-            'result_date': exam.result_date,
-            'declaration_date': exam.declaration_date,
-            'page_number': record.page_number,
-            'pdf_file': record.pdf_file
-        })
+    with opener(tmp_file, 'wt', encoding='utf-8') as f:
+        if output_format == 'json':
+            f.write('[')
+        for record in iter_export_records(db_session, batch_size=batch_size):
+            if output_format == 'json':
+                f.write(',\n' if count else '\n')
+            f.write(encoder.encode(record))
+            if output_format == 'jsonl':
+                f.write('\n')
+            count += 1
+        if output_format == 'json':
+            f.write('\n]\n' if count else ']\n')
+    os.replace(tmp_file, output_file)
     
-    # Sort by ERN and exam date
-    export_data.sort(key=lambda x: (x['ern'], x.get('result_date', ''), x['exam_id']))
+    print(f"Exported {count} student records to {output_file}")
+    return count
+
+
+# Columnar export: partition keys (directory levels) and dictionary-encoded
+# columns (few distinct values, repeated across many records)
+PARQUET_PARTITION_KEYS = ('exam_year', 'program_code')
+PARQUET_DICTIONARY_COLUMNS = (
+    'gender', 'college_code', 'college_name', 'status', 'result', 'exam_title',
+    'semester', 'exam_type', 'exam_month', 'result_date', 'declaration_date',
+)
+PARQUET_INT_COLUMNS = ('exam_id', 'page_number')
+PARQUET_NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+
+def _parquet_schema():
+    """Arrow schema of the record columns (partition keys excluded)"""
+    import pyarrow as pa
     
-    # Write to JSON file
-    with open(output_file, 'w') as f:
-        json.dump(export_data, f, indent=2)
+    fields = []
+    for label, _ in EXPORT_COLUMNS:
+        if label in PARQUET_PARTITION_KEYS:
+            continue
+        if label in PARQUET_INT_COLUMNS:
+            fields.append(pa.field(label, pa.int32()))
+        elif label in PARQUET_DICTIONARY_COLUMNS:
+            fields.append(pa.field(label, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(label, pa.string()))
+    return pa.schema(fields)
+
+
+def _parquet_partitioning():
+    """Hive partitioning of the dataset (program codes stay strings)"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
     
-    print(f"Exported {len(export_data)} student records to {output_file}")
-    return len(export_data)
+    return ds.HivePartitioning(
+        pa.schema([('exam_year', pa.int32()), ('program_code', pa.string())]),
+        null_fallback=PARQUET_NULL_PARTITION
+    )
+
+
+def export_students_parquet(db_session: Session, output_dir: str = 'students_parquet',
+                            batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+    Export all student exam records as a partitioned Parquet dataset.
+    
+    Layout: {output_dir}/exam_year=YYYY/program_code=CODE/part-0.parquet
+    (hive partitioning). Each partition is filled from its own streaming
+    query (records of the partition's examinations, fetched batch_size rows
+    at a time) and written one row group per batch, so memory stays flat.
+    Repeated text columns (college, exam title, semester, ...) are
+    dictionary encoded and load as pandas categoricals. The dataset is
+    replaced only once it is complete.
+    
+    Requires pyarrow (optional dependency).
+    
+    Args:
+        db_session: SQLAlchemy session
+        output_dir: Dataset directory
+        batch_size: Rows fetched from the database and written per row group
+        
+    Returns:
+        Number of records exported
+    """
+    import shutil
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = _parquet_schema()
+    labels = schema.names
+    columns = dict(EXPORT_COLUMNS)
+    
+    # Examinations per partition (small table, read at once)
+    exams_by_partition: Dict[tuple, List[int]] = {}
+    for exam_id, exam_year, program_code in db_session.query(
+        Examination.id, Examination.exam_year, Examination.program_code
+    ).order_by(Examination.exam_year, Examination.program_code, Examination.id):
+        exams_by_partition.setdefault((exam_year, program_code), []).append(exam_id)
+    
+    tmp_dir = output_dir.rstrip(os.sep) + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    
+    count = 0
+    partitions = 0
+    for (exam_year, program_code), exam_ids in exams_by_partition.items():
+        query = db_session.query(
+            *(columns[label] for label in labels)
+        ).select_from(StudentExamRecord).join(
+            Student, StudentExamRecord.student_ern == Student.ern
+        ).join(
+            Examination, StudentExamRecord.exam_id == Examination.id
+        ).filter(
+            StudentExamRecord.exam_id.in_(exam_ids)
+        ).order_by(
+            StudentExamRecord.exam_id, StudentExamRecord.student_ern
+        )
+        
+        writer = None
+        try:
+            result = db_session.execute(query.statement, execution_options={'yield_per': batch_size})
+            for rows in result.partitions():
+                if writer is None:
+                    partition_dir = os.path.join(
+                        tmp_dir,
+                        f"exam_year={PARQUET_NULL_PARTITION if exam_year is None else exam_year}",
+                        f"program_code={program_code or PARQUET_NULL_PARTITION}"
+                    )
+                    os.makedirs(partition_dir, exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        os.path.join(partition_dir, 'part-0.parquet'), schema,
+                        use_dictionary=list(PARQUET_DICTIONARY_COLUMNS), compression='zstd'
+                    )
+                    partitions += 1
+                
+                values = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values[i], type=field.type) for i, field in enumerate(schema)],
+                    schema=schema
+                ))
+                count += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.replace(tmp_dir, output_dir)
+    
+    print(f"Exported {count} student records to {output_dir} ({partitions} partitions)")
+    return count
+
+
+def load_students_parquet(dataset_dir: str = 'students_parquet',
+                          exam_year: Optional[int] = None,
+                          program_code: Optional[str] = None):
+    """
+    Load records of a Parquet export into a pandas DataFrame.
+    
+    Only the partitions matching exam_year/program_code are read.
+    
+    Args:
+        dataset_dir: Dataset directory written by export_students_parquet()
+        exam_year: Only this exam year (None = all)
+        program_code: Only this program (None = all)
+        
+    Returns:
+        pandas DataFrame, including the exam_year and program_code columns
+    """
+    import pyarrow.dataset as ds
+    
+    dataset = ds.dataset(dataset_dir, format='parquet', partitioning=_parquet_partitioning())
+    condition = None
+    for name, value in (('exam_year', exam_year), ('program_code', program_code)):
+        if value is not None:
+            term = ds.field(name) == value
+            condition = term if condition is None else condition & term
+    return dataset.to_table(filter=condition).to_pandas()
 
 
 def get_student_by_ern(db_session: Session, ern: str) -> List[Dict[str, Any]]:
@@ -147,55 +370,104 @@ def get_failed_students(db_session: Session) -> List[Dict[str, Any]]:
     return result
 
 
-def get_exam_statistics(db_session: Session) -> List[Dict[str, Any]]:
+def get_failed_students_page(db_session: Session, limit: int = 100,
+                             after_id: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
     """
-    Get statistics for all examinations.
+    Get one page of students with FAIL result (keyset pagination).
+    
+    Records are ordered by record id; a page starts after the last id of
+    the previous one, so every page is an index range scan however deep
+    it is (no OFFSET).
     
     Args:
         db_session: SQLAlchemy session
+        limit: Records per page
+        after_id: Last record id of the previous page (None: first page)
         
     Returns:
-        List of exam statistics
+        (failed student records as in get_failed_students(), record id to
+        pass as after_id for the next page or None on the last page)
     """
-    exams = db_session.query(Examination).all()
-    
-    stats = []
-    for exam in exams:
-        total = db_session.query(StudentExamRecord).filter_by(exam_id=exam.id).count()
-        passed = db_session.query(StudentExamRecord).filter_by(
-            exam_id=exam.id, result='PASS'
-        ).count()
-        failed = db_session.query(StudentExamRecord).filter_by(
-            exam_id=exam.id, result='FAIL'
-        ).count()
-        
-        stats.append({
-            'exam_id': exam.id,
-            'exam_title': exam.exam_title,
-            'semester': exam.semester,
-            'exam_type': exam.exam_type,
-            'result_date': exam.result_date,
-            'total_students': total,
-            'passed': passed,
-            'failed': failed,
-            'pass_percentage': round((passed / total * 100) if total > 0 else 0, 2)
+    query = db_session.query(
+        StudentExamRecord.id,
+        Student.ern,
+        Student.full_name,
+        StudentExamRecord.seat_no,
+        Examination.exam_title,
+        Examination.semester,
+        Examination.result_date,
+        StudentExamRecord.college_name,
+        StudentExamRecord.pdf_file,
+    ).select_from(StudentExamRecord).join(
+        Student, StudentExamRecord.student_ern == Student.ern
+    ).join(
+        Examination, StudentExamRecord.exam_id == Examination.id
+    ).filter(
+        StudentExamRecord.result == 'FAIL'
+    )
+    if after_id is not None:
+        query = query.filter(StudentExamRecord.id > after_id)
+    
+    # One extra row tells whether there is a next page
+    rows = query.order_by(StudentExamRecord.id).limit(limit + 1).all()
+    
+    result = []
+    for row in rows[:limit]:
+        result.append({
+            'ern': row.ern,
+            'full_name': row.full_name,
+            'seat_no': row.seat_no,
+            'exam_title': row.exam_title,
+            'semester': row.semester,
+            'result_date': row.result_date,
+            'college': row.college_name,
+            'pdf_file': row.pdf_file
         })
     
-    return stats
+    next_id = rows[limit - 1].id if len(rows) > limit else None
+    return result, next_id
+
+
+def get_exam_statistics(db_session: Session, **filters) -> List[Dict[str, Any]]:
+    """
+    Get statistics for all examinations.
+    
+    Computed in one grouped query (see exam_statistics.py for per-program,
+    per-college and per-semester aggregates and result caching).
+    
+    Args:
+        db_session: SQLAlchemy session
+        **filters: Optional ExamStatistics filters (e.g. semester, college_code)
+        
+    Returns:
+        List of exam statistics
+    """
+    return ExamStatistics(db_session).aggregate('exam', **filters)
 
 
 if __name__ == '__main__':
-    """Export students.json when run as script"""
+    """Export students.json (or the file given, e.g. students.jsonl.gz) when run as script"""
+    import sys
     from init_db import get_database_session
     
+    # --parquet [DIR] writes the partitioned Parquet dataset instead
+    parquet = len(sys.argv) > 1 and sys.argv[1] == '--parquet'
+    if parquet:
+        output_file = sys.argv[2] if len(sys.argv) > 2 else 'students_parquet'
+    else:
+        output_file = sys.argv[1] if len(sys.argv) > 1 else 'students.json'
+    
     print("="*70)
-    print("Exporting Student Records to JSON")
+    print(f"Exporting Student Records to {'Parquet' if parquet else 'JSON'}")
     print("="*70)
     print()
     
     session = get_database_session('grade_records.db')
-    count = export_students_json(session, 'students.json')
+    if parquet:
+        count = export_students_parquet(session, output_file)
+    else:
+        count = export_students_json(session, output_file)
     
     print()
-    print(f"✓ Exported {count} records to students.json")
+    print(f"✓ Exported {count} records to {output_file}")
     print()
@@ -4,30 +4,101 @@ Simplified Student Record Extractor
 =============================================================================
 Lightweight extraction of student basic info (no detailed grades).
 Extracts: ERN, full_name, seat number, status, result for PDF cropping.
+
+Page text comes from a pluggable backend (see text_backends.py):
+pdfplumber (default) or pymupdf. An optional PageTextCache (text_cache.py)
+stores the page texts so re-parsing skips text extraction.
+
+Student blocks are parsed with precompiled patterns: one anchored match
+reads every field of a standard header line, other blocks fall back to
+one search per field. bench_block_parser.py checks the output against
+the previous parser and measures the per-block cost.
 =============================================================================
 """
 
-import pdfplumber
 import re
 import logging
 from typing import List, Dict, Optional
 
+from text_backends import get_text_backend, DEFAULT_TEXT_BACKEND
+from diagnostics import TRACE_LOGGER, pdf_page_logger
+from metrics import StageTimer
+
+
+# Line starting a student record: 9-digit seat number followed by the name
+SEAT_LINE_RE = re.compile(r'\d{9}\s+[A-Z]')
+SEAT_LINE_MULTILINE_RE = re.compile(r'^\d{9}\s+[A-Z]', re.MULTILINE)
+
+# ERN printed on its own line above the seat number (edge case)
+ERN_LINE_RE = re.compile(r'\(MU\d+')
+
+# Student header in one anchored match, with the ERN after the gender:
+# "SEAT NAME STATUS GENDER (ERN) MU-CODE: COLLEGE NAME E1 ..."
+BLOCK_HEADER_RE = re.compile(
+    r'(?P<seat>\d{9})\s+(?P<name>[A-Z][A-Z\s]+?)'
+    r'\s+(?P<status>Regular|Repeater|ATKT|Ex-Student)'
+    r'\s+(?P<gender>MALE|FEMALE)'
+    r'\s+\(MU(?P<ern>\d+)\) MU-(?P<college_code>\d+): (?P<college_name>.+?) E1'
+)
+
+# ... or with the ERN on its own line above the seat number, often unclosed:
+# "(ERN SEAT NAME STATUS GENDER MU-CODE: COLLEGE NAME E1 ..."
+ERN_FIRST_HEADER_RE = re.compile(
+    r'\(MU(?P<ern>\d+)(?P<ern_closed>\))?\s+(?P<seat>\d{9})\s+(?P<name>[A-Z][A-Z\s]+?)'
+    r'\s+(?P<status>Regular|Repeater|ATKT|Ex-Student)'
+    r'\s+(?P<gender>MALE|FEMALE)'
+    r'\s+MU-(?P<college_code>\d+): (?P<college_name>.+?) E1'
+)
+
+# A keyword inside the matched name means a header match may not give the
+# first occurrence of every field; such blocks use the field searches
+NAME_KEYWORD_RE = re.compile(r'\b(?:Regular|Repeater|ATKT|Ex-Student|MALE|FEMALE)')
+
+# Field searches for blocks without a standard header line
+SEAT_RE = re.compile(r'\b(\d{9})\s+([A-Z][A-Z\s]+?)(?:\s+(?:Regular|Repeater|ATKT|Ex-Student)|(?:\s+(?:MALE|FEMALE)))')
+ERN_CLOSED_RE = re.compile(r'\(MU(\d+)\)')
+ERN_OPEN_RE = re.compile(r'\(MU(\d+)')
+STATUS_RE = re.compile(r'\b(Regular|Repeater|ATKT|Ex-Student)\b')
+GENDER_RE = re.compile(r'\b(MALE|FEMALE)\b')
+COLLEGE_AFTER_ERN_RE = re.compile(r'\) MU-(?P<college_code>\d+): (?P<college_name>.+?) E1', re.DOTALL)
+COLLEGE_RE = re.compile(r'MU-(?P<college_code>\d+): (?P<college_name>.+?) E1', re.DOTALL)
+
+# College name cleanup: cut at grade markers (first digit or "MAR"),
+# then drop every symbol except '&' and ','
+COLLEGE_TAIL_RE = re.compile(r'\d|MAR')
+COLLEGE_SYMBOLS_RE = re.compile(r'[^a-zA-Z\s&,]')
+
 
 class SimpleStudentExtractor:
     """Simplified extractor for student basic information"""
     
-    def __init__(self, pdf_path: str):
+    # Bump when parsing changes so the ingest manifest re-processes PDFs
+    VERSION = '1.0'
+    
+    def __init__(self, pdf_path: str, text_backend: str = DEFAULT_TEXT_BACKEND,
+                 text_cache=None):
+        """
+        Args:
+            pdf_path: Path to PDF file
+            text_backend: Text extraction backend name ('pdfplumber' or 'pymupdf')
+            text_cache: Optional PageTextCache for page texts
+        """
         self.pdf_path = pdf_path
+        self.text_backend = get_text_backend(text_backend)
+        self.text_cache = text_cache
         self.logger = logging.getLogger(__name__)
     
     def is_index_page(self, page_text: str) -> bool:
         """Check if page is an index page (no student records)"""
         return 'SEAT NO' not in page_text
     
-    def extract_exam_metadata(self, pages: List) -> Dict:
+    def extract_exam_metadata(self, page_texts: List[str]) -> Dict:
         """
         Extract exam metadata from first page.
         
+        Args:
+            page_texts: Text of each page, as returned by the text backend
+            
         Returns:
             Dict with: exam_title, exam_month, exam_year, declaration_date
         """
@@ -38,10 +109,10 @@ class SimpleStudentExtractor:
             'declaration_date': None
         }
         
-        if not pages:
+        if not page_texts:
             return metadata
         
-        first_page_text = pages[0].extract_text()
+        first_page_text = page_texts[0]
         if not first_page_text:
             return metadata
         
@@ -74,8 +145,7 @@ class SimpleStudentExtractor:
     def count_students_on_page(self, page_text: str) -> int:
         """Count number of student records on a page"""
         # Count lines starting with 9-digit seat numbers
-        seat_numbers = re.findall(r'^\d{9}\s+[A-Z]', page_text, re.MULTILINE)
-        return len(seat_numbers)
+        return sum(1 for _ in SEAT_LINE_MULTILINE_RE.finditer(page_text))
     
     def find_student_blocks(self, page_text: str) -> List[str]:
         """
@@ -88,16 +158,15 @@ class SimpleStudentExtractor:
         
         # Find lines that start with seat numbers (9 digits)
         student_start_indices = []
+        previous_is_ern = False
         for i, line in enumerate(lines):
-            # Check if previous line has ERN (edge case)
-            if i > 0 and re.match(r'^\(MU\d+', lines[i-1].strip()):
-                if re.match(r'^\d{9}\s+[A-Z]', line.strip()):
-                    student_start_indices.append(i - 1)
-                    continue
+            stripped = line.strip()
+            
+            if SEAT_LINE_RE.match(stripped):
+                # Include the previous line if it holds the ERN (edge case)
+                student_start_indices.append(i - 1 if previous_is_ern else i)
             
-            # Standard case: seat number at start of line
-            if re.match(r'^\d{9}\s+[A-Z]', line.strip()):
-                student_start_indices.append(i)
+            previous_is_ern = ERN_LINE_RE.match(stripped) is not None
         
         # Extract blocks between start indices
         blocks = []
@@ -127,8 +196,6 @@ class SimpleStudentExtractor:
         Returns:
             Dict with: ern, full_name, seat_no, status, gender, result
         """
-        lines = [l.strip() for l in block_text.split('\n') if l.strip()]
-        
         student = {
             'ern': None,
             'full_name': None,
@@ -143,66 +210,52 @@ class SimpleStudentExtractor:
         }
         
         # Join all lines into single text for easier parsing
-        full_text = ' '.join(lines)
-        
-        # Extract seat number (9 digits at start of a line)
-        seat_match = re.search(r'\b(\d{9})\s+([A-Z][A-Z\s]+?)(?:\s+(?:Regular|Repeater|ATKT|Ex-Student)|(?:\s+(?:MALE|FEMALE)))', full_text)
-        if seat_match:
-            student['seat_no'] = seat_match.group(1)
-            # Extract name (everything after seat number until status/gender keyword)
-            name_part = seat_match.group(2).strip()
-            student['full_name'] = ' '.join(name_part.split())  # Normalize whitespace
-        
-        # Extract ERN
-        ern_match = re.search(r'\(MU(\d+)\)', full_text) or re.search(r'\(MU(\d+)', full_text)
-        if ern_match:
-            student['ern'] = 'MU' + ern_match.group(1)
-        
-        # Extract status
-        status_match = re.search(r'\b(Regular|Repeater|ATKT|Ex-Student)\b', full_text)
-        if status_match:
-            student['status'] = status_match.group(1)
+        full_text = ' '.join(line.strip() for line in block_text.split('\n') if line.strip())
         
-        # Extract gender
-        gender_match = re.search(r'\b(MALE|FEMALE)\b', full_text)
-        if gender_match:
-            student['gender'] = gender_match.group(1)[0]  # M or F
+        # Standard header: every field from one anchored match. With the ERN
+        # first, the searches would prefer a later ") MU-" college or a later
+        # closed "(MU...)" over an unclosed ERN, so those blocks are excluded.
+        header = BLOCK_HEADER_RE.match(full_text)
+        if header is None and ') MU-' not in full_text:
+            header = ERN_FIRST_HEADER_RE.match(full_text)
+            if header and not header.group('ern_closed') and full_text.find('(MU', 1) != -1:
+                header = None
+        if header and not NAME_KEYWORD_RE.search(header.group('name')):
+            student['seat_no'] = header.group('seat')
+            student['full_name'] = ' '.join(header.group('name').split())
+            student['ern'] = 'MU' + header.group('ern')
+            student['status'] = header.group('status')
+            student['gender'] = header.group('gender')[0]  # M or F
+            college_match = header
+        else:
+            college_match = self._search_student_fields(full_text, student)
         
-        # Extract college code and name
-        college_match = re.search(r'\) MU-(\d+): (.+?) E1', full_text, re.DOTALL)
         if college_match:
-            student['college_code'] = 'MU-' + college_match.group(1)
-    
+            student['college_code'] = 'MU-' + college_match.group('college_code')
+            
             # Remove everything from first digit onwards OR "MAR" onwards (grade markers)
-            college_name_raw = college_match.group(2)
-            college_name_clean = re.sub(r'\s*(?:\d.*|MAR.*)$', '', college_name_raw)
+            college_name_clean = college_match.group('college_name')
+            tail_match = COLLEGE_TAIL_RE.search(college_name_clean)
+            if tail_match:
+                college_name_clean = college_name_clean[:tail_match.start()]
             # Remove all symbols except '&' and ',' and all digits from anywhere
-            college_name_clean = re.sub(r'[^a-zA-Z\s&,]', '', college_name_clean)
-            student['college_name'] = ' '.join(college_name_clean.split()).strip()
+            college_name_clean = COLLEGE_SYMBOLS_RE.sub('', college_name_clean)
+            student['college_name'] = ' '.join(college_name_clean.split())
         else:
-            # Fallback: Try matching without leading ") "
-            college_match = re.search(r'MU-(\d+): (.+?) E1', full_text, re.DOTALL)
-            if college_match:
-                student['college_code'] = 'MU-' + college_match.group(1)
-                college_name_raw = college_match.group(2)
-                college_name_clean = re.sub(r'\s*(?:\d.*|MAR.*)$', '', college_name_raw)
-                # Remove all symbols except '&' and ',' and all digits from anywhere
-                college_name_clean = re.sub(r'[^a-zA-Z\s&,]', '', college_name_clean)
-                student['college_name'] = ' '.join(college_name_clean.split()).strip()
-            else:
-                # Debug: Log when college match fails
-                self.logger.warning(
-                    f"College match FAILED for student on page {page_number}, index {student_index}\n"
-                    f"ERN: {student.get('ern')}\n"
-                    f"Seat: {student.get('seat_no')}\n"
-                    f"Full text excerpt (200 chars around ERN):\n"
-                    f"...{full_text[max(0, full_text.find(student.get('ern', 'X'))-100):full_text.find(student.get('ern', 'X'))+100]}..."
-                )
-
-        # Extract result (PASS/FAIL) - look for keywords in full text
-        if 'PASS' in full_text or 'PAS' in full_text:
+            # Debug: Log when college match fails (ERN may be missing too)
+            ern_pos = full_text.find(student['ern']) if student['ern'] else 0
+            self.logger.warning(
+                f"College match FAILED for student on page {page_number}, index {student_index}\n"
+                f"ERN: {student.get('ern')}\n"
+                f"Seat: {student.get('seat_no')}\n"
+                f"Full text excerpt (200 chars around ERN):\n"
+                f"...{full_text[max(0, ern_pos-100):ern_pos+100]}..."
+            )
+        
+        # Extract result (PASS/FAIL) - keywords anywhere in the block, PASS wins
+        if 'PAS' in full_text:
             student['result'] = 'PASS'
-        elif 'FAIL' in full_text or 'FAI' in full_text:
+        elif 'FAI' in full_text:
             student['result'] = 'FAIL'
         
         # Validation - require essential fields
@@ -215,58 +268,127 @@ class SimpleStudentExtractor:
         
         return student
     
-    def process_pdf(self) -> Dict:
+    def _search_student_fields(self, full_text: str, student: Dict):
         """
-        Process PDF and extract all student basic information.
+        Fill seat, name, ERN, status and gender with one search per field.
         
+        Used for blocks without a standard header (college printed away from
+        the ERN, missing status or gender, ...). Every field is the first
+        occurrence anywhere in the block.
+        
+        Args:
+            full_text: Block text joined into one line
+            student: Student dict to fill in
+            
         Returns:
-            Dict with: exam_metadata, students (list)
+            College match (groups 'college_code', 'college_name') or None
         """
-        self.logger.info(f"Processing PDF: {self.pdf_path}")
+        seat_match = SEAT_RE.search(full_text)
+        if seat_match:
+            student['seat_no'] = seat_match.group(1)
+            # Extract name (everything after seat number until status/gender keyword)
+            student['full_name'] = ' '.join(seat_match.group(2).split())  # Normalize whitespace
         
+        ern_match = ERN_CLOSED_RE.search(full_text) or ERN_OPEN_RE.search(full_text)
+        if ern_match:
+            student['ern'] = 'MU' + ern_match.group(1)
+        
+        status_match = STATUS_RE.search(full_text)
+        if status_match:
+            student['status'] = status_match.group(1)
+        
+        gender_match = GENDER_RE.search(full_text)
+        if gender_match:
+            student['gender'] = gender_match.group(1)[0]  # M or F
+        
+        # Prefer the college right after the ERN, fall back to any "MU-code:"
+        return COLLEGE_AFTER_ERN_RE.search(full_text) or COLLEGE_RE.search(full_text)
+    
+    def parse_page_texts(self, page_texts: List[str]) -> Dict:
+        """
+        Extract exam metadata and all students from already extracted page texts.
+        
+        Args:
+            page_texts: Text of each page, as returned by the text backend
+            
+        Returns:
+            Dict with: exam_metadata, students (list)
+        """
         all_students = []
-        exam_metadata = {}
         
-        try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                self.logger.info(f"PDF has {len(pdf.pages)} pages")
-                
-                # Extract exam metadata from first page
-                exam_metadata = self.extract_exam_metadata(pdf.pages)
-                self.logger.info(f"Exam: {exam_metadata.get('exam_title', 'Unknown')}")
-                
-                # Process each page
-                for page_num, page in enumerate(pdf.pages):
-                    page_text = page.extract_text()
-                    if not page_text:
-                        continue
-                    
-                    # Skip index pages
-                    if self.is_index_page(page_text):
-                        self.logger.debug(f"Page {page_num + 1} is an index page, skipping")
-                        continue
-                    
-                    # Count students on page
-                    student_count = self.count_students_on_page(page_text)
-                    self.logger.info(f"Page {page_num + 1}: Found {student_count} students")
-                    
-                    # Extract student blocks
-                    blocks = self.find_student_blocks(page_text)
-                    
-                    # Process each student block
-                    for student_index, block in enumerate(blocks):
-                        student = self.extract_student_basic_info(block, page_num, student_index)
-                        if student:
-                            all_students.append(student)
-                            self.logger.debug(f"  Student {student_index + 1}: {student['seat_no']} - {student['full_name']}")
-                
-                self.logger.info(f"Total students extracted: {len(all_students)}")
+        # Extract exam metadata from first page
+        exam_metadata = self.extract_exam_metadata(page_texts)
+        self.logger.info("Exam: %s", exam_metadata.get('exam_title', 'Unknown'))
         
-        except Exception as e:
-            self.logger.error(f"Error processing PDF: {e}")
-            raise
+        # Process each page
+        for page_num, page_text in enumerate(page_texts):
+            if not page_text:
+                continue
+            
+            # Per-page diagnostics only when DEBUG is on or the page is traced
+            log = pdf_page_logger(self.pdf_path, page_num, logger=self.logger)
+            
+            # Skip index pages
+            if self.is_index_page(page_text):
+                if log:
+                    log.debug("Page %d is an index page, skipping", page_num + 1)
+                continue
+            
+            # Count students on page
+            if log:
+                log.debug("Page %d: Found %d students", page_num + 1,
+                          self.count_students_on_page(page_text))
+            
+            # Extract student blocks
+            blocks = self.find_student_blocks(page_text)
+            
+            # Process each student block
+            for student_index, block in enumerate(blocks):
+                if log is TRACE_LOGGER:
+                    log.debug("  Block %d text:\n%s", student_index + 1, block)
+                student = self.extract_student_basic_info(block, page_num, student_index)
+                if student:
+                    all_students.append(student)
+                if log:
+                    log.debug("  Student %d: %s", student_index + 1, student)
+        
+        self.logger.info("Total students extracted: %d", len(all_students))
         
         return {
             'exam_metadata': exam_metadata,
             'students': all_students
         }
+    
+    def process_pdf(self, timer: Optional[StageTimer] = None) -> Dict:
+        """
+        Process PDF and extract all student basic information.
+        
+        Args:
+            timer: Optional StageTimer receiving the text_extraction and
+                   block_parsing times and the page/student counts
+        
+        Returns:
+            Dict with: exam_metadata, students (list)
+        """
+        self.logger.info(f"Processing PDF: {self.pdf_path}")
+        if timer is None:
+            timer = StageTimer()
+        
+        try:
+            with timer.stage('text_extraction'):
+                if self.text_cache is not None:
+                    page_texts = self.text_cache.get_or_extract(self.pdf_path, self.text_backend)
+                else:
+                    page_texts = self.text_backend.extract_page_texts(self.pdf_path)
+            self.logger.info(f"PDF has {len(page_texts)} pages ({self.text_backend.name} backend)")
+            
+            with timer.stage('block_parsing'):
+                extracted = self.parse_page_texts(page_texts)
+            timer.count('pages', len(page_texts))
+            timer.count('students', len(extracted['students']))
+            
+            return extracted
+        
+        except Exception as e:
+            self.logger.error(f"Error processing PDF: {e}")
+            raise
@@ -5,6 +5,19 @@ Database Initialization for Mumbai University Grade Records
 
 Creates SQLite database and tables if they don't exist.
 
+Every connection gets the performance profile in SQLITE_PRAGMAS:
+- journal_mode=WAL: readers (exports, statistics) do not block the writer
+- synchronous=NORMAL: no fsync per commit (safe with WAL; a power loss
+  can only drop the last commits, never corrupt the database)
+- cache_size/mmap_size: 64 MB page cache and 256 MB memory-mapped I/O
+- temp_store=MEMORY: sorts and temporary B-trees stay in memory
+
+Read-only services use create_readonly_engine(): a pool of connections
+opened with mode=ro and query_only, with the same cache settings.
+
+Existing databases are migrated in place: missing columns and indexes are
+added, and query planner statistics are refreshed (PRAGMA optimize).
+
 Usage:
     from init_db import init_database
     session = init_database('grade_records.db')
@@ -16,9 +29,89 @@ Version: 1.0
 """
 
 import os
-from sqlalchemy import create_engine
+from typing import List
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from models import Base, Program, Examination, Student, StudentExamRecord
+from sqlalchemy.pool import QueuePool
+from models import Base, Program, Examination, Student, StudentExamRecord, PdfManifest
+
+
+# Applied to every new SQLite connection (see create_db_engine)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64 * 1024,  # KiB (negative = size, not pages)
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Pragmas of read-only connections (journal mode and sync are the writer's)
+SQLITE_READONLY_PRAGMAS = {
+    'query_only': 'ON',
+    'cache_size': SQLITE_PRAGMAS['cache_size'],
+    'mmap_size': SQLITE_PRAGMAS['mmap_size'],
+    'temp_store': SQLITE_PRAGMAS['temp_store'],
+}
+
+
+def _apply_pragmas(engine: Engine, pragmas: dict):
+    """Run the given pragmas on every new connection of engine"""
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def create_db_engine(db_path: str = 'grade_records.db') -> Engine:
+    """
+    Create an SQLite engine applying SQLITE_PRAGMAS on connect.
+    
+    Args:
+        db_path: Path to SQLite database file
+        
+    Returns:
+        SQLAlchemy engine
+    """
+    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+    _apply_pragmas(engine, SQLITE_PRAGMAS)
+    return engine
+
+
+def create_readonly_engine(db_path: str = 'grade_records.db', pool_size: int = 8) -> Engine:
+    """
+    Create a pooled read-only SQLite engine (for query services).
+    
+    Connections are opened with mode=ro and PRAGMA query_only, so no
+    statement can modify the database, and may be used from any thread
+    (one at a time, as handed out by the pool). With WAL, readers see the
+    last committed state while an ingest is writing.
+    
+    Args:
+        db_path: Path to an existing SQLite database file
+        pool_size: Connections kept open in the pool
+        
+    Returns:
+        SQLAlchemy engine
+        
+    Raises:
+        FileNotFoundError: Database does not exist
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+    
+    engine = create_engine(
+        f'sqlite:///file:{os.path.abspath(db_path)}?mode=ro&uri=true',
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=pool_size,
+        connect_args={'check_same_thread': False},
+    )
+    _apply_pragmas(engine, SQLITE_READONLY_PRAGMAS)
+    return engine
 
 
 def init_database(db_path: str = 'grade_records.db') -> Session:
@@ -32,17 +125,23 @@ def init_database(db_path: str = 'grade_records.db') -> Session:
         SQLAlchemy session object
     """
     # Create engine
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+    engine = create_db_engine(db_path)
     
     # Create all tables
     Base.metadata.create_all(engine)
     
+    # Add columns and indexes introduced after the database was created
+    migrated = migrate_database(engine)
+    
     print(f"Database initialized: {os.path.abspath(db_path)}")
     print("Tables created:")
     print("  - programs")
     print("  - examinations")
     print("  - students")
     print("  - student_exam_records")
+    print("  - pdf_manifest")
+    for item in migrated:
+        print(f"Migrated: added {item}")
     
     # Create session factory
     Session = sessionmaker(bind=engine)
@@ -51,6 +150,47 @@ def init_database(db_path: str = 'grade_records.db') -> Session:
     return session
 
 
+def migrate_database(engine: Engine) -> List[str]:
+    """
+    Add model columns and indexes that are missing from existing tables.
+    
+    create_all() only creates missing tables, so databases created by an
+    older version lack newly added (nullable) columns and indexes. SQLite
+    supports ALTER TABLE ADD COLUMN for these columns. Query planner
+    statistics are refreshed afterwards (PRAGMA optimize).
+    
+    Args:
+        engine: SQLAlchemy engine
+        
+    Returns:
+        List of additions as "column table.column" or "index name"
+    """
+    inspector = inspect(engine)
+    added = []
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {col['name'] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'
+                ))
+                added.append(f"column {table.name}.{column.name}")
+            
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+                    added.append(f"index {index.name}")
+        
+        conn.execute(text('PRAGMA optimize'))
+    
+    return added
+
+
 def get_database_session(db_path: str = 'grade_records.db') -> Session:
     """
     Get database session (without recreating tables).
@@ -61,7 +201,7 @@ def get_database_session(db_path: str = 'grade_records.db') -> Session:
     Returns:
         SQLAlchemy session object
     """
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+    engine = create_db_engine(db_path)
     Session = sessionmaker(bind=engine)
     return Session()
 
@@ -0,0 +1,219 @@
+"""
+=============================================================================
+Separator Layout Cache for Mumbai University Grade Records
+=============================================================================
+
+Pages of a register share one layout, and the per-student methods
+(crop_single_student()) detect the separators of a page once per student.
+This module learns the separator template of each layout and remembers the
+result of every page.
+
+Layout cache (SeparatorLayoutCache):
+- Keyed by PDF (path, size, mtime) and page geometry (size, rotation,
+  transformation matrix)
+- Learning: pages of a layout get full detection until one set of lines
+  has been seen on LEARN_PAGES pages; that set becomes the layout's
+  template. Separator heights follow the content of each page, so pages
+  differing from it are expected. A layout without a repeated set in its
+  first LEARN_LIMIT pages is rejected (full detection from then on).
+- Trusted layouts: the separator items of a page's get_cdrawings() output
+  are checked against the template (match()). A page whose lines are the
+  template's lines, each within TOLERANCE, is taken from the check; any
+  other page gets full detection.
+- Results are memoized per page (lookup()), so cropping several students
+  from a page one at a time detects its lines once.
+
+Lines are compared as detection reports them before deduplication. The
+drawings still have to be read for every page (get_cdrawings() is nearly
+all of the detection time), so the cache saves repeated detections of a
+page, not the first one.
+
+Callers detecting many pages at once (detect_horizontal_lines_batch) must
+call learn() for a page before matching the next one while
+needs_learning() is True; other pages can be learned afterwards.
+
+Usage:
+    cache = SeparatorLayoutCache()
+    for page in doc:
+        boundaries = PdfProcessor.detect_student_boundaries(page, layout_cache=cache)
+    print(cache.stats)
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class SeparatorLayoutCache:
+    """Learns the separator template of each page layout and memoizes page results"""
+
+    LEARN_PAGES = 2
+    LEARN_LIMIT = 20
+    TOLERANCE = 0.5
+    MAX_PAGES = 256
+
+    def __init__(self, learn_pages: int = LEARN_PAGES, learn_limit: int = LEARN_LIMIT,
+                 tolerance: float = TOLERANCE, max_pages: int = MAX_PAGES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            learn_pages: Pages with the same lines needed before these lines
+                         become the layout's template
+            learn_limit: Pages per layout detected while learning before the
+                         layout is rejected
+            tolerance: Maximum distance in points between a page line and
+                       the template line it matches
+            max_pages: Per-page results kept for repeated lookups
+        """
+        self.learn_pages = learn_pages
+        self.learn_limit = learn_limit
+        self.tolerance = tolerance
+        self.max_pages = max_pages
+        self.layouts: Dict[tuple, Dict] = {}
+        self.pages: 'OrderedDict[tuple, List[float]]' = OrderedDict()
+        self._last_lookup = None  # (page, layout key) of the last lookup()
+        self.stats = {
+            'page_hits': 0,
+            'pages_matched': 0,
+            'pages_detected': 0,
+            'mismatches': 0,
+            'layouts_trusted': 0,
+            'layouts_rejected': 0,
+        }
+
+    @staticmethod
+    def layout_key(page) -> tuple:
+        """Cache key of a page's layout: its PDF file and page geometry"""
+        pdf_path = page.parent.name
+        try:
+            stat = os.stat(pdf_path)
+            pdf_id = (pdf_path, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            # In-memory document: only valid for this document object
+            pdf_id = (pdf_path, id(page.parent))
+        rect = page.rect
+        return pdf_id + ((rect.width, rect.height), page.rotation,
+                         tuple(page.transformation_matrix))
+
+    def _page_layout_key(self, page) -> tuple:
+        """Layout key of a page, reusing the one lookup() just computed for it"""
+        if self._last_lookup is not None and self._last_lookup[0] is page:
+            return self._last_lookup[1]
+        return self.layout_key(page)
+
+    def lookup(self, page, min_line_length: float) -> Optional[List[float]]:
+        """
+        Lines of a page detected or matched before, if still cached.
+
+        Args:
+            page: PyMuPDF page object
+            min_line_length: Minimum line length in points
+
+        Returns:
+            Sorted Y-coordinates before deduplication, or None
+        """
+        layout_key = self.layout_key(page)
+        self._last_lookup = (page, layout_key)
+        page_key = (layout_key, page.number, min_line_length)
+        lines = self.pages.get(page_key)
+        if lines is None:
+            return None
+        self.pages.move_to_end(page_key)
+        self.stats['page_hits'] += 1
+        return list(lines)
+
+    def match(self, page, min_line_length: float,
+              segments: List[Tuple[float, ...]]) -> Optional[List[float]]:
+        """
+        Check a page's separator items against its layout's template.
+
+        Args:
+            page: PyMuPDF page object
+            min_line_length: Minimum line length in points
+            segments: (x0, y0, x1, y1) of the page's candidate items
+                      (PdfProcessor._line_segments of its get_cdrawings())
+
+        Returns:
+            The page's sorted Y-coordinates before deduplication if they
+            match the template, or None if the page needs full detection
+            (followed by learn())
+        """
+        layout_key = self._page_layout_key(page)
+        layout = self.layouts.get((layout_key, min_line_length))
+        if layout is None or layout['status'] != 'trusted':
+            return None
+
+        lines = sorted((y0 + y1) / 2 for x0, y0, x1, y1 in segments
+                       if abs(y1 - y0) < 3 and abs(x1 - x0) >= min_line_length)
+        if not self._fits(lines, layout['template']):
+            self.stats['mismatches'] += 1
+            return None
+
+        self.stats['pages_matched'] += 1
+        self._remember((layout_key, page.number, min_line_length), lines)
+        return lines
+
+    def needs_learning(self, page, min_line_length: float) -> bool:
+        """
+        Whether later matches depend on learn() for this page.
+
+        True while the page's layout is still learning its template, so
+        learn() must run before the next page of the layout is matched.
+
+        Args:
+            page: PyMuPDF page object
+            min_line_length: Minimum line length in points
+        """
+        layout = self.layouts.get((self._page_layout_key(page), min_line_length))
+        return layout is None or layout['status'] == 'learning'
+
+    def learn(self, page, min_line_length: float, lines: List[float]):
+        """
+        Record the result of full detection after match() returned None.
+
+        Args:
+            page: PyMuPDF page object
+            min_line_length: Minimum line length in points
+            lines: Sorted Y-coordinates from full detection, before deduplication
+        """
+        layout_key = self._page_layout_key(page)
+        self.stats['pages_detected'] += 1
+        self._remember((layout_key, page.number, min_line_length), lines)
+
+        layout = self.layouts.setdefault(
+            (layout_key, min_line_length),
+            {'status': 'learning', 'line_sets': {}, 'pages': 0}
+        )
+        if layout['status'] != 'learning':
+            return
+
+        # Pages of one layout report identical coordinates for the same rules
+        line_sets = layout['line_sets']
+        line_set = tuple(lines)
+        line_sets[line_set] = line_sets.get(line_set, 0) + 1
+        layout['pages'] += 1
+        if line_sets[line_set] >= self.learn_pages:
+            layout.update(status='trusted', template=list(lines), line_sets=None)
+            self.stats['layouts_trusted'] += 1
+        elif layout['pages'] >= self.learn_limit:
+            layout.update(status='rejected', line_sets=None)
+            self.stats['layouts_rejected'] += 1
+
+    def _fits(self, lines: List[float], template: List[float]) -> bool:
+        """Whether lines are the template's lines, each within the tolerance"""
+        return len(lines) == len(template) and all(
+            abs(y - expected) <= self.tolerance for y, expected in zip(lines, template)
+        )
+
+    def _remember(self, page_key: tuple, lines: List[float]):
+        """Keep a page result, evicting the least recently used"""
+        self.pages[page_key] = list(lines)
+        self.pages.move_to_end(page_key)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
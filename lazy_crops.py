@@ -0,0 +1,258 @@
+"""
+=============================================================================
+On-Demand Crop Rendering for Mumbai University Grade Records
+=============================================================================
+
+Alternative to writing a cropped PDF for every student at ingest time
+(most are never opened): with run_batch.py --output-mode lazy, the
+database stores a crop descriptor in student_exam_records.pdf_file, and
+the record is cropped or rendered only when someone asks for it.
+
+Descriptor format (absolute source path, 1-based page, crop bounds in points):
+    /data/downloads/register.pdf#page=12&crop=80.7869873046875,704.7030029296875
+
+CropRenderer turns any stored pdf_file value into a record:
+- Crop descriptors: cropped from the source PDF, the same output as the
+  eager crop (PdfProcessor.crop_students_single_pass())
+- Bundle references ("bundle#page=N", record_bundle.py): that bundle page
+- Plain paths: the single-record PDF itself
+as PDF bytes (record_pdf) or PNG bytes (record_png).
+
+Caches:
+- Open fitz documents, least recently used closed beyond max_documents
+- Rendered outputs (PDF and PNG bytes), least recently used evicted once
+  their total size exceeds max_cache_mb
+
+Source PDFs must stay where they were ingested from. Their path is stored
+absolute, so records open from any working directory. When a source PDF
+changes, the ingest manifest reprocesses it on the next run and replaces
+its records (and their descriptors).
+
+Usage:
+    renderer = CropRenderer(max_documents=16, max_cache_mb=64)
+    pdf_bytes = renderer.record_pdf(record.pdf_file)
+    png_bytes = renderer.record_png(record.pdf_file, dpi=150)
+    print(renderer.stats)
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from record_bundle import parse_record_ref
+
+CROP_FRAGMENT = '&crop='
+
+CropDescriptor = namedtuple('CropDescriptor', ['pdf_path', 'page', 'y_top', 'y_bottom'])
+CropDescriptor.__doc__ = "Crop of a source PDF page (page is 0-based, bounds in points)"
+
+
+def make_descriptor(pdf_path: str, page: int, y_top: float, y_bottom: float) -> str:
+    """
+    Crop descriptor stored in student_exam_records.pdf_file.
+
+    Args:
+        pdf_path: Source PDF path (stored absolute)
+        page: Page number (0-indexed)
+        y_top: Top crop bound in points
+        y_bottom: Bottom crop bound in points
+
+    Returns:
+        Descriptor string (bounds kept at full float precision)
+    """
+    return f"{os.path.abspath(pdf_path)}#page={page + 1}{CROP_FRAGMENT}{y_top!r},{y_bottom!r}"
+
+
+def parse_descriptor(ref: str) -> Optional[CropDescriptor]:
+    """
+    Parse a crop descriptor.
+
+    Args:
+        ref: student_exam_records.pdf_file value
+
+    Returns:
+        CropDescriptor, or None if ref is not a crop descriptor
+    """
+    base, separator, bounds = ref.rpartition(CROP_FRAGMENT)
+    if not separator:
+        return None
+    pdf_path, page = parse_record_ref(base)
+    try:
+        y_top, y_bottom = (float(value) for value in bounds.split(','))
+    except ValueError:
+        return None
+    if page is None:
+        return None
+    return CropDescriptor(pdf_path, page - 1, y_top, y_bottom)
+
+
+class CropRenderer:
+    """Produces record PDFs/PNGs on request, with LRU caches (thread-safe)"""
+
+    DEFAULT_MAX_DOCUMENTS = 16
+    DEFAULT_MAX_CACHE_MB = 64
+    DEFAULT_DPI = 150
+
+    def __init__(self, max_documents: int = DEFAULT_MAX_DOCUMENTS,
+                 max_cache_mb: float = DEFAULT_MAX_CACHE_MB):
+        """
+        Initialize renderer.
+
+        Args:
+            max_documents: Open fitz documents kept
+            max_cache_mb: Maximum total size of cached outputs in megabytes
+                          (0 = no output cache)
+        """
+        self.max_documents = max(1, max_documents)
+        self.max_cache_bytes = int(max_cache_mb * 1024 * 1024)
+        # path -> (file signature, open document)
+        self._documents: 'OrderedDict[str, Tuple[tuple, fitz.Document]]' = OrderedDict()
+        self._outputs: 'OrderedDict[tuple, bytes]' = OrderedDict()
+        self._cache_bytes = 0
+        # fitz documents must not be used from two threads at once
+        self._lock = threading.RLock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'documents_opened': 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def record_pdf(self, ref: str) -> bytes:
+        """
+        PDF bytes of a record.
+
+        Args:
+            ref: Crop descriptor, bundle reference or single-record PDF path
+
+        Returns:
+            Single-page PDF of the record
+        """
+        return self._cached(('pdf', ref), ref, lambda: self._make_pdf(ref))
+
+    def record_png(self, ref: str, dpi: int = DEFAULT_DPI) -> bytes:
+        """
+        PNG bytes of a record.
+
+        Args:
+            ref: Crop descriptor, bundle reference or single-record PDF path
+            dpi: Rendering resolution
+
+        Returns:
+            PNG image of the record
+        """
+        return self._cached(('png', ref, dpi), ref, lambda: self._make_png(ref, dpi))
+
+    def clear(self):
+        """Close all documents and drop all cached outputs"""
+        with self._lock:
+            for _, doc in self._documents.values():
+                doc.close()
+            self._documents.clear()
+            self._outputs.clear()
+            self._cache_bytes = 0
+
+    @property
+    def cache_bytes(self) -> int:
+        """Total size of the cached outputs"""
+        return self._cache_bytes
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+
+    def _record_page(self, ref: str) -> fitz.Page:
+        """Page of the record, with its cropbox set (call with the lock held)"""
+        descriptor = parse_descriptor(ref)
+        if descriptor is not None:
+            page = self._document(descriptor.pdf_path)[descriptor.page]
+            page.set_cropbox(fitz.Rect(0, descriptor.y_top, page.rect.width, descriptor.y_bottom))
+            return page
+
+        path, page_number = parse_record_ref(ref)
+        return self._document(path)[(page_number or 1) - 1]
+
+    def _make_pdf(self, ref: str) -> bytes:
+        if parse_descriptor(ref) is None and parse_record_ref(ref)[1] is None:
+            with open(ref, 'rb') as f:
+                return f.read()
+
+        page = self._record_page(ref)
+        with fitz.open() as output_doc:
+            output_doc.insert_pdf(page.parent, from_page=page.number, to_page=page.number)
+            return output_doc.tobytes()
+
+    def _make_png(self, ref: str, dpi: int) -> bytes:
+        return self._record_page(ref).get_pixmap(dpi=dpi).tobytes('png')
+
+    # -------------------------------------------------------------------------
+    # Caches
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _file_signature(path: str) -> tuple:
+        """Size and mtime of a file: cached data of an older version is not reused"""
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    def _file_path(ref: str) -> str:
+        """File a record reference points to"""
+        descriptor = parse_descriptor(ref)
+        return descriptor.pdf_path if descriptor else parse_record_ref(ref)[0]
+
+    def _cached(self, key: tuple, ref: str, make) -> bytes:
+        """Cached output for key, made (and cached) on a miss"""
+        with self._lock:
+            key += self._file_signature(self._file_path(ref))
+            data = self._outputs.get(key)
+            if data is not None:
+                self._outputs.move_to_end(key)
+                self.stats['hits'] += 1
+                return data
+
+            self.stats['misses'] += 1
+            data = make()
+
+            if len(data) <= self.max_cache_bytes:
+                self._outputs[key] = data
+                self._cache_bytes += len(data)
+                while self._cache_bytes > self.max_cache_bytes:
+                    _, evicted = self._outputs.popitem(last=False)
+                    self._cache_bytes -= len(evicted)
+                    self.stats['evictions'] += 1
+            return data
+
+    def _document(self, path: str) -> fitz.Document:
+        """Open document for path (call with the lock held)"""
+        path = os.path.abspath(path)
+        signature = self._file_signature(path)
+        cached = self._documents.get(path)
+        if cached is not None:
+            if cached[0] == signature:
+                self._documents.move_to_end(path)
+                return cached[1]
+            # Replaced on disk since it was opened
+            del self._documents[path]
+            cached[1].close()
+
+        doc = fitz.open(path)
+        self.stats['documents_opened'] += 1
+        self._documents[path] = (signature, doc)
+        while len(self._documents) > self.max_documents:
+            _, (_, closed) = self._documents.popitem(last=False)
+            closed.close()
+        return doc
+
@@ -0,0 +1,177 @@
+"""
+=============================================================================
+Ingest Manifest for Mumbai University Grade Records
+=============================================================================
+
+Tracks which source PDFs have already been ingested so batch runs only
+process new or changed files.
+
+For every processed PDF the pdf_manifest table stores its SHA-256, size,
+mtime and the extractor/cropper versions used. On the next run:
+- Same size and mtime and same versions  -> unchanged (no hashing needed)
+- Size/mtime differ but same SHA-256      -> unchanged (mtime refreshed)
+- Different SHA-256 or versions           -> changed (old rows replaced)
+- No manifest entry                       -> new
+
+Usage:
+    manifest = IngestManifest(session)
+    status = manifest.check(pdf_path)   # 'new', 'changed' or 'unchanged'
+    if status == 'changed':
+        manifest.purge(pdf_path)
+    ...
+    manifest.record(pdf_path, exam_id, record_count)
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+
+from models import PdfManifest, StudentExamRecord
+from extract_simple import SimpleStudentExtractor
+from pdf_processor import PdfProcessor
+from lazy_crops import parse_descriptor
+from record_bundle import index_path_for, parse_record_ref
+from text_backends import get_text_backend, DEFAULT_TEXT_BACKEND
+from text_cache import PageTextCache
+
+
+class IngestManifest:
+    """Content-hash manifest of ingested source PDFs"""
+
+    STATUS_NEW = 'new'
+    STATUS_CHANGED = 'changed'
+    STATUS_UNCHANGED = 'unchanged'
+
+    def __init__(self, db_session: Session, text_backend: str = DEFAULT_TEXT_BACKEND):
+        """
+        Initialize manifest.
+
+        Args:
+            db_session: SQLAlchemy database session
+            text_backend: Text backend used by the extractor (part of its version)
+        """
+        self.db_session = db_session
+        backend = get_text_backend(text_backend)
+        self.extractor_version = f"{SimpleStudentExtractor.VERSION}-{backend.name}-{backend.VERSION}"
+        self.cropper_version = PdfProcessor.VERSION
+
+        # Hashes computed during this run, keyed by PDF path
+        self._hashes: Dict[str, str] = {}
+        self._entries: Optional[Dict[str, PdfManifest]] = None
+
+    def _sha256(self, pdf_path: str) -> str:
+        """SHA-256 of a file, cached for the lifetime of this manifest"""
+        if pdf_path not in self._hashes:
+            self._hashes[pdf_path] = PageTextCache.file_sha256(pdf_path)
+        return self._hashes[pdf_path]
+
+    def get_entry(self, pdf_path: str) -> Optional[PdfManifest]:
+        """Get the manifest entry for a PDF (all entries are loaded in one query)"""
+        if self._entries is None:
+            self._entries = {
+                entry.pdf_filename: entry
+                for entry in self.db_session.query(PdfManifest).all()
+            }
+        return self._entries.get(os.path.basename(pdf_path))
+
+    def check(self, pdf_path: str) -> str:
+        """
+        Compare a PDF against its manifest entry.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            'new', 'changed' or 'unchanged'
+        """
+        entry = self.get_entry(pdf_path)
+        if entry is None:
+            return self.STATUS_NEW
+
+        if (entry.extractor_version != self.extractor_version or
+                entry.cropper_version != self.cropper_version):
+            return self.STATUS_CHANGED
+
+        stat = os.stat(pdf_path)
+        if entry.file_size == stat.st_size and entry.mtime == stat.st_mtime:
+            return self.STATUS_UNCHANGED
+
+        if entry.sha256 == self._sha256(pdf_path):
+            # Touched but identical content: refresh stat info
+            entry.file_size = stat.st_size
+            entry.mtime = stat.st_mtime
+            self.db_session.commit()
+            return self.STATUS_UNCHANGED
+
+        return self.STATUS_CHANGED
+
+    def purge(self, pdf_path: str) -> int:
+        """
+        Delete records previously ingested from a PDF and their cropped files
+        (or record bundle).
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            Number of records deleted
+        """
+        source_pdf = os.path.basename(pdf_path)
+        records = self.db_session.query(
+            StudentExamRecord.id, StudentExamRecord.pdf_file
+        ).filter(StudentExamRecord.source_pdf == source_pdf).all()
+
+        if not records:
+            return 0
+
+        self.db_session.query(StudentExamRecord).filter(
+            StudentExamRecord.source_pdf == source_pdf
+        ).delete(synchronize_session=False)
+        self.db_session.commit()
+
+        # Bundled records share one bundle PDF and index ("bundle#page=N");
+        # lazy records point into the source PDF itself, which is kept
+        paths = set()
+        for _, pdf_file in records:
+            if pdf_file and parse_descriptor(pdf_file) is None:
+                path, page = parse_record_ref(pdf_file)
+                paths.add(path)
+                if page is not None:
+                    paths.add(index_path_for(path))
+
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+        return len(records)
+
+    def record(self, pdf_path: str, exam_id: Optional[int], record_count: int):
+        """
+        Store the fingerprint of a processed PDF.
+
+        Args:
+            pdf_path: Path to PDF file
+            exam_id: Examination the PDF was ingested into (None if no students)
+            record_count: Number of records created from the PDF
+        """
+        stat = os.stat(pdf_path)
+        entry = self.get_entry(pdf_path)
+
+        if entry is None:
+            entry = PdfManifest(pdf_filename=os.path.basename(pdf_path))
+            self.db_session.add(entry)
+            self._entries[entry.pdf_filename] = entry
+
+        entry.sha256 = self._sha256(pdf_path)
+        entry.file_size = stat.st_size
+        entry.mtime = stat.st_mtime
+        entry.extractor_version = self.extractor_version
+        entry.cropper_version = self.cropper_version
+        entry.exam_id = exam_id
+        entry.record_count = record_count
+        self.db_session.commit()
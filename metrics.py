@@ -0,0 +1,252 @@
+"""
+=============================================================================
+Pipeline Metrics for Mumbai University Grade Records
+=============================================================================
+
+Per-stage wall-clock timing for the batch pipeline, so a slow run can be
+traced to text extraction (pdfplumber/PyMuPDF), detection and cropping
+(fitz) or database writes (SQLite).
+
+Stages (in pipeline order):
+- metadata_load       Reading the metadata JSON of a PDF
+- text_extraction     Page text from the text backend (or the text cache)
+- block_parsing       Splitting pages into student blocks and parsing fields
+- boundary_detection  Separator line detection for student boundaries
+- crop_save           Cropping student records and saving their PDFs
+- db_flush            Program/examination lookups and bulk record writes
+
+A StageTimer collects the seconds spent in each stage for one PDF. It is a
+plain picklable object, so worker processes fill one in and return it.
+RunMetrics aggregates the timers of a batch run into per-stage totals and
+p50/p95/max latencies across PDFs, plus overall throughput.
+
+Usage:
+    timer = StageTimer()
+    with timer.stage('text_extraction'):
+        page_texts = backend.extract_page_texts(pdf_path)
+    timer.count('pages', len(page_texts))
+
+    metrics = RunMetrics()
+    metrics.add_pdf('register.pdf', timer)
+    metrics.finish()
+    metrics.write_json('student_records/logs/batch_metrics.json')
+    print('\\n'.join(metrics.format_report()))
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+STAGES = (
+    'metadata_load',
+    'text_extraction',
+    'block_parsing',
+    'boundary_detection',
+    'crop_save',
+    'db_flush',
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values (any order)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Percentile value, 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _stage_order(name: str):
+    """Sort key putting known stages in pipeline order, others after them"""
+    return (STAGES.index(name), '') if name in STAGES else (len(STAGES), name)
+
+
+class StageTimer:
+    """Seconds spent per pipeline stage (and item counts) for one PDF"""
+
+    def __init__(self):
+        """Initialize an empty timer"""
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and add it to a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        """Add seconds to a stage"""
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        """Add to an item counter (pages, students, crops, ...)"""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def merge(self, other: 'StageTimer'):
+        """Add the stage times and counts of another timer to this one"""
+        for name, seconds in other.seconds.items():
+            self.add(name, seconds)
+        for name, value in other.counts.items():
+            self.count(name, value)
+
+    @property
+    def total_seconds(self) -> float:
+        """Sum of all stage times"""
+        return sum(self.seconds.values())
+
+
+class RunMetrics:
+    """Per-PDF stage timers of one batch run, with aggregate statistics"""
+
+    def __init__(self):
+        """Initialize metrics; the run clock starts now"""
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.wall_seconds: Optional[float] = None
+        self.pdfs: Dict[str, StageTimer] = {}
+
+    def add_pdf(self, pdf_name: str, timer: StageTimer):
+        """
+        Record the stage timer of a processed PDF.
+
+        Args:
+            pdf_name: PDF file name
+            timer: Stage times and counts for the PDF
+        """
+        if pdf_name in self.pdfs:
+            self.pdfs[pdf_name].merge(timer)
+        else:
+            self.pdfs[pdf_name] = timer
+
+    def finish(self):
+        """Stop the run clock"""
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def total_count(self, name: str) -> int:
+        """Sum of an item counter over all PDFs"""
+        return sum(timer.counts.get(name, 0) for timer in self.pdfs.values())
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate each stage over the PDFs that went through it.
+
+        Returns:
+            {stage: {'pdfs', 'total_seconds', 'mean_seconds',
+                     'p50_seconds', 'p95_seconds', 'max_seconds'}}
+        """
+        names = sorted({name for timer in self.pdfs.values() for name in timer.seconds},
+                       key=_stage_order)
+
+        summary = {}
+        for name in names:
+            values = [timer.seconds[name] for timer in self.pdfs.values() if name in timer.seconds]
+            total = sum(values)
+            summary[name] = {
+                'pdfs': len(values),
+                'total_seconds': total,
+                'mean_seconds': total / len(values),
+                'p50_seconds': percentile(values, 50),
+                'p95_seconds': percentile(values, 95),
+                'max_seconds': max(values),
+            }
+        return summary
+
+    def to_dict(self) -> Dict:
+        """Full report: run totals, throughput, per-stage statistics and per-PDF times"""
+        wall = self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start
+        pages = self.total_count('pages')
+        students = self.total_count('students')
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_seconds': wall,
+            'pdfs': len(self.pdfs),
+            'pages': pages,
+            'students': students,
+            'pdfs_per_second': len(self.pdfs) / wall if wall > 0 else 0.0,
+            'pages_per_second': pages / wall if wall > 0 else 0.0,
+            'students_per_second': students / wall if wall > 0 else 0.0,
+            'stages': self.stage_summary(),
+            'per_pdf': {
+                pdf_name: {
+                    'seconds': {
+                        name: timer.seconds[name]
+                        for name in sorted(timer.seconds, key=_stage_order)
+                    },
+                    'total_seconds': timer.total_seconds,
+                    **timer.counts
+                }
+                for pdf_name, timer in self.pdfs.items()
+            },
+        }
+
+    def write_json(self, path: str):
+        """
+        Write the report as JSON.
+
+        Args:
+            path: Output file path (parent directory is created if missing)
+        """
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format_report(self) -> List[str]:
+        """
+        Human readable report, one string per line.
+
+        Returns:
+            Report lines (stage table with milliseconds per PDF, then throughput)
+        """
+        report = self.to_dict()
+        wall = report['wall_seconds']
+
+        lines = [
+            f"{'Stage':<20} {'PDFs':>5} {'Total s':>9} {'p50 ms':>9} "
+            f"{'p95 ms':>9} {'Max ms':>9} {'Share':>6}",
+            "-" * 72,
+        ]
+        stage_total = sum(stats['total_seconds'] for stats in report['stages'].values())
+        for name, stats in report['stages'].items():
+            share = stats['total_seconds'] / stage_total * 100 if stage_total > 0 else 0.0
+            lines.append(
+                f"{name:<20} {stats['pdfs']:>5} {stats['total_seconds']:>9.2f} "
+                f"{stats['p50_seconds'] * 1000:>9.1f} {stats['p95_seconds'] * 1000:>9.1f} "
+                f"{stats['max_seconds'] * 1000:>9.1f} {share:>5.1f}%"
+            )
+        lines.append("-" * 72)
+        lines.append(
+            f"Wall time: {wall:.2f}s for {report['pdfs']} PDF(s), "
+            f"{report['pages']} pages, {report['students']} students"
+        )
+        lines.append(
+            f"Throughput: {report['pdfs_per_second']:.2f} PDFs/s, "
+            f"{report['pages_per_second']:.1f} pages/s, "
+            f"{report['students_per_second']:.1f} students/s"
+        )
+        return lines
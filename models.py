@@ -9,7 +9,9 @@ Tables:
 - Program: Academic programs (BSc, BCom, etc.)
 - Examination: Exam sessions with metadata
 - Student: Student basic information
-- StudentExamRecord: Student performance in specific exam (with PDF path)
+- StudentExamRecord: Student performance in specific exam (with PDF path
+  and crop geometry)
+- PdfManifest: Fingerprints of ingested source PDFs (for incremental runs)
 
 Author: GitHub Copilot
 Date: 2026-02-09
@@ -17,7 +19,7 @@ Version: 1.0
 =============================================================================
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, UniqueConstraint, Text
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, UniqueConstraint, Index, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -94,17 +96,47 @@ class StudentExamRecord(Base):
     status = Column(String(50))  # "Regular", "ATKT", "Ex-Student", etc.
     result = Column(String(10))  # "PASS", "FAIL"
     page_number = Column(Integer)  # Page number in source PDF
+    student_index = Column(Integer)  # Position of the record on its page (0-indexed)
+    crop_y_top = Column(Float)  # Top crop bound in points (full page width)
+    crop_y_bottom = Column(Float)  # Bottom crop bound in points
     pdf_file = Column(String(500))  # Path to cropped student PDF
+    source_pdf = Column(String(300))  # Source PDF filename the record was ingested from
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationships
     student = relationship('Student', back_populates='exam_records')
     examination = relationship('Examination', back_populates='student_records')
     
-    # Unique constraint: one record per student per exam
+    # Unique constraint: one record per student per exam (its index also
+    # serves lookups by student_ern alone)
+    # Secondary indexes: per-exam pass/fail counts (covering), failed
+    # students, seat number and college lookups, purges by source PDF
     __table_args__ = (
         UniqueConstraint('student_ern', 'exam_id', name='unique_student_exam'),
+        Index('ix_records_exam_result', 'exam_id', 'result'),
+        Index('ix_records_result', 'result'),
+        Index('ix_records_seat_no', 'seat_no'),
+        Index('ix_records_college', 'college_code', 'result'),
+        Index('ix_records_source_pdf', 'source_pdf'),
     )
     
     def __repr__(self):
         return f"<StudentExamRecord(ern={self.student_ern}, exam_id={self.exam_id}, seat={self.seat_no}, result={self.result})>"
+
+
+class PdfManifest(Base):
+    """Fingerprint of an ingested source PDF, used to skip unchanged files"""
+    __tablename__ = 'pdf_manifest'
+    
+    pdf_filename = Column(String(300), primary_key=True)  # Source PDF filename
+    sha256 = Column(String(64), nullable=False)  # Content hash
+    file_size = Column(Integer, nullable=False)  # Size in bytes
+    mtime = Column(Float, nullable=False)  # Modification time (os.stat)
+    extractor_version = Column(String(40))  # SimpleStudentExtractor.VERSION + text backend
+    cropper_version = Column(String(20))  # PdfProcessor.VERSION
+    exam_id = Column(Integer, ForeignKey('examinations.id'))
+    record_count = Column(Integer, default=0)  # Records created from this PDF
+    processed_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    def __repr__(self):
+        return f"<PdfManifest(file={self.pdf_filename}, sha256={self.sha256[:12]}, records={self.record_count})>"
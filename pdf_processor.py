@@ -18,19 +18,32 @@ student records. It looks for:
 - 3 lines for pages with 2 students (top, middle, and bottom separators)
 
 The detection process:
-1. Scans page for horizontal vector graphics (lines/thin rectangles)
+1. Scans page for horizontal vector graphics (lines/thin rectangles) in the
+   raw page.get_cdrawings() output, skipping paths narrower than the threshold
 2. Filters lines longer than threshold (default 200 points)
 3. Groups nearby lines together (within 5 points)
 4. Interprets results to identify student boundaries
 
+Steps 2 and 3 run as NumPy array operations, over all pages of a document at
+once with detect_horizontal_lines_batch().
+
+With a layout cache, pages of a learned layout are checked against the
+layout's separator template after step 1, and repeated detections of a
+page are answered from the cache (see layout_cache.py).
+
 DEBUG OUTPUT:
 -------------
-All methods provide comprehensive debug output showing:
+Detection and cropping log comprehensive diagnostics at DEBUG level:
 - Line detection progress
 - Detected coordinates
 - Student boundary calculations
 - Success/failure status
 
+Diagnostics are off by default and cost nothing then (see diagnostics.py).
+They are written for a page traced with diagnostics.set_trace() (run_batch.py
+--trace-pdf/--trace-page), for debug=True, or when this module's logger is
+enabled for DEBUG. Errors are always logged.
+
 MAIN METHODS (Dynamic Detection):
 ----------------------------------
 # Crop single student (most common use case):
@@ -46,6 +59,17 @@ page_crops = [
 ]
 PdfProcessor.crop_multiple_students(pdf_path, page_crops)
 
+# Crop every student of a PDF with one open and one pass over the pages:
+result = PdfProcessor.crop_students_single_pass(pdf_path, page_crops)
+print(result['crops_per_second'])
+
+# Same, written as one multi-page PDF with an index (see record_bundle.py):
+result = PdfProcessor.crop_students_single_pass(pdf_path, page_crops,
+                                                bundle_path='out/exam.records.pdf')
+
+# Or only record crop descriptors, rendered on request (see lazy_crops.py):
+result = PdfProcessor.crop_students_single_pass(pdf_path, page_crops, lazy=True)
+
 LEGACY METHODS (Fixed Coordinates):
 ------------------------------------
 For backward compatibility, fixed-coordinate methods are available:
@@ -61,13 +85,27 @@ Version: 5.0 - Dynamic detection as default
 """
 
 import fitz  # PyMuPDF
+import numpy as np
 import os
+import time
+import logging
 from typing import List, Tuple, Optional, Dict
 
+from diagnostics import page_logger
+from layout_cache import SeparatorLayoutCache
+from lazy_crops import make_descriptor
+from record_bundle import record_ref, write_index
+from metrics import StageTimer
+
+logger = logging.getLogger(__name__)
+
 
 class PdfProcessor:
     """PDF processing class with fixed coordinates for student record cropping"""
     
+    # Bump when cropping changes so the ingest manifest re-processes PDFs
+    VERSION = '5.0'
+    
     # Fixed coordinates for student record cropping based on actual PDF layout analysis
     # Coordinates determined from visual analysis of sample grade cards
     STUDENT_BLOCK_COORDS = {
@@ -82,6 +120,10 @@ class PdfProcessor:
         ]
     }
     
+    # Separator lines of recently used pages, shared by the per-student methods
+    # (crop_single_student() is called once per student of a page)
+    LAYOUT_CACHE = SeparatorLayoutCache()
+    
     def __init__(self, input_path=None, output_path=None, rect_coords=None):
         """
         Initialize PDF processor.
@@ -110,102 +152,306 @@ class PdfProcessor:
         doc.close()
     
     @staticmethod
-    def detect_horizontal_lines(page, min_line_length: float = 100, debug: bool = True) -> List[float]:
+    def detect_horizontal_lines(page, min_line_length: float = 100,
+                                debug: Optional[bool] = None,
+                                layout_cache: Optional[SeparatorLayoutCache] = None) -> List[float]:
         """
         Detect horizontal separator lines on a PDF page using vector paths.
         
         Args:
             page: PyMuPDF page object
             min_line_length: Minimum length for a line to be considered (default 100 points)
-            debug: If True, print debug information
+            debug: True/False forces diagnostics on/off; None (default) logs them
+                   only for a traced page or when DEBUG logging is enabled
+            layout_cache: Reuse results and learned layouts (see layout_cache.py);
+                          pages with diagnostics always get full detection
             
         Returns:
             List of Y-coordinates of detected horizontal lines, sorted top to bottom
         """
+        log = page_logger(page, debug, logger)
+        if not log:
+            return PdfProcessor.detect_horizontal_lines_batch(
+                [page], min_line_length=min_line_length, debug=False, layout_cache=layout_cache
+            )[0]
+        
+        # With diagnostics: the same detection item by item, logging each step
         horizontal_lines = []
         line_count = 0
         rect_count = 0
         
-        if debug:
-            print(f"\n[DEBUG] Starting line detection...")
-            print(f"[DEBUG] Page dimensions: {page.rect.width:.2f} x {page.rect.height:.2f}")
-            print(f"[DEBUG] Min line length threshold: {min_line_length}")
+        log.debug("Starting line detection on page %d", page.number)
+        log.debug("Page dimensions: %.2f x %.2f", page.rect.width, page.rect.height)
+        log.debug("Min line length threshold: %s", min_line_length)
         
         try:
-            # Get all vector drawings on the page
-            paths = page.get_drawings()
-            if debug:
-                print(f"[DEBUG] Found {len(paths)} drawing paths on page")
+            # Raw vector drawings: plain tuples instead of the Point/Rect
+            # objects get_drawings() builds for every path on the page
+            paths = page.get_cdrawings()
+            log.debug("Found %d drawing paths on page", len(paths))
             
-            for path_idx, path in enumerate(paths):
+            for path in paths:
                 # Each path has items which are drawing commands
-                for item in path.get("items", []):
+                for item in path['items']:
                     # item[0] is the drawing command type
                     # 'l' = line, 're' = rectangle, etc.
                     if item[0] == "l":  # Line command
                         line_count += 1
-                        # item[1] and item[2] are start and end points
-                        p1 = item[1]  # Start point (x, y)
-                        p2 = item[2]  # End point (x, y)
+                        # item[1] and item[2] are start and end points (x, y)
+                        x1, y1 = item[1]
+                        x2, y2 = item[2]
                         
                         # Check if line is horizontal (y-coordinates are similar)
-                        y_diff = abs(p1.y - p2.y)
-                        x_length = abs(p2.x - p1.x)
+                        y_diff = abs(y1 - y2)
+                        x_length = abs(x2 - x1)
                         
                         # Consider it horizontal if y difference is small and line is long enough
                         if y_diff < 3 and x_length >= min_line_length:
-                            y_coord = (p1.y + p2.y) / 2
+                            y_coord = (y1 + y2) / 2
                             horizontal_lines.append(y_coord)
-                            if debug:
-                                print(f"[DEBUG]   ✓ Line: Y={y_coord:.2f}, X=[{p1.x:.2f} to {p2.x:.2f}], Length={x_length:.2f}")
-                        elif debug and y_diff < 3:
-                            print(f"[DEBUG]   ✗ Line too short: Y={p1.y:.2f}, Length={x_length:.2f} < {min_line_length}")
+                            log.debug("  ✓ Line: Y=%.2f, X=[%.2f to %.2f], Length=%.2f",
+                                      y_coord, x1, x2, x_length)
+                        elif y_diff < 3:
+                            log.debug("  ✗ Line too short: Y=%.2f, Length=%.2f < %s",
+                                      y1, x_length, min_line_length)
                     
                     elif item[0] == "re":  # Rectangle (might be used for lines)
                         rect_count += 1
-                        # item[1] is the rectangle
-                        rect = item[1]
+                        # item[1] is the rectangle (x0, y0, x1, y1), not normalized
+                        rx0, ry0, rx1, ry1 = item[1]
+                        width = abs(rx1 - rx0)
+                        height = abs(ry1 - ry0)
                         # Check if it's a thin horizontal rectangle (acts as a line)
-                        if rect.height < 3 and rect.width >= min_line_length:
-                            y_coord = (rect.y0 + rect.y1) / 2
+                        if height < 3 and width >= min_line_length:
+                            y_coord = (ry0 + ry1) / 2
                             horizontal_lines.append(y_coord)
-                            if debug:
-                                print(f"[DEBUG]   ✓ Rect: Y={y_coord:.2f}, Width={rect.width:.2f}, Height={rect.height:.2f}")
-                        elif debug and rect.height < 3:
-                            print(f"[DEBUG]   ✗ Rect too short: Y={rect.y0:.2f}, Width={rect.width:.2f} < {min_line_length}")
+                            log.debug("  ✓ Rect: Y=%.2f, Width=%.2f, Height=%.2f",
+                                      y_coord, width, height)
+                        elif height < 3:
+                            log.debug("  ✗ Rect too short: Y=%.2f, Width=%.2f < %s",
+                                      min(ry0, ry1), width, min_line_length)
         
         except Exception as e:
-            print(f"[ERROR] Error detecting lines: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error detecting lines on page %d: %s", page.number, e, exc_info=True)
             return []
         
-        if debug:
-            print(f"\n[DEBUG] Processed {line_count} lines and {rect_count} rectangles")
-            print(f"[DEBUG] Found {len(horizontal_lines)} horizontal lines before deduplication")
+        log.debug("Processed %d lines and %d rectangles", line_count, rect_count)
+        log.debug("Found %d horizontal lines before deduplication", len(horizontal_lines))
         
         # Sort lines from top to bottom
         horizontal_lines.sort()
         
         # Deduplicate nearby lines (group lines within 5 points of each other)
-        deduplicated = PdfProcessor._deduplicate_lines(horizontal_lines, threshold=5, debug=debug)
+        deduplicated = PdfProcessor._deduplicate_lines(horizontal_lines, threshold=5, log=log)
         
-        if debug:
-            print(f"[DEBUG] After deduplication: {len(deduplicated)} lines")
-            for i, y in enumerate(deduplicated):
-                print(f"[DEBUG]   Line {i+1}: Y = {y:.2f}")
+        log.debug("After deduplication: %d lines", len(deduplicated))
+        for i, y in enumerate(deduplicated):
+            log.debug("  Line %d: Y = %.2f", i + 1, y)
         
         return deduplicated
     
     @staticmethod
-    def _deduplicate_lines(lines: List[float], threshold: float = 5, debug: bool = False) -> List[float]:
+    def detect_horizontal_lines_batch(pages: List, min_line_length: float = 100,
+                                      debug: Optional[bool] = None,
+                                      layout_cache: Optional[SeparatorLayoutCache] = None
+                                      ) -> List[List[float]]:
+        """
+        Detect horizontal separator lines on many pages in one vectorized pass.
+        
+        Candidate segments ('l' items and 're' items of the paths wide enough
+        to hold a separator) of all pages are gathered into one NumPy array;
+        filtering by length/height, sorting and clustering then run as array
+        operations over all pages at once. Gives exactly the same lines as
+        detect_horizontal_lines() on each page.
+        
+        Args:
+            pages: PyMuPDF page objects (e.g. all pages of a document)
+            min_line_length: Minimum length for a line to be considered (default 100 points)
+            debug: True/False forces diagnostics on/off; None (default) logs them
+                   only for a traced page or when DEBUG logging is enabled.
+                   Pages with diagnostics are detected one by one
+            layout_cache: Reuse results and learned layouts (see layout_cache.py).
+                          Pages the cache is learning a layout from are
+                          detected on their own, in order, so the layout is
+                          trusted from the next page on; pages not matching
+                          a template join the batch
+            
+        Returns:
+            Detected lines of each page, in pages order
+        """
+        results = [None] * len(pages)
+        segments = []       # (x0, y0, x1, y1) of candidate items
+        segment_pages = []  # Index into pages of each segment
+        cached_lines = []   # Lines from the layout cache or detected alone: already filtered
+        cached_pages = []
+        detected = []       # Batch-detected pages with a layout cache, learned afterwards
+        
+        for index, page in enumerate(pages):
+            if page_logger(page, debug, logger):
+                results[index] = PdfProcessor.detect_horizontal_lines(
+                    page, min_line_length=min_line_length, debug=True
+                )
+                continue
+            
+            if layout_cache is not None:
+                cached = layout_cache.lookup(page, min_line_length)
+                if cached is not None:
+                    cached_lines.extend(cached)
+                    cached_pages.extend([index] * len(cached))
+                    continue
+            
+            try:
+                paths = page.get_cdrawings()
+            except Exception as e:
+                logger.error("Error detecting lines on page %d: %s", page.number, e, exc_info=True)
+                results[index] = []
+                continue
+            
+            page_segments = PdfProcessor._line_segments(paths, min_line_length)
+            if layout_cache is not None:
+                lines = layout_cache.match(page, min_line_length, page_segments)
+                if lines is None and layout_cache.needs_learning(page, min_line_length):
+                    # The cache learns its layout's template from this page,
+                    # so it must see the result before the next page is matched
+                    ys, _ = PdfProcessor._horizontal_segments(
+                        page_segments, [index] * len(page_segments), min_line_length
+                    )
+                    lines = ys.tolist()
+                    layout_cache.learn(page, min_line_length, lines)
+                if lines is not None:
+                    cached_lines.extend(lines)
+                    cached_pages.extend([index] * len(lines))
+                    continue
+            
+            segments.extend(page_segments)
+            segment_pages.extend([index] * len(page_segments))
+            if layout_cache is not None:
+                detected.append(index)
+        
+        ys, page_ids = PdfProcessor._horizontal_segments(
+            segments, segment_pages, min_line_length, cached_lines, cached_pages
+        )
+        
+        if detected:
+            starts = np.searchsorted(page_ids, detected, side='left')
+            ends = np.searchsorted(page_ids, detected, side='right')
+            for index, start, end in zip(detected, starts, ends):
+                layout_cache.learn(pages[index], min_line_length, ys[start:end].tolist())
+        
+        # Deduplicate nearby lines (group lines within 5 points of each other)
+        line_pages, lines = PdfProcessor._cluster_lines(ys, page_ids, threshold=5)
+        starts = np.searchsorted(line_pages, np.arange(len(pages)), side='left')
+        ends = np.searchsorted(line_pages, np.arange(len(pages)), side='right')
+        lines = lines.tolist()
+        
+        for index in range(len(pages)):
+            if results[index] is None:
+                results[index] = lines[starts[index]:ends[index]]
+        
+        return results
+    
+    @staticmethod
+    def _line_segments(paths: List[dict], min_line_length: float) -> List[Tuple[float, ...]]:
+        """
+        Candidate separator segments of a page's get_cdrawings() paths.
+        
+        Args:
+            paths: Output of page.get_cdrawings()
+            min_line_length: Minimum line length in points
+            
+        Returns:
+            (x0, y0, x1, y1) of every 'l' and 're' item of the paths that are
+            at least min_line_length wide
+        """
+        segments = []
+        for path in paths:
+            # All items lie within the path's bounding box, so a path
+            # narrower than min_line_length cannot hold a separator
+            path_x0, _, path_x1, _ = path['rect']
+            if path_x1 - path_x0 < min_line_length:
+                continue
+            for item in path['items']:
+                if item[0] == "l":
+                    segments.append(item[1] + item[2])
+                elif item[0] == "re":
+                    segments.append(item[1])
+        return segments
+    
+    @staticmethod
+    def _horizontal_segments(segments: List[Tuple[float, ...]], segment_pages: List[int],
+                             min_line_length: float, lines: List[float] = (),
+                             line_pages: List[int] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Y-coordinates of the horizontal segments, sorted by page and position.
+        
+        Args:
+            segments: (x0, y0, x1, y1) of candidate items (see _line_segments)
+            segment_pages: Page index of each segment
+            min_line_length: Minimum line length in points
+            lines: Y-coordinates of lines that need no filtering (layout cache)
+            line_pages: Page index of each of those lines
+            
+        Returns:
+            (Y-coordinates, page index of each), sorted by page, then top to bottom
+        """
+        # Horizontal and long enough; 're' rectangles are not normalized,
+        # hence abs() for both kinds of item
+        segment_array = np.array(segments, dtype=float).reshape(-1, 4)
+        x0, y0, x1, y1 = segment_array.T
+        keep = (np.abs(y1 - y0) < 3) & (np.abs(x1 - x0) >= min_line_length)
+        
+        ys = np.concatenate([((y0 + y1) / 2)[keep], np.array(lines, dtype=float)])
+        page_ids = np.concatenate([np.array(segment_pages, dtype=np.intp)[keep],
+                                   np.array(line_pages, dtype=np.intp)])
+        
+        order = np.lexsort((ys, page_ids))
+        return ys[order], page_ids[order]
+    
+    @staticmethod
+    def _cluster_lines(lines: np.ndarray, groups: np.ndarray,
+                       threshold: float = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized _deduplicate_lines() over many sorted lists at once.
+        
+        Args:
+            lines: Y-coordinates, sorted within each group
+            groups: Group (page) of each line, sorted; clusters never span groups
+            threshold: Maximum distance to group lines together
+            
+        Returns:
+            (group of each cluster, average Y-coordinate of each cluster)
+        """
+        if len(lines) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=float)
+        
+        # A cluster starts at a new group or after a gap wider than threshold
+        starts = np.empty(len(lines), dtype=bool)
+        starts[0] = True
+        starts[1:] = (groups[1:] != groups[:-1]) | (np.diff(lines) > threshold)
+        start_index = np.flatnonzero(starts)
+        sizes = np.diff(np.append(start_index, len(lines)))
+        
+        # Sum each cluster left to right like sum() (np.add.reduceat adds in
+        # a different order), so the averages are bit-identical
+        sums = np.zeros(len(start_index))
+        for offset in range(int(sizes.max())):
+            active = sizes > offset
+            sums[active] += lines[start_index[active] + offset]
+        
+        return groups[start_index], sums / sizes
+    
+    @staticmethod
+    def _deduplicate_lines(lines: List[float], threshold: float = 5,
+                           log: Optional[logging.Logger] = None) -> List[float]:
         """
         Group nearby horizontal lines and return their average positions.
         
+        Runs as array operations (_cluster_lines) unless diagnostics are logged.
+        
         Args:
-            lines: List of Y-coordinates
+            lines: List of Y-coordinates, sorted
             threshold: Maximum distance to group lines together
-            debug: If True, print debug information
+            log: Logger for diagnostics (None = no diagnostics)
             
         Returns:
             Deduplicated list of Y-coordinates
@@ -213,8 +459,14 @@ class PdfProcessor:
         if not lines:
             return []
         
-        if debug:
-            print(f"\n[DEBUG] Deduplicating {len(lines)} lines with threshold={threshold}")
+        if not log:
+            lines = np.asarray(lines, dtype=float)
+            _, deduplicated = PdfProcessor._cluster_lines(
+                lines, np.zeros(len(lines), dtype=np.intp), threshold=threshold
+            )
+            return deduplicated.tolist()
+        
+        log.debug("Deduplicating %d lines with threshold=%s", len(lines), threshold)
         
         deduplicated = []
         current_group = [lines[0]]
@@ -223,34 +475,42 @@ class PdfProcessor:
             if lines[i] - lines[i-1] <= threshold:
                 # Add to current group
                 current_group.append(lines[i])
-                if debug:
-                    print(f"[DEBUG]   Grouping line at Y={lines[i]:.2f} with previous (distance={lines[i] - lines[i-1]:.2f})")
+                if log:
+                    log.debug("  Grouping line at Y=%.2f with previous (distance=%.2f)",
+                              lines[i], lines[i] - lines[i-1])
             else:
                 # Save average of current group and start new group
                 avg = sum(current_group) / len(current_group)
                 deduplicated.append(avg)
-                if debug:
-                    print(f"[DEBUG]   Group complete: {len(current_group)} lines averaged to Y={avg:.2f}")
+                if log:
+                    log.debug("  Group complete: %d lines averaged to Y=%.2f", len(current_group), avg)
                 current_group = [lines[i]]
         
         # Don't forget the last group
         if current_group:
             avg = sum(current_group) / len(current_group)
             deduplicated.append(avg)
-            if debug:
-                print(f"[DEBUG]   Final group: {len(current_group)} lines averaged to Y={avg:.2f}")
+            if log:
+                log.debug("  Final group: %d lines averaged to Y=%.2f", len(current_group), avg)
         
         return deduplicated
     
     @staticmethod
-    def detect_student_boundaries(page, min_line_length: float = 200, debug: bool = True) -> Dict:
+    def detect_student_boundaries(page, min_line_length: float = 200,
+                                  debug: Optional[bool] = None,
+                                  layout_cache: Optional[SeparatorLayoutCache] = None,
+                                  lines: Optional[List[float]] = None) -> Dict:
         """
         Detect student record boundaries on a page based on horizontal separator lines.
         
         Args:
             page: PyMuPDF page object
             min_line_length: Minimum length for separator lines
-            debug: If True, print debug information
+            debug: True/False forces diagnostics on/off; None (default) logs them
+                   only for a traced page or when DEBUG logging is enabled
+            layout_cache: Separator layout cache (see detect_horizontal_lines)
+            lines: Separator lines already detected for this page (e.g. by
+                   detect_horizontal_lines_batch()); None detects them here
             
         Returns:
             Dictionary with student boundaries:
@@ -262,13 +522,15 @@ class PdfProcessor:
                 ]
             }
         """
-        if debug:
-            print(f"\n{'='*70}")
-            print(f"DETECTING STUDENT BOUNDARIES")
-            print(f"{'='*70}")
+        log = page_logger(page, debug, logger)
+        if log:
+            log.debug("Detecting student boundaries on page %d of %s",
+                      page.number, os.path.basename(page.parent.name))
         
         # Detect horizontal lines
-        lines = PdfProcessor.detect_horizontal_lines(page, min_line_length=min_line_length, debug=debug)
+        if lines is None:
+            lines = PdfProcessor.detect_horizontal_lines(page, min_line_length=min_line_length, debug=debug,
+                                                         layout_cache=layout_cache)
         
         # Filter lines that are likely separator lines (spanning most of page width)
         # We expect 2 lines for 1 student, 3 lines for 2 students
@@ -279,8 +541,8 @@ class PdfProcessor:
             'detected_lines': lines
         }
         
-        if debug:
-            print(f"\n[DEBUG] Analyzing {len(lines)} detected lines...")
+        if log:
+            log.debug("Analyzing %d detected lines...", len(lines))
         
         if len(lines) >= 3:
             # Two students case: 3 or more lines detected
@@ -290,10 +552,10 @@ class PdfProcessor:
                 {'y_top': lines[0], 'y_bottom': lines[1]},  # First student
                 {'y_top': lines[1], 'y_bottom': lines[2]}   # Second student
             ]
-            if debug:
-                print(f"[DEBUG] ✓ TWO STUDENTS detected (3+ lines found)")
-                print(f"[DEBUG]   Student 1: Y {lines[0]:.2f} to {lines[1]:.2f} (height: {lines[1]-lines[0]:.2f})")
-                print(f"[DEBUG]   Student 2: Y {lines[1]:.2f} to {lines[2]:.2f} (height: {lines[2]-lines[1]:.2f})")
+            if log:
+                log.debug("✓ TWO STUDENTS detected (3+ lines found)")
+                log.debug("  Student 1: Y %.2f to %.2f (height: %.2f)", lines[0], lines[1], lines[1] - lines[0])
+                log.debug("  Student 2: Y %.2f to %.2f (height: %.2f)", lines[1], lines[2], lines[2] - lines[1])
         elif len(lines) >= 2:
             # One student case: 2 lines detected
             # Use first 2 lines: top separator and bottom separator
@@ -301,24 +563,22 @@ class PdfProcessor:
             result['students'] = [
                 {'y_top': lines[0], 'y_bottom': lines[1]}  # Single student
             ]
-            if debug:
-                print(f"[DEBUG] ✓ ONE STUDENT detected (2 lines found)")
-                print(f"[DEBUG]   Student 1: Y {lines[0]:.2f} to {lines[1]:.2f} (height: {lines[1]-lines[0]:.2f})")
+            if log:
+                log.debug("✓ ONE STUDENT detected (2 lines found)")
+                log.debug("  Student 1: Y %.2f to %.2f (height: %.2f)", lines[0], lines[1], lines[1] - lines[0])
         else:
             # Not enough lines detected
             result['num_students'] = 0
-            if debug:
-                print(f"[DEBUG] ✗ DETECTION FAILED: Only {len(lines)} line(s) found, need at least 2")
-        
-        if debug:
-            print(f"{'='*70}\n")
+            if log:
+                log.debug("✗ DETECTION FAILED: Only %d line(s) found, need at least 2", len(lines))
         
         return result
     
     @staticmethod
     def crop_single_student(input_pdf_path: str, page_num: int, 
                            student_index: int, output_path: str,
-                           total_students_on_page: int = None) -> bool:
+                           total_students_on_page: int = None,
+                           debug: Optional[bool] = None) -> bool:
         """
         Crop a single student record from a page using DYNAMIC detection of separator lines.
         
@@ -328,25 +588,19 @@ class PdfProcessor:
             student_index: Student position on page (0-indexed, 0=first/top student, 1=second/bottom)
             output_path: Output PDF file path
             total_students_on_page: IGNORED - kept for backward compatibility
+            debug: True/False forces diagnostics on/off; None (default) logs them
+                   only for a traced page or when DEBUG logging is enabled
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            print(f"\n{'='*70}")
-            print(f"CROPPING STUDENT RECORD")
-            print(f"{'='*70}")
-            print(f"Input PDF: {input_pdf_path}")
-            print(f"Page: {page_num}")
-            print(f"Student Index: {student_index}")
-            print(f"Output: {output_path}")
-            
             # Open source PDF
             doc = fitz.open(input_pdf_path)
             
             # Validate page number
             if page_num >= len(doc):
-                print(f"\n[ERROR] Page {page_num} does not exist in PDF (total pages: {len(doc)})")
+                logger.error("Page %d does not exist in PDF (total pages: %d)", page_num, len(doc))
                 doc.close()
                 return False
             
@@ -355,22 +609,27 @@ class PdfProcessor:
             page_width = page.rect.width
             page_height = page.rect.height
             
-            print(f"\n[INFO] Page dimensions: {page_width:.2f} x {page_height:.2f}")
+            log = page_logger(page, debug, logger)
+            if log:
+                log.debug("Cropping student %d from page %d of %s -> %s",
+                          student_index, page_num, input_pdf_path, output_path)
+                log.debug("Page dimensions: %.2f x %.2f", page_width, page_height)
             
             # Detect student boundaries dynamically
-            boundaries = PdfProcessor.detect_student_boundaries(page, debug=True)
+            boundaries = PdfProcessor.detect_student_boundaries(
+                page, debug=debug, layout_cache=PdfProcessor.LAYOUT_CACHE
+            )
             
             # Check if we detected enough boundaries
             if boundaries['num_students'] == 0:
-                print(f"\n[ERROR] Could not detect separator lines!")
-                print(f"[ERROR] No students detected on this page.")
+                logger.error("Could not detect separator lines: no students on page %d", page_num)
                 doc.close()
                 return False
             
             # Validate student index
             if student_index >= len(boundaries['students']):
-                print(f"\n[ERROR] Student index {student_index} exceeds detected students "
-                      f"({len(boundaries['students'])})")
+                logger.error("Student index %d exceeds detected students (%d) on page %d",
+                             student_index, len(boundaries['students']), page_num)
                 doc.close()
                 return False
             
@@ -381,10 +640,11 @@ class PdfProcessor:
             y_top = student_bounds['y_top']
             y_bottom = student_bounds['y_bottom']
             
-            print(f"\n[INFO] Cropping coordinates for student {student_index}:")
-            print(f"[INFO]   X: {x_left:.2f} to {x_right:.2f}")
-            print(f"[INFO]   Y: {y_top:.2f} to {y_bottom:.2f}")
-            print(f"[INFO]   Crop dimensions: {x_right - x_left:.2f} x {y_bottom - y_top:.2f}")
+            if log:
+                log.debug("Cropping coordinates for student %d:", student_index)
+                log.debug("  X: %.2f to %.2f", x_left, x_right)
+                log.debug("  Y: %.2f to %.2f", y_top, y_bottom)
+                log.debug("  Crop dimensions: %.2f x %.2f", x_right - x_left, y_bottom - y_top)
             
             # Create cropping rectangle
             crop_rect = fitz.Rect(x_left, y_top, x_right, y_bottom)
@@ -406,15 +666,14 @@ class PdfProcessor:
             output_doc.close()
             doc.close()
             
-            print(f"\n[SUCCESS] ✓ Cropped student record saved to: {output_path}")
-            print(f"{'='*70}\n")
+            if log:
+                log.debug("✓ Cropped student record saved to: %s", output_path)
             
             return True
             
         except Exception as e:
-            print(f"\n[ERROR] Error in dynamic cropping for student {student_index} from page {page_num}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error in dynamic cropping for student %d from page %d: %s",
+                         student_index, page_num, e, exc_info=True)
             return False
     
     @staticmethod
@@ -438,12 +697,12 @@ class PdfProcessor:
         try:
             # Validate student index
             if student_index >= len(PdfProcessor.STUDENT_BLOCK_COORDS['student_heights']):
-                print(f"Warning: Student index {student_index} exceeds known coordinates (max 1)")
+                logger.warning("Student index %d exceeds known coordinates (max 1)", student_index)
                 return False
             
             # Validate total students
             if total_students_on_page not in [1, 2]:
-                print(f"Warning: Expected 1 or 2 students per page, got {total_students_on_page}")
+                logger.warning("Expected 1 or 2 students per page, got %s", total_students_on_page)
                 # Default to 2 for safety
                 total_students_on_page = 2
             
@@ -452,7 +711,7 @@ class PdfProcessor:
             
             # Validate page number
             if page_num >= len(doc):
-                print(f"Error: Page {page_num} does not exist in PDF")
+                logger.error("Page %d does not exist in PDF", page_num)
                 doc.close()
                 return False
             
@@ -492,7 +751,7 @@ class PdfProcessor:
             return True
             
         except Exception as e:
-            print(f"Error cropping student {student_index} from page {page_num}: {e}")
+            logger.error("Error cropping student %d from page %d: %s", student_index, page_num, e)
             return False
     
     @staticmethod
@@ -543,33 +802,249 @@ class PdfProcessor:
         """
         successful_crops = []
         
-        print(f"\n{'#'*70}")
-        print(f"BATCH CROPPING: {len(page_crops)} student(s)")
-        print(f"{'#'*70}\n")
-        
         for i, crop_info in enumerate(page_crops, 1):
             page_num = crop_info['page']
             student_index = crop_info['student_index']
             output_path = crop_info['output_path']
             
-            print(f"\n[BATCH {i}/{len(page_crops)}] Processing...")
-            
             if PdfProcessor.crop_single_student(input_pdf_path, page_num, 
                                                student_index, output_path):
                 successful_crops.append(output_path)
-                print(f"[BATCH {i}/{len(page_crops)}] ✓ Success")
             else:
-                print(f"[BATCH {i}/{len(page_crops)}] ✗ Failed")
-        
-        print(f"\n{'#'*70}")
-        print(f"BATCH COMPLETE: {len(successful_crops)}/{len(page_crops)} successful")
-        print(f"{'#'*70}\n")
+                logger.warning("Batch crop %d/%d failed (page %d, student %d)",
+                               i, len(page_crops), page_num, student_index)
         
+        logger.info("Batch crop complete: %d/%d successful", len(successful_crops), len(page_crops))
+
         return successful_crops
-    
+
+    @staticmethod
+    def crop_students_single_pass(input_pdf_path: str, page_crops: List[dict],
+                                  debug: Optional[bool] = None,
+                                  timer: Optional[StageTimer] = None,
+                                  bundle_path: Optional[str] = None,
+                                  lazy: bool = False) -> Dict:
+        """
+        Crop many student records from one PDF in a single pass.
+
+        The source PDF is opened once and each page is visited once: separator
+        lines are detected a single time per page (all pages in one
+        detect_horizontal_lines_batch() call) and every requested student
+        on that page is cropped from the same page object. Produces the same
+        output files as calling crop_single_student() for each entry.
+
+        Separator detection goes through a SeparatorLayoutCache for this PDF:
+        once its page layout is learned, pages are checked against the
+        layout's separator template.
+
+        Every cropped crop_info gets the 'y_top' and 'y_bottom' it was cropped
+        at, so callers can store the crop geometry.
+
+        With bundle_path, all records are written as the pages of that one PDF
+        (fonts and page content stored once) with an offset index next to it,
+        see record_bundle.py. The 'output_path' of each successful crop_info
+        is then set to its record reference, "bundle_path#page=N".
+
+        With lazy=True, nothing is written: the 'output_path' of each
+        successful crop_info is set to its crop descriptor (source PDF, page
+        and crop bounds), rendered on request by lazy_crops.CropRenderer.
+
+        Args:
+            input_pdf_path: Source PDF file path
+            page_crops: List of dicts with format:
+                        [{'page': 2, 'student_index': 0, 'output_path': 'path/to/output.pdf'}, ...]
+                        Other keys (e.g. 'ern', 'seat_no') go into the bundle index
+            debug: True/False forces per-page diagnostics on/off; None (default)
+                   logs them only for a traced page or when DEBUG logging is enabled
+            timer: Optional StageTimer receiving the boundary_detection and
+                   crop_save times
+            bundle_path: Write one bundle PDF instead of one file per record
+            lazy: Only record crop descriptors, write no files
+
+        Returns:
+            Dictionary with crop results:
+            {
+                'successful': [output_path, record reference or descriptor, ...],
+                'failed': [crop_info, ...],
+                'elapsed_seconds': float,
+                'crops_per_second': float
+            }
+        """
+        result = {
+            'successful': [],
+            'failed': [],
+            'elapsed_seconds': 0.0,
+            'crops_per_second': 0.0
+        }
+        start_time = time.perf_counter()
+        if timer is None:
+            timer = StageTimer()
+
+        # Group requested crops by page, keeping request order within a page
+        crops_by_page = {}
+        for crop_info in page_crops:
+            crops_by_page.setdefault(crop_info['page'], []).append(crop_info)
+        layout_cache = SeparatorLayoutCache()
+
+        try:
+            doc = fitz.open(input_pdf_path)
+        except Exception as e:
+            logger.error("Could not open %s: %s", input_pdf_path, e)
+            result['failed'] = list(page_crops)
+            return result
+
+        bundle_doc = fitz.open() if bundle_path else None
+        bundled = []  # (crop_info, index entry) per bundle page
+
+        try:
+            # Separator lines of all requested pages in one batch, before any
+            # page's cropbox is changed (min length as detect_student_boundaries)
+            page_nums = [page_num for page_num in sorted(crops_by_page) if page_num < len(doc)]
+            with timer.stage('boundary_detection'):
+                lines_by_page = dict(zip(page_nums, PdfProcessor.detect_horizontal_lines_batch(
+                    [doc[page_num] for page_num in page_nums], min_line_length=200,
+                    debug=debug, layout_cache=layout_cache
+                )))
+
+            for page_num in sorted(crops_by_page):
+                page_requests = crops_by_page[page_num]
+
+                if page_num >= len(doc):
+                    logger.error("Page %d does not exist in PDF (total pages: %d)", page_num, len(doc))
+                    result['failed'].extend(page_requests)
+                    continue
+
+                page = doc[page_num]
+                page_width = page.rect.width
+                with timer.stage('boundary_detection'):
+                    boundaries = PdfProcessor.detect_student_boundaries(
+                        page, debug=debug, lines=lines_by_page[page_num]
+                    )
+
+                if boundaries['num_students'] == 0:
+                    logger.error("No students detected on page %d", page_num)
+                    result['failed'].extend(page_requests)
+                    continue
+
+                save_start = time.perf_counter()
+                for crop_info in page_requests:
+                    student_index = crop_info['student_index']
+                    output_path = crop_info['output_path']
+
+                    if student_index >= len(boundaries['students']):
+                        logger.error("Student index %d exceeds detected students (%d) on page %d",
+                                     student_index, len(boundaries['students']), page_num)
+                        result['failed'].append(crop_info)
+                        continue
+
+                    try:
+                        student_bounds = boundaries['students'][student_index]
+                        # Crop geometry, stored with the record
+                        crop_info['y_top'] = student_bounds['y_top']
+                        crop_info['y_bottom'] = student_bounds['y_bottom']
+                        if lazy:
+                            crop_info['output_path'] = make_descriptor(
+                                input_pdf_path, page_num,
+                                student_bounds['y_top'], student_bounds['y_bottom']
+                            )
+                            result['successful'].append(crop_info['output_path'])
+                            continue
+
+                        crop_rect = fitz.Rect(0, student_bounds['y_top'],
+                                              page_width, student_bounds['y_bottom'])
+                        page.set_cropbox(crop_rect)
+
+                        if bundle_doc is not None:
+                            # Keep the graft map (final=False): fonts and page
+                            # content are copied into the bundle only once
+                            bundle_doc.insert_pdf(doc, from_page=page_num, to_page=page_num,
+                                                  final=False)
+                            entry = {'page': len(bundle_doc)}
+                            entry.update((key, value) for key, value in crop_info.items()
+                                         if key not in ('page', 'student_index', 'output_path',
+                                                        'y_top', 'y_bottom'))
+                            entry.update({
+                                'source_page': page_num,
+                                'student_index': student_index,
+                                'y_top': student_bounds['y_top'],
+                                'y_bottom': student_bounds['y_bottom']
+                            })
+                            bundled.append((crop_info, entry))
+                            continue
+
+                        output_doc = fitz.open()
+                        output_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+
+                        output_dir = os.path.dirname(output_path)
+                        if output_dir:
+                            os.makedirs(output_dir, exist_ok=True)
+
+                        output_doc.save(output_path)
+                        output_doc.close()
+                        result['successful'].append(output_path)
+                    except Exception as e:
+                        logger.error("Error cropping student %d from page %d: %s",
+                                     student_index, page_num, e)
+                        result['failed'].append(crop_info)
+                timer.add('crop_save', time.perf_counter() - save_start)
+
+            if bundled:
+                with timer.stage('crop_save'):
+                    PdfProcessor._save_bundle(bundle_doc, bundle_path, input_pdf_path,
+                                              bundled, result)
+        finally:
+            doc.close()
+            if bundle_doc is not None:
+                bundle_doc.close()
+
+        elapsed = time.perf_counter() - start_time
+        result['elapsed_seconds'] = elapsed
+        result['crops_per_second'] = len(result['successful']) / elapsed if elapsed > 0 else 0.0
+
+        logger.debug("Single-pass crop: %d/%d successful in %.2fs (%.1f crops/s)",
+                     len(result['successful']), len(page_crops), elapsed,
+                     result['crops_per_second'])
+        logger.debug("Separator layout cache: %s", layout_cache.stats)
+
+        return result
+
+    @staticmethod
+    def _save_bundle(bundle_doc, bundle_path: str, input_pdf_path: str,
+                     bundled: List[Tuple[dict, dict]], result: Dict):
+        """
+        Save a record bundle and its index, then report its records.
+
+        Args:
+            bundle_doc: Bundle document holding one page per record
+            bundle_path: Bundle PDF path
+            input_pdf_path: Source PDF file path
+            bundled: (crop_info, index entry) of each bundle page
+            result: crop_students_single_pass() result to update
+        """
+        try:
+            output_dir = os.path.dirname(bundle_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            # Replace a previous bundle only once the new one is complete
+            tmp_path = bundle_path + '.tmp'
+            bundle_doc.save(tmp_path, garbage=3, deflate=True)
+            os.replace(tmp_path, bundle_path)
+            write_index(bundle_path, os.path.basename(input_pdf_path),
+                        [entry for _, entry in bundled])
+        except Exception as e:
+            logger.error("Error saving record bundle %s: %s", bundle_path, e)
+            result['failed'].extend(crop_info for crop_info, _ in bundled)
+            return
+
+        for crop_info, entry in bundled:
+            crop_info['output_path'] = record_ref(bundle_path, entry['page'])
+            result['successful'].append(crop_info['output_path'])
+
     @staticmethod
     def crop_all_students_on_page(input_pdf_path: str, page_num: int,
-                                  output_dir: str, base_filename: str) -> List[str]:
+                                  output_dir: str, base_filename: str,
+                                  debug: Optional[bool] = None) -> List[str]:
         """
         Automatically detect and crop ALL student records on a single page.
         
@@ -578,55 +1053,46 @@ class PdfProcessor:
             page_num: Page number (0-indexed)
             output_dir: Directory to save cropped PDFs
             base_filename: Base name for output files (will append _student_0, _student_1, etc.)
+            debug: True/False forces diagnostics on/off; None (default) logs them
+                   only for a traced page or when DEBUG logging is enabled
             
         Returns:
             List of successfully created file paths
         """
         try:
-            print(f"\n{'#'*70}")
-            print(f"AUTO-CROP ALL STUDENTS ON PAGE")
-            print(f"{'#'*70}")
-            print(f"Input: {input_pdf_path}")
-            print(f"Page: {page_num}")
-            print(f"Output directory: {output_dir}")
-            print(f"Base filename: {base_filename}")
-            
             doc = fitz.open(input_pdf_path)
             if page_num >= len(doc):
-                print(f"\n[ERROR] Page {page_num} does not exist in PDF (total pages: {len(doc)})")
+                logger.error("Page %d does not exist in PDF (total pages: %d)", page_num, len(doc))
                 doc.close()
                 return []
             
             page = doc[page_num]
-            boundaries = PdfProcessor.detect_student_boundaries(page, debug=True)
+            boundaries = PdfProcessor.detect_student_boundaries(
+                page, debug=debug, layout_cache=PdfProcessor.LAYOUT_CACHE
+            )
             doc.close()
             
             num_students = boundaries['num_students']
             
             if num_students == 0:
-                print(f"\n[ERROR] No students detected on page {page_num}")
+                logger.error("No students detected on page %d", page_num)
                 return []
             
-            print(f"\n[INFO] Will crop {num_students} student(s)")
-            
             # Crop each detected student
             successful_crops = []
             for student_idx in range(num_students):
                 output_path = os.path.join(output_dir, f"{base_filename}_student_{student_idx}.pdf")
-                if PdfProcessor.crop_single_student_dynamic(input_pdf_path, page_num,
-                                                           student_idx, output_path):
+                if PdfProcessor.crop_single_student(input_pdf_path, page_num,
+                                                    student_idx, output_path, debug=debug):
                     successful_crops.append(output_path)
             
-            print(f"\n{'#'*70}")
-            print(f"AUTO-CROP COMPLETE: {len(successful_crops)}/{num_students} successful")
-            print(f"{'#'*70}\n")
+            logger.info("Auto-crop of page %d complete: %d/%d successful",
+                        page_num, len(successful_crops), num_students)
             
             return successful_crops
             
         except Exception as e:
-            print(f"\n[ERROR] Error cropping all students on page {page_num}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error cropping all students on page %d: %s", page_num, e, exc_info=True)
             return []
     
     @staticmethod
@@ -0,0 +1,179 @@
+"""
+=============================================================================
+Record Bundles for Mumbai University Grade Records
+=============================================================================
+
+Alternative output mode: instead of one small PDF per student, all cropped
+records of a register are written as the pages of one PDF (the bundle),
+next to a JSON index of its pages.
+
+Why:
+- Every per-student PDF carries its own copy of the register's fonts and
+  page content; in a bundle they are stored once and shared by all pages
+- One file (plus index) per register instead of tens of thousands of
+  files in one directory
+
+Layout (in the output directory):
+- {source name}.records.pdf         One cropped page per student record
+- {source name}.records.index.json  Offset index of the bundle pages:
+    {
+        "source_pdf": "...pdf",
+        "bundle": "...records.pdf",
+        "records": [
+            {"page": 1, "ern": "...", "seat_no": "...", "source_page": 0,
+             "student_index": 0, "y_top": 80.79, "y_bottom": 296.6},
+            ...
+        ]
+    }
+
+Records are addressed as "{bundle path}#page=N" (N starting at 1, the PDF
+open parameter viewers understand). That is what the database stores in
+student_exam_records.pdf_file for bundled records, so a record is found by
+ERN and exam through the database, or by ERN through the index.
+
+Usage:
+    bundle = RecordBundle('student_pdfs/exam.records.pdf')
+    for page in bundle.pages_for('MU0341120240123456'):
+        pdf_bytes = bundle.extract(page)
+
+    # Any stored pdf_file value, bundled or not
+    pdf_bytes = extract_record(record.pdf_file)
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+BUNDLE_SUFFIX = '.records.pdf'
+INDEX_SUFFIX = '.index.json'
+PAGE_FRAGMENT = '#page='
+
+
+def bundle_path_for(output_dir: str, pdf_path: str) -> str:
+    """Bundle path for the records of a source PDF"""
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(output_dir, base_name + BUNDLE_SUFFIX)
+
+
+def index_path_for(bundle_path: str) -> str:
+    """Index path of a bundle"""
+    return os.path.splitext(bundle_path)[0] + INDEX_SUFFIX
+
+
+def record_ref(bundle_path: str, page: int) -> str:
+    """Reference of bundle page (1-based), as stored in the database"""
+    return f"{bundle_path}{PAGE_FRAGMENT}{page}"
+
+
+def parse_record_ref(ref: str) -> Tuple[str, Optional[int]]:
+    """
+    Split a stored pdf_file value.
+
+    Args:
+        ref: "{bundle path}#page=N" or the path of a single-record PDF
+
+    Returns:
+        (file path, bundle page starting at 1, or None for a single-record PDF)
+    """
+    path, separator, page = ref.rpartition(PAGE_FRAGMENT)
+    if separator and page.isdigit():
+        return path, int(page)
+    return ref, None
+
+
+def write_index(bundle_path: str, source_pdf: str, records: List[Dict]):
+    """
+    Write the offset index of a bundle (atomically).
+
+    Args:
+        bundle_path: Bundle PDF path
+        source_pdf: Source PDF filename
+        records: One entry per bundle page, in page order
+    """
+    index = {
+        'source_pdf': source_pdf,
+        'bundle': os.path.basename(bundle_path),
+        'records': records
+    }
+    index_path = index_path_for(bundle_path)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+
+def extract_page(bundle_path: str, page: int) -> bytes:
+    """
+    One bundle page as a standalone PDF.
+
+    Args:
+        bundle_path: Bundle PDF path
+        page: Page number, starting at 1
+
+    Returns:
+        PDF bytes of the single record
+
+    Raises:
+        ValueError: Page does not exist in the bundle
+    """
+    with fitz.open(bundle_path) as bundle:
+        if not 1 <= page <= len(bundle):
+            raise ValueError(f"{bundle_path} has no page {page} ({len(bundle)} pages)")
+        with fitz.open() as record:
+            record.insert_pdf(bundle, from_page=page - 1, to_page=page - 1)
+            return record.tobytes(garbage=3, deflate=True)
+
+
+def extract_record(ref: str) -> bytes:
+    """
+    PDF bytes of a stored record, bundled ("path#page=N") or a single file.
+
+    Args:
+        ref: student_exam_records.pdf_file value
+
+    Returns:
+        PDF bytes of the single record
+    """
+    path, page = parse_record_ref(ref)
+    if page is None:
+        with open(path, 'rb') as f:
+            return f.read()
+    return extract_page(path, page)
+
+
+class RecordBundle:
+    """Read access to a bundle through its offset index"""
+
+    def __init__(self, bundle_path: str):
+        """
+        Load the index of a bundle.
+
+        Args:
+            bundle_path: Bundle PDF path ({source name}.records.pdf)
+        """
+        self.bundle_path = bundle_path
+        with open(index_path_for(bundle_path), encoding='utf-8') as f:
+            self.index = json.load(f)
+
+        self.records: List[Dict] = self.index['records']
+        self._pages_by_ern: Dict[str, List[int]] = {}
+        for entry in self.records:
+            self._pages_by_ern.setdefault(entry.get('ern'), []).append(entry['page'])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def pages_for(self, ern: str) -> List[int]:
+        """Bundle pages (starting at 1) holding records of a student"""
+        return list(self._pages_by_ern.get(ern, []))
+
+    def extract(self, page: int) -> bytes:
+        """One bundle page as a standalone PDF (see extract_page)"""
+        return extract_page(self.bundle_path, page)
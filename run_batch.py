@@ -9,14 +9,22 @@ Main script to orchestrate the complete workflow:
 3. Crop student records
 4. Store in database
 5. Export students.json
+6. Report per-stage timings (also written to logs/batch_metrics.json)
+
+With --scrape, step 2 downloads the PDFs itself and each PDF is processed
+as soon as its download completes (bounded queue between the two), so the
+database fills up while the rest of the batch is still downloading.
 
 Usage:
-    python run_batch.py [--downloads DIR] [--metadata DIR] [--output DIR] [--db FILE]
+    python run_batch.py [--downloads DIR] [--metadata DIR] [--output DIR] [--db FILE] [--workers N]
+    python run_batch.py --scrape [--results-url URL] [--download-workers N] [--queue-size N]
 
 Examples:
     python run_batch.py
     python run_batch.py --downloads downloads/ --metadata metadata/ --output student_records/
     python run_batch.py --db my_grades.db
+    python run_batch.py --workers 8
+    python run_batch.py --scrape --workers 4 --download-workers 8
 
 Author: GitHub Copilot
 Date: 2026-02-09
@@ -26,12 +34,53 @@ Version: 1.0
 
 import os
 import sys
+import queue
 import argparse
+import threading
 from datetime import datetime
 
 from init_db import init_database
-from batch_processor import BatchGradeProcessor
+from batch_processor import BatchGradeProcessor, OUTPUT_MODES, DEFAULT_OUTPUT_MODE
 from export_utils import export_students_json, get_exam_statistics
+from text_backends import TEXT_BACKENDS, DEFAULT_TEXT_BACKEND
+from text_cache import PageTextCache
+import diagnostics
+
+# Same as downloader.ConcurrentDownloader.DEFAULT_PER_HOST; not imported, so
+# plain batch runs do not need the scraper's dependencies (requests)
+DEFAULT_PER_HOST = 4
+
+
+def start_downloads(args, pdf_queue: queue.Queue, result: dict) -> threading.Thread:
+    """
+    Run the scraper in a background thread, feeding downloaded PDFs to a queue.
+    
+    Args:
+        args: Parsed command line arguments
+        pdf_queue: Bounded queue of (pdf_path, metadata) items, None at the end
+        result: Receives 'stats' (download statistics) or 'error'
+        
+    Returns:
+        The started thread
+    """
+    # Imported here so plain batch runs do not need the scraper's dependencies
+    from scaper import MumbaiUniversityResultScraper
+    
+    scraper = MumbaiUniversityResultScraper(output_dir=args.downloads,
+                                            results_url=args.results_url)
+    
+    def run():
+        try:
+            result['stats'] = scraper.download_to_queue(
+                pdf_queue, limit=args.limit, workers=args.download_workers,
+                per_host=args.per_host, revalidate=not args.no_revalidate
+            )
+        except Exception as e:
+            result['error'] = e
+    
+    thread = threading.Thread(target=run, name='downloads', daemon=True)
+    thread.start()
+    return thread
 
 
 def main():
@@ -49,6 +98,30 @@ Examples:
 
   # Use custom database file
   python run_batch.py --db custom_grades.db
+
+  # Extract and crop PDFs in 8 worker processes
+  python run_batch.py --workers 8
+
+  # Use the faster PyMuPDF text backend
+  python run_batch.py --text-backend pymupdf
+
+  # Re-parse everything, reusing cached page text from earlier runs
+  python run_batch.py --text-cache .text_cache --force
+
+  # One multi-page PDF (plus index) per register instead of one PDF per student
+  python run_batch.py --output-mode bundle
+
+  # No cropped files at all: store crop descriptors, render records on request
+  python run_batch.py --output-mode lazy
+
+  # Full diagnostics for page 5 of one PDF (in the log and on the console)
+  python run_batch.py --force --trace-pdf "register.pdf" --trace-page 5
+
+  # Download from the results site and process each PDF as it lands
+  python run_batch.py --scrape --workers 4 --download-workers 8
+
+  # Same, against the local stand-in server (download_standin.py)
+  python run_batch.py --scrape --results-url http://127.0.0.1:8765/ugnepresults.html
         """
     )
     
@@ -76,12 +149,131 @@ Examples:
         help='SQLite database file path (default: grade_records.db)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes for extraction and cropping (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Number of student records per bulk database insert (default: 1000)'
+    )
+    
+    parser.add_argument(
+        '--text-backend',
+        default=DEFAULT_TEXT_BACKEND,
+        choices=sorted(TEXT_BACKENDS),
+        help=f'Text extraction backend (default: {DEFAULT_TEXT_BACKEND})'
+    )
+    
+    parser.add_argument(
+        '--text-cache',
+        metavar='DIR',
+        help='Cache extracted page text in DIR, keyed by PDF hash (default: disabled)'
+    )
+    
+    parser.add_argument(
+        '--text-cache-size',
+        type=float,
+        metavar='MB',
+        default=PageTextCache.DEFAULT_MAX_SIZE_MB,
+        help=f'Maximum page text cache size in MB (default: {PageTextCache.DEFAULT_MAX_SIZE_MB})'
+    )
+    
+    parser.add_argument(
+        '--output-mode',
+        default=DEFAULT_OUTPUT_MODE,
+        choices=OUTPUT_MODES,
+        help="Cropped records as one PDF per student ('files'), one bundle PDF "
+             "with index per source PDF ('bundle') or crop descriptors rendered on "
+             f"request ('lazy') (default: {DEFAULT_OUTPUT_MODE})"
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Reprocess all PDFs, including those unchanged since the last run'
+    )
+    
+    parser.add_argument(
+        '--trace-pdf',
+        metavar='NAME',
+        help='Log full diagnostics for this PDF (file name or path; '
+             'use --force if it was already processed)'
+    )
+    
+    parser.add_argument(
+        '--trace-page',
+        type=int,
+        metavar='N',
+        help='Log full diagnostics for page N (1-indexed) only'
+    )
+    
+    parser.add_argument(
+        '--scrape',
+        action='store_true',
+        help='Download PDFs from the results page into --downloads and process '
+             'each one as soon as it is downloaded'
+    )
+    
+    parser.add_argument(
+        '--results-url',
+        default='https://www.mumresults.in/ugnepresults.html',
+        help='Results page to scrape with --scrape (default: the mumresults.in UG NEP page)'
+    )
+    
+    parser.add_argument(
+        '--download-workers',
+        type=int,
+        default=4,
+        help='Concurrent downloads with --scrape (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--per-host',
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f'Maximum connections per host with --scrape (default: {DEFAULT_PER_HOST})'
+    )
+    
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=8,
+        help='Downloaded PDFs waiting for processing before downloads pause, '
+             'with --scrape (default: 8)'
+    )
+    
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Download at most N PDFs with --scrape'
+    )
+    
+    parser.add_argument(
+        '--no-revalidate',
+        action='store_true',
+        help='With --scrape, skip existing PDFs instead of checking them for '
+             're-published versions'
+    )
+    
     parser.add_argument(
         '--skip-export',
         action='store_true',
         help='Skip JSON export step'
     )
     
+    parser.add_argument(
+        '--export-file',
+        default='students.json',
+        help='JSON export file: .json (array) or .jsonl (JSON Lines), '
+             'optionally .gz compressed (default: students.json)'
+    )
+    
     args = parser.parse_args()
     
     # Print header
@@ -98,14 +290,39 @@ Examples:
     print(f"  Metadata directory:  {args.metadata}")
     print(f"  Output directory:    {args.output}")
     print(f"  Database file:       {args.db}")
+    print(f"  Workers:             {args.workers}")
+    print(f"  Text backend:        {args.text_backend}")
+    print(f"  Text cache:          {args.text_cache or 'disabled'}")
+    if args.scrape:
+        print(f"  Scrape:              {args.results_url}")
+        print(f"  Download workers:    {args.download_workers} ({args.per_host} per host)")
+        print(f"  Queue size:          {args.queue_size}")
+    if args.trace_pdf or args.trace_page:
+        print(f"  Trace:               {args.trace_pdf or 'all PDFs'}, "
+              f"{'page ' + str(args.trace_page) if args.trace_page else 'all pages'}")
     print()
     
-    # Validate directories
-    if not os.path.exists(args.downloads):
+    if args.trace_page is not None and args.trace_page < 1:
+        print("Error: --trace-page must be 1 or greater")
+        sys.exit(1)
+    
+    if args.trace_pdf or args.trace_page:
+        diagnostics.set_trace(
+            args.trace_pdf,
+            args.trace_page - 1 if args.trace_page else None
+        )
+    
+    if args.queue_size < 1:
+        print("Error: --queue-size must be 1 or greater")
+        sys.exit(1)
+    
+    # Validate directories (--scrape creates the downloads and writes the
+    # metadata itself)
+    if not args.scrape and not os.path.exists(args.downloads):
         print(f"Error: Downloads directory not found: {args.downloads}")
         sys.exit(1)
     
-    if not os.path.exists(args.metadata):
+    if not args.scrape and not os.path.exists(args.metadata):
         print(f"Error: Metadata directory not found: {args.metadata}")
         sys.exit(1)
     
@@ -126,7 +343,10 @@ Examples:
         # Step 2: Process PDFs
         print()
         print("-" * 80)
-        print("Step 2: Processing PDFs and Cropping Student Records")
+        if args.scrape:
+            print("Step 2: Downloading, Processing PDFs and Cropping Student Records")
+        else:
+            print("Step 2: Processing PDFs and Cropping Student Records")
         print("-" * 80)
         print()
         
@@ -134,22 +354,38 @@ Examples:
             downloads_dir=args.downloads,
             metadata_dir=args.metadata,
             output_dir=args.output,
-            db_session=session
+            db_session=session,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            force=args.force,
+            text_backend=args.text_backend,
+            text_cache_dir=args.text_cache,
+            text_cache_size_mb=args.text_cache_size,
+            output_mode=args.output_mode
         )
         
-        stats = processor.process_all_pdfs()
+        download_result = {}
+        if args.scrape:
+            pdf_queue = queue.Queue(maxsize=args.queue_size)
+            downloads = start_downloads(args, pdf_queue, download_result)
+            stats = processor.process_stream(pdf_queue)
+            downloads.join()
+            
+            if 'error' in download_result:
+                print(f"⚠ Downloading stopped early: {download_result['error']}")
+        else:
+            stats = processor.process_all_pdfs()
         
         # Step 3: Export JSON
         if not args.skip_export:
             print()
             print("-" * 80)
-            print("Step 3: Exporting students.json")
+            print(f"Step 3: Exporting {os.path.basename(args.export_file)}")
             print("-" * 80)
             print()
             
-            json_file = 'students.json'
-            count = export_students_json(session, json_file)
-            print(f"✓ Exported {count} records to {json_file}")
+            count = export_students_json(session, args.export_file)
+            print(f"✓ Exported {count} records to {args.export_file}")
         
         # Step 4: Display statistics
         print()
@@ -183,9 +419,23 @@ Examples:
         print("=" * 80)
         print()
         print(f"✓ PDFs processed:        {stats['pdfs_processed']}")
+        print(f"✓ PDFs unchanged:        {stats['pdfs_skipped']}")
         print(f"✓ Students extracted:    {stats['students_extracted']}")
         print(f"✓ Student PDFs created:  {stats['students_cropped']}")
         print(f"✓ Database records:      {stats['db_records_created']}")
+        if 'stats' in download_result:
+            download_stats = download_result['stats']
+            print(f"✓ PDFs downloaded:       {download_stats['downloaded']} "
+                  f"({download_stats['updated']} re-published, "
+                  f"{download_stats['unchanged']} unchanged, "
+                  f"{download_stats['failed']} failed)")
+        print()
+        
+        # Where the time went (extraction, parsing, detection, cropping, DB)
+        print("Stage timings (per PDF):")
+        print()
+        for line in processor.metrics.format_report():
+            print(f"  {line}")
         print()
         
         if stats['pdfs_failed'] > 0 or stats['students_failed'] > 0:
@@ -204,8 +454,9 @@ Examples:
         print(f"  - Database:      {os.path.abspath(args.db)}")
         print(f"  - Student PDFs:  {os.path.abspath(args.output)}/")
         if not args.skip_export:
-            print(f"  - JSON export:   {os.path.abspath('students.json')}")
+            print(f"  - JSON export:   {os.path.abspath(args.export_file)}")
         print(f"  - Log file:      {os.path.join(args.output, 'logs', 'batch_process.log')}")
+        print(f"  - Stage metrics: {processor.metrics_file}")
         print()
         
         # Close database session
@@ -222,7 +473,7 @@ Examples:
         print("=" * 80)
         print()
         print("Batch processing was interrupted. Some records may have been processed.")
-        print("It's safe to run the script again - duplicate records will be skipped.")
+        print("It's safe to run the script again - unchanged PDFs and duplicate records will be skipped.")
         print()
         sys.exit(0)
         
@@ -10,16 +10,27 @@ Website: https://www.mumresults.in/ugnepresults.html
 Features:
 - Parses HTML table to extract program information
 - Downloads PDFs with organized folder structure
-- Skips already downloaded files
+- Skips already downloaded files (--no-revalidate) or revalidates them
 - Saves metadata JSON for each PDF
 - Progress tracking
+- Concurrent mode (--workers N): bounded pool, per-host connection limit,
+  retries with backoff, Range resume and atomic writes (see downloader.py)
+- Revalidation: ETag/Last-Modified/Content-Length are saved in the metadata
+  JSON; existing PDFs cost a conditional GET (304) and re-published ones are
+  re-fetched and flagged (content_changed in the metadata JSON)
+- Streaming: download_to_queue() hands each completed PDF to a queue, used
+  by run_batch.py --scrape to process PDFs while the rest download
 
 Usage:
-    python scraper.py [--output-dir downloads] [--limit N]
+    python scraper.py [--output-dir downloads] [--limit N] [--workers N]
     
 Examples:
     python scraper.py
     python scraper.py --output-dir ./pdfs --limit 10
+    python scraper.py --workers 8 --per-host 4
+    
+    # Against the local stand-in server (download_standin.py)
+    python scraper.py --results-url http://127.0.0.1:8765/ugnepresults.html --workers 8
     
 Output Structure:
     downloads/
@@ -35,15 +46,18 @@ Version: 1.0
 import os
 import sys
 import json
+import queue
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import argparse
 import logging
 from urllib.parse import urljoin
 import re
 
+from downloader import ConcurrentDownloader
+
 
 class MumbaiUniversityResultScraper:
     """Scraper for Mumbai University result PDFs"""
@@ -51,14 +65,17 @@ class MumbaiUniversityResultScraper:
     BASE_URL = "https://www.mumresults.in"
     RESULTS_PAGE = "https://www.mumresults.in/ugnepresults.html"
     
-    def __init__(self, output_dir: str = 'downloads'):
+    def __init__(self, output_dir: str = 'downloads', results_url: str = RESULTS_PAGE):
         """
         Initialize scraper.
         
         Args:
             output_dir: Base directory for downloads
+            results_url: Results page listing the PDFs (PDF links are resolved
+                         against it, so a local stand-in can replace the site)
         """
         self.output_dir = output_dir
+        self.results_url = results_url
         os.makedirs(output_dir, exist_ok=True)
         
         self._setup_logging()
@@ -74,16 +91,20 @@ class MumbaiUniversityResultScraper:
     def _setup_logging(self):
         """Configure logging"""
         log_file = os.path.join(self.output_dir, 'scraper_log.txt')
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # A named logger rather than the root logger, so running the scraper
+        # inside run_batch.py --scrape leaves the batch logging untouched
+        self.logger = logging.getLogger('Scraper')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        
+        for handler in (logging.FileHandler(log_file), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
     
     def parse_table_row(self, row) -> Optional[Dict[str, str]]:
         """
@@ -108,7 +129,7 @@ class MumbaiUniversityResultScraper:
             if not link_tag:
                 return None
             
-            pdf_url = urljoin(self.BASE_URL, link_tag.get('href', ''))
+            pdf_url = urljoin(self.results_url, link_tag.get('href', ''))
             exam_name = link_tag.text.strip()
             
             # Column 3: Result Date
@@ -152,10 +173,10 @@ class MumbaiUniversityResultScraper:
         Returns:
             List of exam information dictionaries
         """
-        self.logger.info(f"Fetching exam list from: {self.RESULTS_PAGE}")
+        self.logger.info(f"Fetching exam list from: {self.results_url}")
         
         try:
-            response = self.session.get(self.RESULTS_PAGE, timeout=30)
+            response = self.session.get(self.results_url, timeout=30)
             response.raise_for_status()
         except requests.RequestException as e:
             self.logger.error(f"Failed to fetch results page: {e}")
@@ -241,16 +262,11 @@ class MumbaiUniversityResultScraper:
             file_size = os.path.getsize(pdf_path) / (1024 * 1024)  # MB
             self.logger.info(f"Downloaded: {os.path.basename(pdf_path)} ({file_size:.2f} MB)")
             
-            # Save metadata JSON
-            metadata = {
-                **exam_info,
-                'downloaded_at': datetime.now().isoformat(),
-                'pdf_file': pdf_path,
-                'file_size_mb': round(file_size, 2)
-            }
-            
-            with open(json_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            self.save_metadata(exam_info, pdf_path, json_path, validators={
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_length': os.path.getsize(pdf_path)
+            })
             
             return True
             
@@ -261,12 +277,212 @@ class MumbaiUniversityResultScraper:
             self.logger.error(f"Failed to save PDF: {e}")
             return False
     
-    def scrape_and_download(self, limit: Optional[int] = None) -> Dict[str, int]:
+    def save_metadata(self, exam_info: Dict[str, str], pdf_path: str, json_path: str,
+                      validators: Optional[Dict] = None, updated: bool = False):
+        """
+        Save the metadata JSON of a downloaded PDF.
+        
+        Args:
+            exam_info: Exam information dictionary
+            pdf_path: Path of the downloaded PDF
+            json_path: Path of the metadata JSON
+            validators: HTTP validators of the download (etag, last_modified,
+                        content_length), sent back on the next run
+            updated: The PDF replaced a previously downloaded, different version
+            
+        Returns:
+            The metadata written
+        """
+        file_size = os.path.getsize(pdf_path) / (1024 * 1024)  # MB
+        now = datetime.now().isoformat()
+        metadata = {
+            **exam_info,
+            'downloaded_at': now,
+            'pdf_file': pdf_path,
+            'file_size_mb': round(file_size, 2),
+            'etag': (validators or {}).get('etag'),
+            'last_modified': (validators or {}).get('last_modified'),
+            'content_length': (validators or {}).get('content_length'),
+            'checked_at': now
+        }
+        
+        if updated:
+            # Re-published under the same URL; the batch manifest re-ingests it
+            # because its content hash changed
+            metadata['content_changed'] = True
+            metadata['content_changed_at'] = now
+        
+        with open(json_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        
+        return metadata
+    
+    def load_validators(self, json_path: str) -> Dict:
+        """
+        Read the HTTP validators saved with a PDF's metadata.
+        
+        Args:
+            json_path: Path of the metadata JSON
+            
+        Returns:
+            Dictionary with etag, last_modified and content_length (empty if
+            the metadata is missing; the downloader then compares sizes)
+        """
+        try:
+            with open(json_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        return {
+            'etag': metadata.get('etag'),
+            'last_modified': metadata.get('last_modified'),
+            'content_length': metadata.get('content_length')
+        }
+    
+    def mark_checked(self, exam_info: Dict[str, str], pdf_path: str, json_path: str,
+                     validators: Dict):
+        """
+        Record a revalidation that found the PDF unchanged.
+        
+        Args:
+            exam_info: Exam information dictionary
+            pdf_path: Path of the PDF
+            json_path: Path of the metadata JSON
+            validators: Current validators from the server
+            
+        Returns:
+            The metadata written
+        """
+        try:
+            with open(json_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            # PDF without metadata (e.g. copied in by hand)
+            return self.save_metadata(exam_info, pdf_path, json_path, validators=validators)
+        
+        for key in ('etag', 'last_modified', 'content_length'):
+            if validators.get(key) is not None:
+                metadata[key] = validators[key]
+        metadata['checked_at'] = datetime.now().isoformat()
+        metadata.pop('content_changed', None)
+        
+        with open(json_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        
+        return metadata
+    
+    def download_exams(self, exams: List[Dict[str, str]], downloader: ConcurrentDownloader,
+                       revalidate: bool = True,
+                       on_ready: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, int]:
+        """
+        Download PDFs with the downloader, resuming partial downloads.
+        
+        Existing PDFs are revalidated with a conditional GET using the
+        validators in their metadata JSON (or skipped if revalidate is False).
+        Metadata JSON is written as soon as each PDF is complete.
+        
+        Args:
+            exams: Exam information dictionaries
+            downloader: Configured downloader
+            revalidate: Check existing PDFs for re-published versions
+            on_ready: Called with (pdf_path, metadata) for every PDF that is
+                      complete on disk (downloaded, updated or unchanged), as
+                      soon as its metadata is saved
+            
+        Returns:
+            Dictionary with download statistics; stats['updated_files'] lists
+            the PDFs replaced by a re-published version
+        """
+        stats = {'total': len(exams), 'downloaded': 0, 'updated': 0, 'unchanged': 0,
+                 'skipped': 0, 'failed': 0, 'updated_files': []}
+        jobs = []
+        exam_by_path = {}
+        
+        for exam in exams:
+            pdf_path, json_path, _ = self.generate_pdf_path(exam)
+            if pdf_path in exam_by_path:
+                self.logger.warning(f"Duplicate link, skipping: {exam['pdf_url']}")
+                stats['skipped'] += 1
+            elif os.path.exists(pdf_path) and not revalidate:
+                self.logger.info(f"Skipping existing: {os.path.basename(pdf_path)}")
+                stats['skipped'] += 1
+            else:
+                exam_by_path[pdf_path] = (exam, json_path)
+                validators = self.load_validators(json_path) if os.path.exists(pdf_path) else None
+                jobs.append((exam['pdf_url'], pdf_path, validators))
+        
+        revalidating = sum(1 for job in jobs if job[2] is not None)
+        self.logger.info(
+            f"Downloading {len(jobs) - revalidating} and revalidating {revalidating} PDF(s) "
+            f"with {downloader.workers} worker(s) ({downloader.per_host} per host)"
+        )
+        done = [0]
+        
+        def on_complete(result: Dict):
+            done[0] += 1
+            name = os.path.basename(result['path'])
+            if result['status'] == 'failed':
+                stats['failed'] += 1
+                return
+            
+            exam, json_path = exam_by_path[result['path']]
+            try:
+                if result['status'] == 'not_modified':
+                    metadata = self.mark_checked(exam, result['path'], json_path,
+                                                 result['validators'])
+                else:
+                    metadata = self.save_metadata(exam, result['path'], json_path,
+                                                  validators=result['validators'],
+                                                  updated=result['status'] == 'updated')
+            except IOError as e:
+                self.logger.error(f"Failed to save metadata for {name}: {e}")
+                stats['failed'] += 1
+                return
+            
+            if result['status'] == 'not_modified':
+                stats['unchanged'] += 1
+                self.logger.debug(f"[{done[0]}/{len(jobs)}] Unchanged: {name}")
+            else:
+                if result['status'] == 'updated':
+                    stats['updated'] += 1
+                    stats['updated_files'].append(result['path'])
+                    label = 'Updated (re-published)'
+                else:
+                    stats['downloaded'] += 1
+                    label = 'Downloaded'
+                
+                resumed = f", resumed at {result['resumed_from']} bytes" if result['resumed_from'] else ''
+                self.logger.info(
+                    f"[{done[0]}/{len(jobs)}] {label}: {name} "
+                    f"({os.path.getsize(result['path']) / (1024 * 1024):.2f} MB in "
+                    f"{result['seconds']:.1f}s, {result['attempts']} attempt(s){resumed})"
+                )
+            
+            # Hand the PDF on (blocks while a bounded consumer queue is full)
+            if on_ready:
+                on_ready(result['path'], metadata)
+        
+        downloader.download_all(jobs, on_complete=on_complete)
+        return stats
+    
+    def scrape_and_download(self, limit: Optional[int] = None, workers: int = 1,
+                            per_host: int = ConcurrentDownloader.DEFAULT_PER_HOST,
+                            retries: int = ConcurrentDownloader.DEFAULT_RETRIES,
+                            revalidate: bool = True,
+                            on_ready: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, int]:
         """
         Scrape exam list and download all PDFs.
         
         Args:
             limit: Optional limit on number of PDFs to download
+            workers: Number of concurrent downloads (1 = one at a time)
+            per_host: Maximum concurrent connections per host
+            retries: Retries per PDF after the first attempt
+            revalidate: Send conditional requests for existing PDFs and
+                        re-fetch re-published ones (False = skip existing)
+            on_ready: Called with (pdf_path, metadata) as each PDF completes
+                      (see download_exams)
             
         Returns:
             Dictionary with download statistics
@@ -275,30 +491,44 @@ class MumbaiUniversityResultScraper:
         
         if not exams:
             self.logger.warning("No exams found to download")
-            return {'total': 0, 'downloaded': 0, 'skipped': 0, 'failed': 0}
+            return {'total': 0, 'downloaded': 0, 'updated': 0, 'unchanged': 0,
+                    'skipped': 0, 'failed': 0, 'updated_files': []}
         
         # Apply limit if specified
         if limit:
             exams = exams[:limit]
             self.logger.info(f"Limiting to first {limit} exams")
         
-        stats = {'total': len(exams), 'downloaded': 0, 'skipped': 0, 'failed': 0}
+        downloader = ConcurrentDownloader(
+            workers=workers, per_host=per_host, retries=retries,
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            logger=self.logger
+        )
+        return self.download_exams(exams, downloader, revalidate=revalidate, on_ready=on_ready)
+    
+    def download_to_queue(self, pdf_queue: 'queue.Queue', **kwargs) -> Dict[str, int]:
+        """
+        Scrape and download, putting each completed PDF on a queue.
         
-        for i, exam in enumerate(exams, 1):
-            self.logger.info(f"\n[{i}/{len(exams)}] Processing: {exam['program_code']} - {exam['semester']}")
-            
-            pdf_path, _, _ = self.generate_pdf_path(exam)
-            
-            if os.path.exists(pdf_path):
-                self.logger.info("  Status: Already exists (skipping)")
-                stats['skipped'] += 1
-            else:
-                if self.download_pdf(exam, skip_existing=True):
-                    stats['downloaded'] += 1
-                else:
-                    stats['failed'] += 1
+        Producer side of run_batch.py --scrape: items are (pdf_path, metadata)
+        as consumed by BatchGradeProcessor.process_stream(), followed by None
+        when all downloads are done (also after an error). With a bounded
+        queue, put() blocks while the consumer is behind.
         
-        return stats
+        Args:
+            pdf_queue: Queue receiving (pdf_path, metadata) items and None
+            **kwargs: Arguments for scrape_and_download()
+            
+        Returns:
+            Dictionary with download statistics
+        """
+        try:
+            return self.scrape_and_download(
+                on_ready=lambda pdf_path, metadata: pdf_queue.put((pdf_path, metadata)),
+                **kwargs
+            )
+        finally:
+            pdf_queue.put(None)
 
 
 def main():
@@ -316,6 +546,34 @@ def main():
         type=int,
         help='Limit number of PDFs to download'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of concurrent downloads (default: 1)'
+    )
+    parser.add_argument(
+        '--per-host',
+        type=int,
+        default=ConcurrentDownloader.DEFAULT_PER_HOST,
+        help=f'Maximum connections per host with --workers (default: {ConcurrentDownloader.DEFAULT_PER_HOST})'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=ConcurrentDownloader.DEFAULT_RETRIES,
+        help=f'Retries per PDF with --workers (default: {ConcurrentDownloader.DEFAULT_RETRIES})'
+    )
+    parser.add_argument(
+        '--no-revalidate',
+        action='store_true',
+        help='Skip existing PDFs instead of checking them for re-published versions'
+    )
+    parser.add_argument(
+        '--results-url',
+        default=MumbaiUniversityResultScraper.RESULTS_PAGE,
+        help='Results page to scrape (default: the mumresults.in UG NEP page)'
+    )
     
     args = parser.parse_args()
     
@@ -324,10 +582,13 @@ def main():
     print("="*70)
     print()
     
-    scraper = MumbaiUniversityResultScraper(output_dir=args.output_dir)
+    scraper = MumbaiUniversityResultScraper(output_dir=args.output_dir,
+                                            results_url=args.results_url)
     
     try:
-        stats = scraper.scrape_and_download(limit=args.limit)
+        stats = scraper.scrape_and_download(limit=args.limit, workers=args.workers,
+                                            per_host=args.per_host, retries=args.retries,
+                                            revalidate=not args.no_revalidate)
         
         print()
         print("="*70)
@@ -335,9 +596,16 @@ def main():
         print("="*70)
         print(f"\nTotal exams found: {stats['total']}")
         print(f"Downloaded: {stats['downloaded']}")
+        print(f"Updated (re-published): {stats['updated']}")
+        print(f"Unchanged (not modified): {stats['unchanged']}")
         print(f"Skipped (already exists): {stats['skipped']}")
         print(f"Failed: {stats['failed']}")
         print()
+        if stats['updated_files']:
+            print("Re-published PDFs (will be re-processed by run_batch.py):")
+            for pdf_path in stats['updated_files']:
+                print(f"  - {os.path.basename(pdf_path)}")
+            print()
         print(f"Files saved to: {os.path.abspath(args.output_dir)}/")
         print()
         
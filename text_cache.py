@@ -0,0 +1,188 @@
+"""
+=============================================================================
+Page Text Cache for Mumbai University Grade Records
+=============================================================================
+
+On-disk cache of per-page text produced by the text backends, so parsing
+logic in extract_simple.py can be re-run over the whole archive without
+repeating text extraction.
+
+Cache entries:
+- Keyed by PDF content hash (SHA-256), backend name and backend version
+- One entry per PDF holding the text of every page, indexed by page number
+- Stored as gzip-compressed JSON: {sha256}_{backend}_{version}.json.gz
+- Written atomically (temp file + rename), safe for worker processes
+
+Eviction:
+When the cache grows beyond max_size_bytes, least recently used entries
+(by file mtime, refreshed on every hit) are deleted.
+
+Usage:
+    cache = PageTextCache('.text_cache', max_size_mb=500)
+    extractor = SimpleStudentExtractor(pdf_path, text_cache=cache)
+
+Author: GitHub Copilot
+Date: 2026-02-12
+Version: 1.0
+=============================================================================
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+from typing import List, Optional
+
+from text_backends import TextBackend
+
+
+class PageTextCache:
+    """Compressed on-disk cache of page texts keyed by PDF hash and backend"""
+
+    DEFAULT_MAX_SIZE_MB = 500
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        """
+        Initialize page text cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (created if missing)
+            max_size_mb: Maximum total size of cache entries in megabytes
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def file_sha256(cls, pdf_path: str) -> str:
+        """Compute SHA-256 of a file, reading it in chunks"""
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entry_path(self, sha256: str, backend: TextBackend) -> str:
+        """Path of the cache entry for a PDF hash and backend"""
+        return os.path.join(
+            self.cache_dir, f"{sha256}_{backend.name}_{backend.VERSION}.json.gz"
+        )
+
+    def get(self, sha256: str, backend: TextBackend) -> Optional[List[str]]:
+        """
+        Read cached page texts.
+
+        Args:
+            sha256: SHA-256 of the PDF
+            backend: Text backend that produced the texts
+
+        Returns:
+            List of page texts, or None on a cache miss
+        """
+        path = self.entry_path(sha256, backend)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                page_texts = json.load(f)
+            # Mark as recently used for eviction
+            os.utime(path)
+        except (OSError, ValueError, EOFError):
+            # Missing, evicted by another process, or corrupt
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return page_texts
+
+    def put(self, sha256: str, backend: TextBackend, page_texts: List[str]):
+        """
+        Store page texts and evict old entries if the cache is too large.
+
+        Args:
+            sha256: SHA-256 of the PDF
+            backend: Text backend that produced the texts
+            page_texts: Text of each page
+        """
+        path = self.entry_path(sha256, backend)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(page_texts, separators=(',', ':')).encode('utf-8'))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def get_or_extract(self, pdf_path: str, backend: TextBackend) -> List[str]:
+        """
+        Get page texts from the cache, extracting and storing them on a miss.
+
+        Args:
+            pdf_path: Path to PDF file
+            backend: Text backend used on a miss
+
+        Returns:
+            List of page texts
+        """
+        sha256 = self.file_sha256(pdf_path)
+        page_texts = self.get(sha256, backend)
+        if page_texts is None:
+            page_texts = backend.extract_page_texts(pdf_path)
+            self.put(sha256, backend, page_texts)
+        return page_texts
+
+    def size_bytes(self) -> int:
+        """Total size of all cache entries"""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits max_size_bytes.
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+
+        return deleted
+
+    def clear(self):
+        """Delete all cache entries"""
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        """Iterate over cache entry files"""
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.json.gz'):
+                    yield entry